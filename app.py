@@ -1,6 +1,12 @@
 from dash import Dash, html, dcc
-from components import sidebar, main_content
+from src.query_api import QueryAPI
+from src.utils.trace_handler import trace_handler
+from src.utils.metrics_handler import metrics_handler
+from src.utils.profile_handler import profile_handler
+from src.utils.static_figure_handler import static_figure_handler
+from src.utils.warm_up_handler import WarmUpHandler
 import dash_bootstrap_components as dbc
+from components import sidebar, main_content, track_tabs
 
 
 app = Dash(
@@ -16,6 +22,17 @@ app._favicon = (
   "icon/njit.ico"
 )
 server = app.server
+QueryAPI(
+  database_handler=track_tabs.database_handler,
+).register(server)
+metrics_handler.register(server)
+trace_handler.register(server)
+profile_handler.register(server)
+static_figure_handler.register(server)
+warm_up_handler = WarmUpHandler(
+  render_scheduler=track_tabs.render_scheduler,
+)
+warm_up_handler.register(server)
 
 
 app.layout = html.Div(
@@ -23,11 +40,13 @@ app.layout = html.Div(
     sidebar.layout,
     main_content.layout,
     dcc.Store(id="course-catalog-store", data="", storage_type="session"),
+    dcc.Store(id="course-descriptions-store", data={}, storage_type="session"),
   ],
   className="indexpage-main-layout",
 )
 
 if __name__ == "__main__":
+  warm_up_handler.start()
   app.run(
     debug=False,
   )
\ No newline at end of file
@@ -0,0 +1,144 @@
+import os
+import sys
+import json
+import platform
+import subprocess
+from glob import glob
+from datetime import datetime, timezone
+from importlib.metadata import version, PackageNotFoundError
+
+
+class BenchmarkHistory:
+  """
+  The BenchmarkHistory class stores benchmark runs with their environment metadata in a local results directory.
+  """
+
+  PACKAGES = ["numpy", "plotly", "dash", "pymongo", "dash-bootstrap-components"]
+
+
+  def __init__(self,
+               results_directory: str = "benchmarks/results") -> None:
+    """
+    Initialize the BenchmarkHistory class.
+
+    Args:
+      - results_directory (str): The directory the runs are saved to.
+
+    Returns:
+      - None
+    """
+
+    self.results_directory = results_directory
+
+
+  def __environment_metadata(self) -> dict:
+    """
+    Collect the metadata needed to tell whether two runs are comparable.
+
+    Args:
+      - None
+
+    Returns:
+      - dict: The environment metadata.
+    """
+
+    packages = {}
+    for package in self.PACKAGES:
+      try:
+        packages[package] = version(package)
+      except PackageNotFoundError:
+        packages[package] = None
+
+    try:
+      git_commit = subprocess.run(
+        ["git", "rev-parse", "--short", "HEAD"],
+        capture_output=True,
+        text=True,
+        check=True,
+      ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+      git_commit = None
+
+    return {
+      "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+      "git_commit": git_commit,
+      "python": sys.version.split()[0],
+      "platform": platform.platform(),
+      "machine": platform.machine(),
+      "processor": platform.processor(),
+      "cpu_count": os.cpu_count(),
+      "packages": packages,
+    }
+
+
+  def save(self,
+           results: list,
+           parameters: dict,
+           name: str = None) -> str:
+    """
+    Save a benchmark run.
+
+    Args:
+      - results (list): The stage results of the run.
+      - parameters (dict): The benchmark parameters (sizes, backend, catalog shape, repeats).
+      - name (str): The file name without extension, a timestamp if None.
+
+    Returns:
+      - str: The path of the saved run.
+    """
+
+    metadata = self.__environment_metadata()
+    if name is None:
+      name = metadata["timestamp"].replace(":", "").replace("-", "").replace("+0000", "")
+
+    os.makedirs(self.results_directory, exist_ok=True)
+    file_path = os.path.join(self.results_directory, f"{name}.json")
+    with open(file_path, "w") as f:
+      json.dump(
+        {
+          "metadata": metadata,
+          "parameters": parameters,
+          "results": results,
+        },
+        f,
+        indent=2,
+      )
+    return file_path
+
+
+  def load(self,
+           file_path: str) -> dict:
+    """
+    Load a saved benchmark run.
+
+    Args:
+      - file_path (str): The path of the run, or its name inside the results directory.
+
+    Returns:
+      - dict: The run with its metadata, parameters and results.
+    """
+
+    if not os.path.exists(file_path):
+      file_path = os.path.join(self.results_directory, f"{file_path}.json")
+    with open(file_path) as f:
+      return json.load(f)
+
+
+  def latest(self,
+             exclude: list = ()) -> str:
+    """
+    Get the path of the most recently saved run.
+
+    Args:
+      - exclude (list): The file names to skip, e.g. the baseline.
+
+    Returns:
+      - str: The path of the run, None if there is none.
+    """
+
+    file_paths = [
+      file_path
+      for file_path in glob(os.path.join(self.results_directory, "*.json"))
+      if os.path.basename(file_path) not in exclude
+    ]
+    return max(file_paths, key=os.path.getmtime) if file_paths else None
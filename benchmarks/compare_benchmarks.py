@@ -0,0 +1,219 @@
+import sys
+import math
+from statistics import median
+from argparse import ArgumentParser
+from benchmarks.benchmark_history import BenchmarkHistory
+
+
+class CompareBenchmarks:
+  """
+  The CompareBenchmarks class flags statistically significant regressions of a benchmark run against a stored baseline.
+  """
+
+
+  def __init__(self,
+               baseline: dict,
+               current: dict,
+               metric: str = "wall_time_s",
+               alpha: float = 0.05,
+               threshold: float = 1.10,
+               budgets: dict = None) -> None:
+    """
+    Initialize the CompareBenchmarks class.
+
+    Args:
+      - baseline (dict): The baseline run, as loaded by BenchmarkHistory.load.
+      - current (dict): The run to be checked, as loaded by BenchmarkHistory.load.
+      - metric (str): The result field compared, e.g. wall_time_s or peak_memory_mb.
+      - alpha (float): The significance level of the one-sided Mann-Whitney U test.
+      - threshold (float): The minimum median ratio current / baseline reported as a regression.
+      - budgets (dict): The {(stage, n_courses): seconds} latency budgets of the current run.
+
+    Returns:
+      - None
+    """
+
+    self.baseline = baseline
+    self.current = current
+    self.metric = metric
+    self.alpha = alpha
+    self.threshold = threshold
+    self.budgets = budgets or {}
+
+
+  def __group(self,
+              run: dict) -> dict:
+    """
+    Group the samples of a run by stage and catalog size.
+
+    Args:
+      - run (dict): The benchmark run.
+
+    Returns:
+      - dict: The {(stage, n_courses): [samples]} mapping.
+    """
+
+    samples = {}
+    for result in run["results"]:
+      if self.metric in result:
+        samples.setdefault((result["stage"], result["n_courses"]), []).append(result[self.metric])
+    return samples
+
+
+  def __mann_whitney_p_value(self,
+                             baseline_samples: list,
+                             current_samples: list) -> float:
+    """
+    Compute the one-sided p-value that the current samples are larger than the baseline ones,
+    with the normal approximation of the Mann-Whitney U statistic and a tie correction.
+
+    Args:
+      - baseline_samples (list): The baseline samples.
+      - current_samples (list): The current samples.
+
+    Returns:
+      - float: The p-value, 1.0 when there are too few samples to test.
+    """
+
+    n_baseline, n_current = len(baseline_samples), len(current_samples)
+    if n_baseline < 2 or n_current < 2:
+      return 1.0
+
+    pooled = sorted([(sample, 0) for sample in baseline_samples] + [(sample, 1) for sample in current_samples])
+    ranks, tie_correction, i = [0.0] * len(pooled), 0, 0
+    while i < len(pooled):
+      j = i
+      while j + 1 < len(pooled) and pooled[j + 1][0] == pooled[i][0]:
+        j += 1
+      for k in range(i, j + 1):
+        ranks[k] = (i + j) / 2 + 1
+      tie_correction += (j - i + 1) ** 3 - (j - i + 1)
+      i = j + 1
+
+    n = n_baseline + n_current
+    u_current = sum(rank for rank, (_, group) in zip(ranks, pooled) if group == 1) - n_current * (n_current + 1) / 2
+    mean_u = n_baseline * n_current / 2
+    variance_u = n_baseline * n_current / 12 * ((n + 1) - tie_correction / (n * (n - 1)))
+    if variance_u <= 0:
+      return 1.0
+
+    z = (u_current - mean_u - 0.5) / math.sqrt(variance_u)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+  def run(self) -> list:
+    """
+    Compare the runs.
+
+    Args:
+      - None
+
+    Returns:
+      - list: One finding per stage and catalog size with its status: ok, regression, improvement, over_budget, missing,
+        or insufficient_samples when either run has a single sample and the median ratio is within the threshold.
+        With a single sample the significance test cannot be run, regressions and improvements are then judged on the ratio alone.
+    """
+
+    baseline_samples, current_samples = self.__group(self.baseline), self.__group(self.current)
+    findings = []
+    for key in sorted(set(baseline_samples) | set(current_samples), key=lambda key: (key[1], key[0])):
+      stage, n_courses = key
+      if key not in baseline_samples or key not in current_samples:
+        findings.append({"stage": stage, "n_courses": n_courses, "status": "missing"})
+        continue
+
+      baseline_median, current_median = median(baseline_samples[key]), median(current_samples[key])
+      ratio = current_median / baseline_median if baseline_median else math.inf
+      ratio_only = len(baseline_samples[key]) < 2 or len(current_samples[key]) < 2
+
+      if ratio_only:
+        p_value = None
+        status = "insufficient_samples"
+        if ratio >= self.threshold:
+          status = "regression"
+        elif ratio <= 1 / self.threshold:
+          status = "improvement"
+      else:
+        p_value = self.__mann_whitney_p_value(baseline_samples[key], current_samples[key])
+        status = "ok"
+        if ratio >= self.threshold and p_value < self.alpha:
+          status = "regression"
+        elif ratio <= 1 / self.threshold and self.__mann_whitney_p_value(current_samples[key], baseline_samples[key]) < self.alpha:
+          status = "improvement"
+      if key in self.budgets and current_median > self.budgets[key]:
+        status = "over_budget"
+
+      findings.append({
+        "stage": stage,
+        "n_courses": n_courses,
+        "baseline_median": baseline_median,
+        "current_median": current_median,
+        "ratio": round(ratio, 3),
+        "p_value": round(p_value, 4) if p_value is not None else None,
+        "ratio_only": ratio_only,
+        "status": status,
+      })
+
+    return findings
+
+
+def parse_budget(budget: str) -> tuple:
+  """
+  Parse a latency budget given as STAGE:N_COURSES=SECONDS, e.g. update_tab_content:1000=2.5.
+
+  Args:
+    - budget (str): The budget.
+
+  Returns:
+    - tuple: ((stage, n_courses), seconds)
+  """
+
+  key, seconds = budget.rsplit("=", 1)
+  stage, n_courses = key.rsplit(":", 1)
+  return (stage, int(n_courses)), float(seconds)
+
+
+if __name__ == "__main__":
+  parser = ArgumentParser(description="Compare a benchmark run against a stored baseline, exiting with status 1 on regressions or blown budgets.")
+  parser.add_argument("--baseline", default="baseline", help="The baseline run, a path or a name inside the results directory.")
+  parser.add_argument("--current", default=None, help="The run to be checked, the latest saved run by default.")
+  parser.add_argument("--results-directory", default="benchmarks/results")
+  parser.add_argument("--metric", default="wall_time_s", choices=["wall_time_s", "peak_memory_mb", "retained_memory_mb", "json_bytes"])
+  parser.add_argument("--alpha", type=float, default=0.05)
+  parser.add_argument("--threshold", type=float, default=1.10, help="The minimum slowdown ratio reported as a regression.")
+  parser.add_argument("--budget", action="append", default=[], help="A latency budget STAGE:N_COURSES=SECONDS, e.g. update_tab_content:1000=2.5. Repeatable.")
+  args = parser.parse_args()
+
+  benchmark_history = BenchmarkHistory(
+    results_directory=args.results_directory,
+  )
+  baseline = benchmark_history.load(args.baseline)
+  current_path = args.current or benchmark_history.latest(exclude=[f"{args.baseline}.json"])
+  if current_path is None:
+    sys.exit("There is no saved run to compare against the baseline")
+  current = benchmark_history.load(current_path)
+
+  if baseline["parameters"] != current["parameters"]:
+    print(f"Warning: the runs used different parameters:\n  baseline {baseline['parameters']}\n  current  {current['parameters']}")
+
+  findings = CompareBenchmarks(
+    baseline=baseline,
+    current=current,
+    metric=args.metric,
+    alpha=args.alpha,
+    threshold=args.threshold,
+    budgets=dict(parse_budget(budget) for budget in args.budget),
+  ).run()
+
+  print(f"{'courses':>8}  {'stage':<26}{'baseline':>12}{'current':>12}{'ratio':>8}{'p-value':>9}  status")
+  for finding in findings:
+    if finding["status"] == "missing":
+      print(f"{finding['n_courses']:>8}  {finding['stage']:<26}{'':>49}  missing")
+      continue
+    p_value = f"{finding['p_value']:.4f}" if finding["p_value"] is not None else "-"
+    print(f"{finding['n_courses']:>8}  {finding['stage']:<26}{finding['baseline_median']:>12.4g}{finding['current_median']:>12.4g}{finding['ratio']:>8.2f}{p_value:>9}  {finding['status']}")
+
+  if any(finding.get("ratio_only") for finding in findings):
+    print("Warning: some stages have a single sample, they were judged on the median ratio alone. Save runs with --repeat 5 or more.")
+
+  sys.exit(1 if any(finding["status"] in ("regression", "over_budget") for finding in findings) else 0)
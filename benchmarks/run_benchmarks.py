@@ -0,0 +1,417 @@
+import os
+import sys
+import json
+import copy
+import subprocess
+import tempfile
+import tracemalloc
+from time import perf_counter
+from argparse import ArgumentParser
+from plotly.utils import PlotlyJSONEncoder
+from benchmarks.synthetic_catalog import SyntheticCatalog
+from benchmarks.benchmark_history import BenchmarkHistory
+
+
+class RunBenchmarks:
+  """
+  The RunBenchmarks class times every stage of the course trajectory pipeline on synthetic catalogs.
+  """
+
+  COURSE_NAME = "synthetic_catalog"
+
+
+  def __init__(self,
+               sizes: list,
+               backend: str = "files",
+               n_tracks: int = 4,
+               edge_density: float = 2.0,
+               or_group_probability: float = 0.3,
+               or_group_nesting: int = 2,
+               seed: int = 0,
+               repeats: int = 5) -> None:
+    """
+    Initialize the RunBenchmarks class.
+
+    Args:
+      - sizes (list): The catalog sizes, in number of courses, to benchmark.
+      - backend (str): "files" to feed the renderers from the PrepareCoursesData output, "mongo" to go through DatabaseHandler on an in-process Mongo stand-in
+        and time the update_tab_content callback.
+      - n_tracks (int): The number of tracks per synthetic catalog.
+      - edge_density (float): The average number of prerequisite entries per course.
+      - or_group_probability (float): The probability that a prerequisite entry is an OR-group.
+      - or_group_nesting (int): The maximum nesting depth of OR-groups.
+      - seed (int): The random seed of the synthetic catalogs.
+      - repeats (int): The number of times each size is benchmarked, needed to tell regressions from noise.
+
+    Returns:
+      - None
+    """
+
+    self.sizes = sizes
+    self.backend = backend
+    self.n_tracks = n_tracks
+    self.edge_density = edge_density
+    self.or_group_probability = or_group_probability
+    self.or_group_nesting = or_group_nesting
+    self.seed = seed
+    self.repeats = repeats
+    self.mongo_client = None
+    if backend == "mongo":
+      import mongomock
+
+      self.mongo_client = mongomock.MongoClient()
+
+
+  def __measure(self,
+                function) -> tuple:
+    """
+    Run a function measuring its wall time, peak traced memory and the traced memory still allocated once it returns,
+    for a loading stage the memory held by the loaded data.
+
+    Args:
+      - function (callable): A callable without arguments.
+
+    Returns:
+      - tuple: (result, {"wall_time_s", "peak_memory_mb", "retained_memory_mb"})
+    """
+
+    tracemalloc.start()
+    start = perf_counter()
+    result = function()
+    wall_time = perf_counter() - start
+    retained_memory, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, {
+      "wall_time_s": round(wall_time, 6),
+      "peak_memory_mb": round(peak_memory / 2 ** 20, 3),
+      "retained_memory_mb": round(retained_memory / 2 ** 20, 3),
+    }
+
+
+  def __json_size(self,
+                  obj) -> int:
+    """
+    Get the size of an object once serialized the way Dash sends it to the browser.
+
+    Args:
+      - obj: A figure or a Dash component.
+
+    Returns:
+      - int: The size in bytes.
+    """
+
+    return len(json.dumps(obj, cls=PlotlyJSONEncoder).encode("utf-8"))
+
+
+  def __prepare(self,
+                course_catalog: dict) -> dict:
+    """
+    Run PrepareCoursesData in a scratch directory so its data/ output does not touch the working tree.
+
+    Args:
+      - course_catalog (dict): The synthetic course catalog.
+
+    Returns:
+      - dict: The prepared track information.
+    """
+
+    from src.prepare_courses_data import PrepareCoursesData
+
+    working_directory = os.getcwd()
+    with tempfile.TemporaryDirectory() as scratch_directory:
+      os.chdir(scratch_directory)
+      try:
+        return PrepareCoursesData(
+          course_name=self.COURSE_NAME,
+          course_catalog=copy.deepcopy(course_catalog),
+        ).run()
+      finally:
+        os.chdir(working_directory)
+
+
+  def __load(self,
+             course_catalog: dict,
+             all_tracks_information: dict) -> tuple:
+    """
+    Load the catalog and prepared data through the selected backend, for Mongo publishing them the way PrepareCoursesData does
+    and reading them back with the handler of a freshly started app.
+
+    Args:
+      - course_catalog (dict): The synthetic course catalog.
+      - all_tracks_information (dict): The prepared track information.
+
+    Returns:
+      - tuple: (course_catalog, all_tracks_information) as the renderers receive them.
+    """
+
+    if self.backend != "mongo":
+      return copy.deepcopy(course_catalog), copy.deepcopy(all_tracks_information)
+
+    from src.utils.database_handler import DatabaseHandler
+
+    DatabaseHandler(pymongo_client=self.mongo_client).publish_course(
+      course_name=self.COURSE_NAME,
+      course_catalog=copy.deepcopy(course_catalog),
+      all_tracks_information=copy.deepcopy(all_tracks_information),
+    )
+    database_handler = DatabaseHandler(pymongo_client=self.mongo_client)
+    return tuple(database_handler.get_course_bundle(course_name=self.COURSE_NAME))
+
+
+  def __update_tab_content(self):
+    """
+    Import the update_tab_content callback, its module level DatabaseHandler reading from the in-process Mongo stand-in.
+    The handler is refreshed so the catalog just published is rendered from a cold cache,
+    and the prefetch of the other tracks is turned off so it does not run alongside the next stages.
+
+    Args:
+      - None
+
+    Returns:
+      - callable: The update_tab_content callback, called with (set_progress, active_tab, course_catalog).
+    """
+
+    from components import track_tabs
+
+    track_tabs.database_handler.pymongo_client = self.mongo_client
+    track_tabs.database_handler.refresh_catalog_versions(force=True)
+    track_tabs.render_scheduler.prefetch_enabled = False
+    return track_tabs.update_tab_content
+
+
+  def __highlight_course_node(self):
+    """
+    Import highlight_course_node, the track_tabs module level DatabaseHandler only connects on first use.
+
+    Args:
+      - None
+
+    Returns:
+      - callable: The highlight_course_node function.
+    """
+
+    from components.track_tabs import highlight_course_node
+    return highlight_course_node
+
+
+  def __measure_import(self,
+                       module_name: str = "app") -> dict:
+    """
+    Time the import of a module in a fresh interpreter, for the Dash app the boot latency of a worker.
+    The interpreter runs from the current directory, which must hold the config.ini.
+
+    Args:
+      - module_name (str): The module to import.
+
+    Returns:
+      - dict: {"wall_time_s", "modules"}, the number of modules loaded once the import is done.
+    """
+
+    script = "\n".join([
+      "import sys, json",
+      "from time import perf_counter",
+      "start = perf_counter()",
+      f"import {module_name}",
+      "wall_time = perf_counter() - start",
+      "print(json.dumps({'wall_time_s': round(wall_time, 6), 'modules': len(sys.modules)}))",
+    ])
+    repository_directory = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    completed_process = subprocess.run(
+      [sys.executable, "-c", script],
+      env={**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [repository_directory, os.environ.get("PYTHONPATH")]))},
+      capture_output=True,
+      text=True,
+      check=True,
+    )
+    return json.loads(completed_process.stdout.strip().splitlines()[-1])
+
+
+  def __run_size(self,
+                 n_courses: int,
+                 repeat: int) -> list:
+    """
+    Benchmark every stage on a catalog of the given size.
+
+    Args:
+      - n_courses (int): The number of courses of the synthetic catalog.
+      - repeat (int): The index of the repetition.
+
+    Returns:
+      - list: The stage results.
+    """
+
+    from src.develop_path import DevelopPath
+    from src.generate_3d_graph import Generate3DGraph
+    from src.utils.course_records import CourseRecordCompactor
+
+    course_catalog = SyntheticCatalog(
+      n_courses=n_courses,
+      n_tracks=self.n_tracks,
+      edge_density=self.edge_density,
+      or_group_probability=self.or_group_probability,
+      or_group_nesting=self.or_group_nesting,
+      seed=self.seed,
+    ).run()
+    results = []
+
+    prepared_information, stats = self.__measure(lambda: self.__prepare(course_catalog))
+    results.append({"stage": "PrepareCoursesData.run", **stats})
+
+    (course_catalog_info, all_tracks_information), stats = self.__measure(lambda: self.__load(course_catalog, prepared_information))
+    results.append({"stage": f"load.{self.backend}", **stats})
+
+    track = "track_1"
+    graph, stats = self.__measure(
+      lambda: Generate3DGraph(
+        course_name=self.COURSE_NAME,
+        course_catalog=course_catalog_info,
+        all_tracks_course_information=all_tracks_information,
+      ).run(track=track)
+    )
+    results.append({"stage": "Generate3DGraph.run", **stats, "json_bytes": self.__json_size(graph)})
+    if self.backend == "mongo":
+      update_tab_content = self.__update_tab_content()
+      tab_content, stats = self.__measure(lambda: update_tab_content(lambda _: None, track, self.COURSE_NAME))
+      results.append({"stage": "update_tab_content", **stats, "json_bytes": self.__json_size(tab_content)})
+
+    course_records, stats = self.__measure(
+      lambda: CourseRecordCompactor().compact_track_information(prepared_information)
+    )
+    results.append({"stage": "CourseRecordCompactor", **stats})
+    _, stats = self.__measure(
+      lambda: Generate3DGraph(
+        course_name=self.COURSE_NAME,
+        course_catalog=course_catalog_info,
+        all_tracks_course_information=course_records,
+      ).run(track=track)
+    )
+    results.append({"stage": "Generate3DGraph.run.records", **stats})
+
+    target_course = max(
+      all_tracks_information[track],
+      key=lambda course: all_tracks_information[track][course].get("on_dependant_courses_count", 0),
+    )
+    (path_figure, _), stats = self.__measure(
+      lambda: DevelopPath(
+        course_name=self.COURSE_NAME,
+        course_catalog=course_catalog_info,
+        all_tracks_course_information=all_tracks_information,
+      ).run(
+        track=track,
+        target_course=target_course,
+        last_camera_position=None,
+      )
+    )
+    results.append({"stage": "DevelopPath.run", **stats, "json_bytes": self.__json_size(path_figure)})
+
+    highlight_course_node = self.__highlight_course_node()
+    figure = json.loads(json.dumps(path_figure, cls=PlotlyJSONEncoder))
+    click_data = {"points": [{"customdata": target_course}]}
+    (figure, _), stats = self.__measure(lambda: highlight_course_node(click_data, figure, {}, None))
+    results.append({"stage": "highlight_course_node", **stats, "json_bytes": self.__json_size(figure)})
+
+    for result in results:
+      result["n_courses"] = n_courses
+      result["repeat"] = repeat
+    return results
+
+
+  def run(self) -> list:
+    """
+    Time the cold import of the app, then benchmark every stage at every catalog size.
+
+    Args:
+      - None
+
+    Returns:
+      - list: The stage results of every size.
+    """
+
+    results = []
+    for repeat in range(self.repeats):
+      results.append({"stage": "import.app", **self.__measure_import(), "n_courses": 0, "repeat": repeat})
+    for n_courses in self.sizes:
+      for repeat in range(self.repeats):
+        results += self.__run_size(n_courses, repeat)
+    return results
+
+
+  def get_parameters(self) -> dict:
+    """
+    Get the parameters of the benchmark, saved along with its results.
+
+    Args:
+      - None
+
+    Returns:
+      - dict: The benchmark parameters.
+    """
+
+    return {
+      "sizes": self.sizes,
+      "backend": self.backend,
+      "n_tracks": self.n_tracks,
+      "edge_density": self.edge_density,
+      "or_group_probability": self.or_group_probability,
+      "or_group_nesting": self.or_group_nesting,
+      "seed": self.seed,
+      "repeats": self.repeats,
+    }
+
+
+def print_results(results: list) -> None:
+  """
+  Print the benchmark results as a table.
+
+  Args:
+    - results (list): The stage results.
+
+  Returns:
+    - None
+  """
+
+  print(f"{'courses':>8}  {'stage':<28}{'wall time (s)':>14}{'peak memory (MB)':>18}{'retained (MB)':>15}{'json size (KB)':>16}")
+  for result in results:
+    json_size = f"{result['json_bytes'] / 1024:.1f}" if "json_bytes" in result else "-"
+    peak_memory = f"{result['peak_memory_mb']:.1f}" if "peak_memory_mb" in result else "-"
+    retained_memory = f"{result['retained_memory_mb']:.1f}" if "retained_memory_mb" in result else "-"
+    print(f"{result['n_courses']:>8}  {result['stage']:<28}{result['wall_time_s']:>14.3f}{peak_memory:>18}{retained_memory:>15}{json_size:>16}")
+
+
+if __name__ == "__main__":
+  parser = ArgumentParser(description="Benchmark the course trajectory pipeline on synthetic catalogs.")
+  parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000], help="The catalog sizes in number of courses.")
+  parser.add_argument("--backend", choices=["files", "mongo"], default="files", help="Feed the renderers from the prepared data or through DatabaseHandler on an in-process Mongo stand-in.")
+  parser.add_argument("--tracks", type=int, default=4, dest="n_tracks")
+  parser.add_argument("--edge-density", type=float, default=2.0)
+  parser.add_argument("--or-group-probability", type=float, default=0.3)
+  parser.add_argument("--or-group-nesting", type=int, default=2)
+  parser.add_argument("--seed", type=int, default=0)
+  parser.add_argument("--repeat", type=int, default=5, dest="repeats", help="The number of runs per size, compare_benchmarks needs at least 2 per side to run its significance test.")
+  parser.add_argument("--save", action="store_true", help="Save the results with the environment metadata to the results directory.")
+  parser.add_argument("--name", default=None, help="The name of the saved run, e.g. baseline. A timestamp by default.")
+  parser.add_argument("--results-directory", default="benchmarks/results")
+  args = parser.parse_args()
+
+  run_benchmarks = RunBenchmarks(
+    sizes=args.sizes,
+    backend=args.backend,
+    n_tracks=args.n_tracks,
+    edge_density=args.edge_density,
+    or_group_probability=args.or_group_probability,
+    or_group_nesting=args.or_group_nesting,
+    seed=args.seed,
+    repeats=args.repeats,
+  )
+  results = run_benchmarks.run()
+  print_results(results)
+
+  if args.save:
+    file_path = BenchmarkHistory(
+      results_directory=args.results_directory,
+    ).save(
+      results=results,
+      parameters=run_benchmarks.get_parameters(),
+      name=args.name,
+    )
+    print(f"Saved results to {file_path}")
@@ -0,0 +1,159 @@
+import random
+
+
+class SyntheticCatalog:
+  """
+  The SyntheticCatalog class generates course catalogs with the nested year/semester/course/prerequisites schema of the courses_catalog database.
+  """
+
+
+  def __init__(self,
+               n_courses: int,
+               n_tracks: int = 4,
+               n_years: int = 4,
+               n_semesters: int = 2,
+               edge_density: float = 2.0,
+               or_group_probability: float = 0.3,
+               or_group_nesting: int = 2,
+               shared_fraction: float = 0.5,
+               external_fraction: float = 0.1,
+               corequisite_probability: float = 0.1,
+               seed: int = 0) -> None:
+    """
+    Initialize the SyntheticCatalog class.
+
+    Args:
+      - n_courses (int): The number of distinct courses in the catalog.
+      - n_tracks (int): The number of tracks.
+      - n_years (int): The number of years per track.
+      - n_semesters (int): The number of semesters per year.
+      - edge_density (float): The average number of prerequisite entries per course.
+      - or_group_probability (float): The probability that a prerequisite entry is an OR-group list instead of a course code.
+      - or_group_nesting (int): The maximum nesting depth of OR-groups (1 gives ["A", "B"], 2 gives ["A", ["B", "C"]]), at most 2 as deeper groups are not understood by the renderers.
+      - shared_fraction (float): The fraction of courses shared by every track, the rest is split between tracks.
+      - external_fraction (float): The probability that a prerequisite is a pre-knowledge course not taught in the track.
+      - corequisite_probability (float): The probability that a course gets a corequisite from its own semester.
+      - seed (int): The random seed.
+
+    Returns:
+      - None
+    """
+
+    self.n_courses = n_courses
+    self.n_tracks = n_tracks
+    self.n_years = n_years
+    self.n_semesters = n_semesters
+    self.edge_density = edge_density
+    self.or_group_probability = or_group_probability
+    self.or_group_nesting = min(or_group_nesting, 2)
+    self.shared_fraction = shared_fraction
+    self.external_fraction = external_fraction
+    self.corequisite_probability = corequisite_probability
+    self.random = random.Random(seed)
+
+
+  def __course(self,
+               course_code: str) -> dict:
+    """
+    Create the catalog entry of a course without requisites.
+
+    Args:
+      - course_code (str): The course code.
+
+    Returns:
+      - dict: The course entry.
+    """
+
+    return {
+      "course_name": f"Synthetic Course {course_code}",
+      "course_description": " ".join(self.random.choice(["introduction", "advanced", "theory", "laboratory", "design", "analysis", "systems", "principles"]) for _ in range(self.random.randint(20, 80))),
+      "course_link": f"https://catalog.example.edu/{course_code}",
+    }
+
+
+  def __requisite(self,
+                  candidates: list,
+                  depth: int):
+    """
+    Draw a prerequisite entry, possibly an OR-group nested up to the given depth.
+
+    Args:
+      - candidates (list): The course codes that can be used as a prerequisite.
+      - depth (int): The remaining OR-group nesting depth.
+
+    Returns:
+      - str | list: A course code or an OR-group.
+    """
+
+    if self.random.random() < self.external_fraction or not candidates:
+      return f"EXT{self.random.randint(100, 100 + max(10, self.n_courses // 20))}"
+
+    if depth > 0 and self.random.random() < self.or_group_probability:
+      return [self.__requisite(candidates, depth - 1) for _ in range(self.random.randint(2, 3))]
+
+    return self.random.choice(candidates)
+
+
+  def __place_courses(self,
+                      course_codes: list) -> list:
+    """
+    Split the course codes over the semesters of a track in order.
+
+    Args:
+      - course_codes (list): The course codes of the track.
+
+    Returns:
+      - list: The (year, semester, course_codes) slots.
+    """
+
+    n_slots = self.n_years * self.n_semesters
+    slots = []
+    for slot in range(n_slots):
+      year, semester = divmod(slot, self.n_semesters)
+      slots.append((str(year + 1), str(semester + 1), course_codes[slot * len(course_codes) // n_slots:(slot + 1) * len(course_codes) // n_slots]))
+    return slots
+
+
+  def run(self) -> dict:
+    """
+    Generate the catalog.
+
+    Args:
+      - None
+
+    Returns:
+      - dict: The course catalog keyed by track, as returned by DatabaseHandler.get_course_catalog_information.
+    """
+
+    n_shared = int(self.n_courses * self.shared_fraction)
+    n_specific = (self.n_courses - n_shared) // max(1, self.n_tracks)
+    shared_codes = [f"CORE{i:05d}" for i in range(n_shared)]
+    courses = {course_code: self.__course(course_code) for course_code in shared_codes}
+
+    course_catalog = {}
+    for track_idx in range(1, self.n_tracks + 1):
+      specific_codes = [f"T{track_idx:02d}{i:05d}" for i in range(n_specific)]
+      courses.update({course_code: self.__course(course_code) for course_code in specific_codes})
+      track_codes = shared_codes + specific_codes
+      self.random.shuffle(track_codes)
+
+      track = {}
+      earlier_codes = []
+      for year, semester, semester_codes in self.__place_courses(track_codes):
+        semester_courses = {}
+        for course_code in semester_codes:
+          course = dict(courses[course_code])
+          n_prerequisites = min(len(earlier_codes) + 1, int(self.random.expovariate(1 / self.edge_density))) if self.edge_density else 0
+          course["prerequisites"] = [self.__requisite(earlier_codes, self.or_group_nesting) for _ in range(n_prerequisites)]
+          course["corequisites"] = []
+          if semester_courses and self.random.random() < self.corequisite_probability:
+            course["corequisites"].append(self.random.choice(list(semester_courses)))
+          semester_courses[course_code] = course
+
+        track.setdefault(year, {})[semester] = semester_courses
+        earlier_codes += semester_codes
+
+      track["extra_course_related_info"] = {"total_credits": 8 * len(track_codes)}
+      course_catalog[f"track_{track_idx}"] = track
+
+    return course_catalog
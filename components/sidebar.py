@@ -1,7 +1,27 @@
-from dash import dcc, html, Input, Output, callback
-from src.utils.database_handler import DatabaseHandler
+from consts import CacheConsts
+from dash.exceptions import PreventUpdate
+from components.track_tabs import database_handler
+from src.utils.metrics_handler import metrics_handler
+from dash import dcc, html, Input, Output, State, callback, no_update
 
-course_catalog_information = DatabaseHandler().get_courses_catalog()
+
+def course_catalog_options(course_catalogs: list) -> list:
+  """
+  Create the options of the course catalog dropdown.
+
+  Args:
+    - course_catalogs (list): The names of the course catalogs.
+
+  Returns:
+    - list: The dropdown options.
+  """
+
+  return [
+    {
+      "label": str(course_name).replace("_", " ").title(), 
+      "value": course_name
+    } for course_name in course_catalogs
+  ]
 
 layout = html.Div(
   [
@@ -31,13 +51,9 @@ layout = html.Div(
       children=[
         dcc.Dropdown(
           id="course-catalog-dropdown",
-          options=[
-            {
-              "label": str(course_name).replace("_", " ").title(), 
-              "value": course_name
-            } for course_name in course_catalog_information
-          ],
-          value=course_catalog_information[0],
+          options=[],
+          value=None,
+          placeholder="Loading catalogs...",
           persistence=True,
           clearable=False,
           searchable=False,
@@ -45,6 +61,11 @@ layout = html.Div(
             "width": "100%",
           },
         ),
+        dcc.Store(id="catalog-versions-store", data=None),
+        dcc.Interval(
+          id="catalog-version-interval",
+          interval=CacheConsts().get_constants()["version_poll_interval_s"] * 1000,
+        ),
       ],
       style={
         "height": "100vh",
@@ -76,5 +97,51 @@ layout = html.Div(
   Output('course-catalog-store', 'data'),
   Input('course-catalog-dropdown', 'value')
 )
+@metrics_handler.instrument_callback
 def update_course_catalog(value):
-  return value
\ No newline at end of file
+  return value
+
+
+@callback(
+  Output("course-catalog-dropdown", "options"),
+  Output("course-catalog-dropdown", "value"),
+  Output("catalog-versions-store", "data"),
+  Output("course-catalog-store", "data", allow_duplicate=True),
+  Input("catalog-version-interval", "n_intervals"),
+  State("catalog-versions-store", "data"),
+  State("course-catalog-dropdown", "value"),
+  prevent_initial_call="initial_duplicate",
+)
+@metrics_handler.instrument_callback
+def refresh_course_catalogs(n_intervals, known_catalog_versions, course_catalog):
+  if known_catalog_versions is None:
+    course_catalogs = database_handler.get_courses_catalog()
+    if not course_catalogs:
+      raise PreventUpdate
+    return (
+      course_catalog_options(course_catalogs),
+      course_catalog if course_catalog in course_catalogs else course_catalogs[0],
+      database_handler.get_catalog_versions(),
+      no_update,
+    )
+
+  database_handler.refresh_catalog_versions()
+  catalog_versions = database_handler.get_catalog_versions()
+  if catalog_versions == known_catalog_versions:
+    raise PreventUpdate
+
+  course_catalogs = database_handler.get_courses_catalog()
+  if course_catalog not in course_catalogs:
+    return (
+      course_catalog_options(course_catalogs),
+      course_catalogs[0] if course_catalogs else None,
+      catalog_versions,
+      no_update,
+    )
+
+  return (
+    course_catalog_options(course_catalogs),
+    no_update,
+    catalog_versions,
+    course_catalog if catalog_versions.get(course_catalog) != known_catalog_versions.get(course_catalog) else no_update,
+  )
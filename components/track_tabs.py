@@ -1,13 +1,30 @@
 from time import sleep
 import dash_bootstrap_components as dbc
-from src.develop_path import DevelopPath
-from consts import CourseTrajectoryConsts
-from src.generate_3d_graph import Generate3DGraph
+from consts import CourseTrajectoryConsts, BackgroundConsts
 from src.utils.database_handler import DatabaseHandler
-from dash import Input, Output, html, callback, State, ALL
+from src.track_layout import track_layout
+from src.utils.render_scheduler import RenderScheduler
+from src.utils.metrics_handler import metrics_handler
+from src.utils.static_figure_handler import static_figure_handler
+from src.utils.thread_job_manager import ThreadJobManager, raise_if_cancelled
+from dash.exceptions import PreventUpdate
+from dash import Input, Output, html, callback, clientside_callback, State, ALL, no_update, ctx
 
 
 database_handler = DatabaseHandler()
+render_scheduler = RenderScheduler(
+  database_handler=database_handler,
+)
+background_consts = BackgroundConsts().get_constants()
+background_callback_manager = ThreadJobManager(
+  max_workers=background_consts["max_workers"],
+  max_entries=background_consts["max_entries"],
+  cache_by=[
+    lambda: database_handler.get_catalog_versions(),
+    lambda: static_figure_handler.get_build_id(),
+  ],
+  expire=background_consts["expire_s"],
+)
 
 card = html.Div(
   children=[
@@ -26,6 +43,14 @@ card = html.Div(
             "border-bottom": "1px solid white",
           }
         ),
+        html.Div(
+          id="render-progress",
+          style={
+            "color": "gray",
+            "font-size": "0.8rem",
+            "padding": "0.2rem 1rem",
+          }
+        ),
         dbc.CardBody(
           id="card-content",
           style={
@@ -96,46 +121,74 @@ original_fig = None
 
 @callback(
     Output("modal-fs", "is_open"),
+    Output("3d_course_graph", "figure", allow_duplicate=True),
+    Output("fullscreen-loaded", "data"),
     Input("open-fs", "n_clicks"),
     State("modal-fs", "is_open"),
+    State("fullscreen-loaded", "data"),
+    State("course-catalog-store", "data"),
+    State("card-tabs", "active_tab"),
+    State("figure-bundle", "data"),
+    prevent_initial_call=True,
 )
-def toggle_modal(n, is_open):
-    if n:
-        return not is_open
-    return is_open
+@metrics_handler.instrument_callback
+def toggle_modal(n, is_open, fullscreen_loaded, course_catalog, active_tab, figure_bundle):
+    if not n:
+        return is_open, no_update, no_update
+    if is_open or fullscreen_loaded or figure_bundle:
+        return not is_open, no_update, no_update
+    
+    if int(active_tab.split("_")[-1]) > database_handler.get_tracks_count_per_course()[course_catalog]:
+      active_tab = "track_1"
+
+    fig = render_scheduler.fullscreen_figure(
+      course_name=course_catalog,
+      track=active_tab,
+    )
+    return True, fig, True
 
 @callback(
   Output("card-tabs", "children"),
   Output("card-content", "children"),
   Input("card-tabs", "active_tab"),
   Input("course-catalog-store", "data"),
+  background=True,
+  manager=background_callback_manager,
+  progress=[Output("render-progress", "children")],
+  progress_default=[""],
+  running=[
+    (
+      Output("card-content", "style"),
+      {"height": "100%", "opacity": "0.4", "pointer-events": "none", "transition": "opacity 0.3s"},
+      {"height": "100%"},
+    ),
+  ],
 )
-def update_tab_content(active_tab, course_catalog):
+@metrics_handler.instrument_callback
+def update_tab_content(set_progress, active_tab, course_catalog):
   if course_catalog is not None:
     dict_tabs_cnt = database_handler.get_tracks_count_per_course()
-    global last_camera_position
-    last_camera_position = None
+    if course_catalog not in dict_tabs_cnt:
+      raise PreventUpdate
     
     if int(active_tab.split("_")[-1]) > dict_tabs_cnt[course_catalog]:
       active_tab = "track_1"
-      
-    all_tracks_information = database_handler.get_course_track_information(
-      course_name=course_catalog
-    )
     
-    course_catalog_info = database_handler.get_course_catalog_information(
-      course_name=course_catalog
-    )
-
-    interactive_3d_graph_obj = Generate3DGraph(
+    set_progress(f"Rendering {active_tab.replace('_', ' ').title()}...")
+    figure_bundle = static_figure_handler.get_bundle(
       course_name=course_catalog,
-      course_catalog=course_catalog_info,
-      all_tracks_course_information=all_tracks_information
-    )
-    
-    interactive_3d_graph = interactive_3d_graph_obj.run(
       track=active_tab,
+      catalog_version=database_handler.get_catalog_version(course_catalog),
     )
+    if figure_bundle is not None:
+      interactive_3d_graph = track_layout(
+        figure_bundle=figure_bundle,
+      )
+    else:
+      interactive_3d_graph = render_scheduler.render(
+        course_name=course_catalog,
+        track=active_tab,
+      )
     
     return [
       [
@@ -159,10 +212,114 @@ def update_tab_content(active_tab, course_catalog):
         interactive_3d_graph,
     ]
 
+  raise PreventUpdate
+
+
+clientside_callback(
+  """
+  async function(figureBundle) {
+    if (!figureBundle) {
+      return window.dash_clientside.no_update;
+    }
+    const response = await fetch(figureBundle.figure);
+    return response.json();
+  }
+  """,
+  Output("3d_course_graph_inline", "figure"),
+  Input("figure-bundle", "data"),
+)
+
+
+clientside_callback(
+  """
+  async function(n, figureBundle, fullscreenLoaded) {
+    if (!n || !figureBundle || fullscreenLoaded) {
+      return [window.dash_clientside.no_update, window.dash_clientside.no_update];
+    }
+    const response = await fetch(figureBundle.fullscreen);
+    return [await response.json(), true];
+  }
+  """,
+  Output("3d_course_graph", "figure", allow_duplicate=True),
+  Output("fullscreen-loaded", "data", allow_duplicate=True),
+  Input("open-fs", "n_clicks"),
+  State("figure-bundle", "data"),
+  State("fullscreen-loaded", "data"),
+  prevent_initial_call=True,
+)
+
+
+clientside_callback(
+  """
+  function(clickData) {
+    const node = clickData && clickData.points.length ? clickData.points[0].customdata : null;
+    if (typeof node !== "string" || !node.startsWith("aggregate_")) {
+      return window.dash_clientside.no_update;
+    }
+    const graph = document.getElementById("3d_course_graph_inline").querySelector(".js-plotly-plot");
+    const traces = graph.data.map((trace, i) => trace.meta === node ? i : -1).filter(i => i >= 0);
+    if (traces.length) {
+      window.Plotly.restyle(graph, {"visible": !graph.data[traces[0]].visible}, traces);
+    }
+    return window.dash_clientside.no_update;
+  }
+  """,
+  Output("3d_course_graph_inline", "figure", allow_duplicate=True),
+  Input("3d_course_graph_inline", "clickData"),
+  prevent_initial_call=True,
+)
+
 
 course_trajectory_consts = CourseTrajectoryConsts().get_course_trajectory_consts()
 color_for_corequisites = course_trajectory_consts["color_for_corequisites"]
 color_for_prerequisites = course_trajectory_consts["color_for_prerequisites"]
+lazy_hover_descriptions = course_trajectory_consts["lazy_hover_descriptions"]
+
+
+@callback(
+  Output("course-descriptions-store", "data"),
+  Input("course-catalog-store", "data"),
+)
+@metrics_handler.instrument_callback
+def update_course_descriptions(course_catalog):
+  if not lazy_hover_descriptions or not course_catalog:
+    raise PreventUpdate
+
+  return database_handler.get_course_descriptions(
+    course_name=course_catalog
+  )
+
+
+clientside_callback(
+  """
+  function(hoverData, clickData, courseDescriptions) {
+    const data = hoverData || clickData;
+    const course = data && data.points.length ? data.points[0].customdata : null;
+    const description = course && courseDescriptions ? courseDescriptions[course] : null;
+    if (!description) {
+      return ["", {"display": "none"}];
+    }
+    return [description, {
+      "position": "absolute",
+      "left": "2%",
+      "bottom": "10%",
+      "max-width": "40%",
+      "padding": "0.6rem 0.8rem",
+      "background": "#131314",
+      "color": "white",
+      "font-size": "0.8rem",
+      "border-radius": "0.6rem",
+      "pointer-events": "none",
+      "z-index": "10",
+    }];
+  }
+  """,
+  Output("course-description", "children"),
+  Output("course-description", "style"),
+  Input("3d_course_graph_inline", "hoverData"),
+  Input("3d_course_graph_inline", "clickData"),
+  State("course-descriptions-store", "data"),
+)
 
 
 @callback(
@@ -170,7 +327,6 @@ color_for_prerequisites = course_trajectory_consts["color_for_prerequisites"]
   Output("path-to", "value"),
   Output('click-count', 'data'),
   Output('3d_course_graph', 'figure'),
-  Output("reset-button", "n_clicks"),
   
   Input('3d_course_graph', 'clickData'),
   Input('3d_course_graph', 'figure'),
@@ -178,76 +334,174 @@ color_for_prerequisites = course_trajectory_consts["color_for_prerequisites"]
   State("camera", "data"),
 
   State("path-to", "value"),
-  Input("path-to-button", "n_clicks"),
-  Input("reset-button", "n_clicks"),
-  State("course-catalog-store", "data"),
   Input("card-tabs", "active_tab"),
 )
-def update_figure(clickData, fig, click_count, camera_data, subject, n_clicks_submit_btn, n_clicks_reset_btn ,course_catalog, active_tab):
+@metrics_handler.instrument_callback
+def update_figure(clickData, fig, click_count, camera_data, subject, active_tab):
   global last_click_data
   global original_fig
 
-  if n_clicks_reset_btn == 1:
+  if not fig or not fig.get("data"):
+    raise PreventUpdate
+
+  if subject is not None and subject != "" and last_click_data == clickData:
+    raise PreventUpdate
+
+  if list(ctx.triggered_prop_ids) == ["3d_course_graph.figure"] and clickData is not None:
+    raise PreventUpdate
+
+  if subject is not None and subject != "" and last_click_data != clickData:
+    fig = original_fig
+    fig, click_count = highlight_course_node(clickData, fig, click_count, camera_data)
+    return "", "", click_count, fig
+  
+  if clickData is None:
+    original_fig = fig
+  
+  last_click_data = clickData
+  fig, click_count = highlight_course_node(clickData, fig, click_count, camera_data)
+  return "", "", click_count, fig
+
+
+@callback(
+  Output("complete-path-area", "children", allow_duplicate=True),
+  Output("path-to", "value", allow_duplicate=True),
+  Output("3d_course_graph", "figure", allow_duplicate=True),
+  Output("reset-button", "n_clicks"),
+
+  Input("path-to-button", "n_clicks"),
+  Input("reset-button", "n_clicks"),
+  State("path-to", "value"),
+  State("course-catalog-store", "data"),
+  State("card-tabs", "active_tab"),
+  State("camera", "data"),
+  background=True,
+  manager=background_callback_manager,
+  running=[
+    (Output("path-to-button", "disabled"), True, False),
+    (Output("reset-button", "disabled"), True, False),
+  ],
+  cancel=[
+    Input("card-tabs", "active_tab"),
+    Input("course-catalog-store", "data"),
+  ],
+  prevent_initial_call=True,
+)
+@metrics_handler.instrument_callback
+def develop_path(n_clicks_submit_btn, n_clicks_reset_btn, subject, course_catalog, active_tab, camera_data):
+  from src.develop_path import DevelopPath
+
+  if ctx.triggered_id == "reset-button" and n_clicks_reset_btn == 1:
+    course_bundle = database_handler.get_course_bundle(
+      course_name=course_catalog
+    )
     fig = DevelopPath(
       course_name=course_catalog,
-      course_catalog=database_handler.get_course_catalog_information(
-        course_name=course_catalog
-      ),
-      all_tracks_course_information=database_handler.get_course_track_information(
-        course_name=course_catalog
-      )
+      course_catalog=course_bundle.course_catalog,
+      all_tracks_course_information=course_bundle.all_tracks_course_information,
     ).run(
       track=active_tab,
       target_course="None",
-      last_camera_position=last_camera_position,
+      last_camera_position=camera_data,
     )
     
-    return "", "", click_count, fig, 0
+    return "", "", fig, 0
   
-  if subject is not None and subject != "" and last_click_data == clickData:
+  if ctx.triggered_id == "path-to-button" and subject is not None and subject != "":
+    course_bundle = database_handler.get_course_bundle(
+      course_name=course_catalog
+    )
+    raise_if_cancelled()
     new_fig, complete_detailed_path = DevelopPath(
       course_name=course_catalog,
-      course_catalog=database_handler.get_course_catalog_information(
-        course_name=course_catalog
-      ),
-      all_tracks_course_information=database_handler.get_course_track_information(
-        course_name=course_catalog
-      )
+      course_catalog=course_bundle.course_catalog,
+      all_tracks_course_information=course_bundle.all_tracks_course_information,
     ).run(
       track=active_tab,
       target_course=subject,
-      last_camera_position=last_camera_position,
+      last_camera_position=camera_data,
     )
     if new_fig is not None:
-      return complete_detailed_path, subject, click_count, new_fig, 0
+      return complete_detailed_path, subject, new_fig, 0
     else:
-      return "", "", click_count, fig, 0
+      return "", "", no_update, 0
 
-  if subject is not None and subject != "" and last_click_data != clickData:
-    fig = original_fig
-    fig, click_count = highlight_course_node(clickData, fig, click_count, camera_data)
-    return "", "", click_count, fig, 0
-  
-  if clickData is None:
-    original_fig = fig
-  
-  last_click_data = clickData
-  fig, click_count = highlight_course_node(clickData, fig, click_count, camera_data)
-  return "", "", click_count, fig, 0
+  raise PreventUpdate
 
 
 @callback(
   Output("camera", "data"),
   Input("3d_course_graph", "relayoutData"),
+  Input("card-tabs", "active_tab"),
+  Input("course-catalog-store", "data"),
 )
-def store_camera_position(relayoutData):
+@metrics_handler.instrument_callback
+def store_camera_position(relayoutData, active_tab, course_catalog):
+  global last_camera_position
+  if ctx.triggered_id != "3d_course_graph":
+    last_camera_position = None
+    return None
+
   if relayoutData is not None:
-    global last_camera_position
     if "scene.camera" in relayoutData:
       last_camera_position = relayoutData["scene.camera"]
       return relayoutData["scene.camera"]
 
 
+def color_course_node(trace, course, color):
+    custom_data = trace["customdata"]
+    if len(custom_data) == 1:
+      trace["marker"]["color"] = color
+      return
+
+    colors = trace["marker"].get("color")
+    if not isinstance(colors, list):
+      colors = [colors] * len(custom_data)
+    colors[custom_data.index(course)] = color
+    trace["marker"]["color"] = colors
+
+
+def highlight_course_edges(fig, course, highlighted):
+    highlight_id = f"highlight_{course}"
+    fig["data"] = [trace for trace in fig["data"] if trace.get("meta") != highlight_id]
+
+    for trace in list(fig["data"]):
+      meta = trace.get("meta") or ""
+      if meta.startswith("edges_"):
+        if not highlighted:
+          continue
+        custom_data = trace["customdata"]
+        points = [i for i in range(0, len(custom_data), 3) if custom_data[i] == course]
+        if points:
+          fig["data"].append({
+            "type": "scatter3d",
+            "x": [trace["x"][i + offset] for i in points for offset in range(3)],
+            "y": [trace["y"][i + offset] for i in points for offset in range(3)],
+            "z": [trace["z"][i + offset] for i in points for offset in range(3)],
+            "meta": highlight_id,
+            "mode": "lines",
+            "showlegend": False,
+            "hoverinfo": "skip",
+            "line": {
+              "color": color_for_prerequisites if meta == "edges_pre" else color_for_corequisites,
+              "width": 10,
+            },
+          })
+
+      elif trace.get("customdata") and str(trace["customdata"][0]).startswith("edge_"):
+        node_edge_custom_data = trace["customdata"][0].split("_")[-1]
+        pre_or_coreq = trace["customdata"][0].split("_")[1]
+        if node_edge_custom_data == course:
+          trace["visible"] = highlighted
+          trace["line"]["width"] = 10 if highlighted else 0
+          if not highlighted:
+            trace["line"]["color"] = "gray"
+          elif pre_or_coreq == "pre":
+            trace["line"]["color"] = color_for_prerequisites
+          else:
+            trace["line"]["color"] = color_for_corequisites
+
+
 def highlight_course_node(clickData, fig, click_count, camera_data):
     if clickData:
       sleep(0.5)
@@ -256,38 +510,24 @@ def highlight_course_node(clickData, fig, click_count, camera_data):
         click_count[custom_data] = 0
       
       click_count[custom_data] += 1
+      highlighted = click_count[custom_data] % 2 == 1
+
+      if custom_data.startswith("aggregate_"):
+        for trace in fig["data"]:
+          if trace.get("meta") == custom_data:
+            trace["visible"] = highlighted
 
-      for i in range(len(fig["data"])):
-        if "customdata" in fig["data"][i]:
-          if fig["data"][i]["customdata"][0] == custom_data and click_count[custom_data] % 2 == 1:
-            fig["data"][i]["marker"]["color"] = "blue"
-            for j in range(len(fig["data"])):
-              if "customdata" in fig["data"][j] and "edge" in fig["data"][j]["customdata"][0]:
-                node_edge_custom_data = fig["data"][j]["customdata"][0].split("_")[-1]
-                pre_or_coreq = fig["data"][j]["customdata"][0].split("_")[1]
-                if node_edge_custom_data == custom_data:
-                  fig["data"][j]["visible"] = True
-                  fig["data"][j]["line"]["width"] = 10
-                  if pre_or_coreq == "pre":
-                    fig["data"][j]["line"]["color"] = color_for_prerequisites
-                  else:
-                    fig["data"][j]["line"]["color"] = color_for_corequisites
-            break
-
-          elif fig["data"][i]["customdata"][0] == custom_data and click_count[custom_data] % 2 == 0:
-            fig["data"][i]["marker"]["color"] = "gray"
-            for j in range(len(fig["data"])):
-              if "customdata" in fig["data"][j] and "edge" in fig["data"][j]["customdata"][0]:
-                node_edge_custom_data = fig["data"][j]["customdata"][0].split("_")[-1]
-                pre_or_coreq = fig["data"][j]["customdata"][0].split("_")[1]
-                if node_edge_custom_data == custom_data:
-                  fig["data"][j]["visible"] = False
-                  fig["data"][j]["line"]["width"] = 0
-                  fig["data"][j]["line"]["color"] = "gray"
-            break
+      for trace in fig["data"]:
+        meta = trace.get("meta") or ""
+        if meta.startswith(("edges_", "highlight_")) or not trace.get("customdata") or str(trace["customdata"][0]).startswith("edge_"):
+          continue
+        if custom_data in trace["customdata"]:
+          color_course_node(trace, custom_data, "blue" if highlighted else "gray")
+          highlight_course_edges(fig, custom_data, highlighted)
+          break
       
       fig["layout"]["scene"]["camera"] = last_camera_position
       return fig, click_count
 
     fig["layout"]["scene"]["camera"] = last_camera_position
-    return fig, click_count
\ No newline at end of file
+    return fig, click_count
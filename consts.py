@@ -34,6 +34,9 @@ class CourseTrajectoryConsts:
       "critical_courses_threshold": course_trajectory_consts.getint("critical_courses_threshold"),
       "critical_courses_threshold_circle" : course_trajectory_consts.getint("critical_courses_threshold_circle"),
       "left_shift": course_trajectory_consts.getfloat("left_shift_multiplier") * course_trajectory_consts.getint("radius_circle"),
+      "lazy_hover_descriptions": course_trajectory_consts.getboolean("lazy_hover_descriptions", fallback=False),
+      "lod_node_threshold": course_trajectory_consts.getint("lod_node_threshold", fallback=400),
+      "lod_ring_points": course_trajectory_consts.getint("lod_ring_points", fallback=32),
     }
   
 
@@ -78,4 +81,281 @@ class MondoDBConsts:
 
     return {
       "host": host,
-    }
\ No newline at end of file
+    }
+
+class CacheConsts:
+  """
+  A class to store the constants for the in-memory course data cache
+  """
+
+  def __init__(self) -> None:
+    self.section = "CACHE_CONSTS"
+
+
+  def get_constants(self) -> dict:
+    """
+    Returns the constants for the in-memory course data cache
+    
+    Args:
+      - None
+    
+    Returns:
+      - dict: The constants for the in-memory course data cache
+    """
+
+    return {
+      "max_entries": config.getint(self.section, "max_entries", fallback=256),
+      "version_poll_interval_s": config.getfloat(self.section, "version_poll_interval_s", fallback=30),
+      "fetch_max_workers": config.getint(self.section, "fetch_max_workers", fallback=4),
+      "compact_records": config.getboolean(self.section, "compact_records", fallback=True),
+    }
+
+
+class QueryAPIConsts:
+  """
+  A class to store the constants for the JSON query API
+  """
+
+  def __init__(self) -> None:
+    self.section = "QUERY_API_CONSTS"
+
+
+  def get_constants(self) -> dict:
+    """
+    Returns the constants for the JSON query API
+    
+    Args:
+      - None
+    
+    Returns:
+      - dict: The constants for the JSON query API
+    """
+
+    return {
+      "url_prefix": config.get(self.section, "url_prefix", fallback="/api/v1"),
+      "max_age": config.getint(self.section, "max_age", fallback=60),
+      "cache_max_entries": config.getint(self.section, "cache_max_entries", fallback=512),
+    }
+
+
+class MetricsConsts:
+  """
+  A class to store the constants for the metrics endpoint
+  """
+
+  def __init__(self) -> None:
+    self.section = "METRICS_CONSTS"
+
+
+  def get_constants(self) -> dict:
+    """
+    Returns the constants for the metrics endpoint
+    
+    Args:
+      - None
+    
+    Returns:
+      - dict: The constants for the metrics endpoint
+    """
+
+    return {
+      "enabled": config.getboolean(self.section, "enabled", fallback=True),
+      "route": config.get(self.section, "route", fallback="/metrics"),
+    }
+
+
+class TraceConsts:
+  """
+  A class to store the constants for the request tracing
+  """
+
+  def __init__(self) -> None:
+    self.section = "TRACE_CONSTS"
+
+
+  def get_constants(self) -> dict:
+    """
+    Returns the constants for the request tracing
+    
+    Args:
+      - None
+    
+    Returns:
+      - dict: The constants for the request tracing
+    """
+
+    return {
+      "enabled": config.getboolean(self.section, "enabled", fallback=False),
+      "sample_rate": config.getfloat(self.section, "sample_rate", fallback=0.01),
+      "slow_threshold_ms": config.getfloat(self.section, "slow_threshold_ms", fallback=1000),
+      "directory": config.get(self.section, "directory", fallback="traces"),
+      "max_files": config.getint(self.section, "max_files", fallback=500),
+    }
+
+
+class ProfileConsts:
+  """
+  A class to store the constants for the on-demand callback profiling
+  """
+
+  def __init__(self) -> None:
+    self.section = "PROFILE_CONSTS"
+
+
+  def get_constants(self) -> dict:
+    """
+    Returns the constants for the on-demand callback profiling
+    
+    Args:
+      - None
+    
+    Returns:
+      - dict: The constants for the on-demand callback profiling
+    """
+
+    return {
+      "directory": config.get(self.section, "directory", fallback="profiles"),
+      "admin_token": config.get(self.section, "admin_token", fallback=""),
+      "arm_on_start": config.get(self.section, "arm_on_start", fallback=""),
+      "top_n": config.getint(self.section, "top_n", fallback=25),
+    }
+
+
+class RenderConsts:
+  """
+  A class to store the constants for the figure rendering
+  """
+
+  def __init__(self) -> None:
+    self.section = "RENDER_CONSTS"
+
+
+  def get_constants(self) -> dict:
+    """
+    Returns the constants for the figure rendering
+    
+    Args:
+      - None
+    
+    Returns:
+      - dict: The constants for the figure rendering
+    """
+
+    return {
+      "prefetch": config.getboolean(self.section, "prefetch", fallback=True),
+      "max_workers": config.getint(self.section, "max_workers", fallback=2),
+      "cache_max_entries": config.getint(self.section, "cache_max_entries", fallback=32),
+    }
+
+
+class WarmUpConsts:
+  """
+  A class to store the constants for the startup warm-up
+  """
+
+  def __init__(self) -> None:
+    self.section = "WARM_UP_CONSTS"
+
+
+  def get_constants(self) -> dict:
+    """
+    Returns the constants for the startup warm-up.
+    top_n is the number of tracks warmed up, 0 for every track. Either way at most RENDER_CONSTS cache_max_entries
+    tracks are warmed up, the figure cache holding no more.
+    
+    Args:
+      - None
+    
+    Returns:
+      - dict: The constants for the startup warm-up
+    """
+
+    return {
+      "enabled": config.getboolean(self.section, "enabled", fallback=True),
+      "time_budget_s": config.getfloat(self.section, "time_budget_s", fallback=120),
+      "max_workers": config.getint(self.section, "max_workers", fallback=4),
+      "top_n": config.getint(self.section, "top_n", fallback=0),
+      "route": config.get(self.section, "route", fallback="/readyz"),
+    }
+
+
+class SerializerConsts:
+  """
+  A class to store the constants for the figure serialization
+  """
+
+  def __init__(self) -> None:
+    self.section = "SERIALIZER_CONSTS"
+
+
+  def get_constants(self) -> dict:
+    """
+    Returns the constants for the figure serialization
+    
+    Args:
+      - None
+    
+    Returns:
+      - dict: The constants for the figure serialization
+    """
+
+    return {
+      "precision": config.getint(self.section, "precision", fallback=3),
+      "typed_arrays": config.getboolean(self.section, "typed_arrays", fallback=True),
+      "typed_array_min_length": config.getint(self.section, "typed_array_min_length", fallback=16),
+    }
+
+
+class BackgroundConsts:
+  """
+  A class to store the constants for the background callbacks
+  """
+
+  def __init__(self) -> None:
+    self.section = "BACKGROUND_CONSTS"
+
+
+  def get_constants(self) -> dict:
+    """
+    Returns the constants for the background callbacks
+    
+    Args:
+      - None
+    
+    Returns:
+      - dict: The constants for the background callbacks
+    """
+
+    return {
+      "max_workers": config.getint(self.section, "max_workers", fallback=4),
+      "max_entries": config.getint(self.section, "max_entries", fallback=32),
+      "expire_s": config.getint(self.section, "expire_s", fallback=3600),
+    }
+
+
+class StaticFiguresConsts:
+  """
+  A class to store the constants for the prebuilt figure bundles
+  """
+
+  def __init__(self) -> None:
+    self.section = "STATIC_FIGURES_CONSTS"
+
+
+  def get_constants(self) -> dict:
+    """
+    Returns the constants for the prebuilt figure bundles
+    
+    Args:
+      - None
+    
+    Returns:
+      - dict: The constants for the prebuilt figure bundles
+    """
+
+    return {
+      "enabled": config.getboolean(self.section, "enabled", fallback=False),
+      "directory": config.get(self.section, "directory", fallback="assets/figures"),
+      "url_path": config.get(self.section, "url_path", fallback="/assets/figures/"),
+      "max_age_s": config.getint(self.section, "max_age_s", fallback=31536000),
+    }
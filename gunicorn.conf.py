@@ -0,0 +1,19 @@
+import os
+
+
+wsgi_app = "app:server"
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8050")
+workers = int(os.environ.get("WEB_CONCURRENCY", 2))
+threads = int(os.environ.get("GUNICORN_THREADS", 4))
+timeout = 120
+
+# Every worker imports app.py and warms its own figure cache on a background thread,
+# so the app must not be preloaded in the master: the warm-up threads would not survive the fork.
+preload_app = False
+
+
+def post_worker_init(worker):
+  # The warm-up is not started on import, the worker starts it once the app is loaded.
+  from app import warm_up_handler
+
+  warm_up_handler.start()
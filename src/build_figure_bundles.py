@@ -0,0 +1,240 @@
+import os
+import json
+import hashlib
+from glob import glob
+from argparse import ArgumentParser
+
+
+class BuildFigureBundles:
+  """
+  The BuildFigureBundles class renders the figures of every track of every catalog to content-hashed static JSON files,
+  served as they are by the app when the static figures are enabled.
+  """
+
+  KINDS = ("figure", "fullscreen", "index")
+
+
+  def __init__(self,
+               output_directory: str,
+               courses: list = None,
+               hash_length: int = 16) -> None:
+    """
+    Initialize the BuildFigureBundles class.
+
+    Args:
+      - output_directory (str): The directory the bundles and their manifest are written to, under the assets folder of the app.
+      - courses (list): The catalogs to build, every catalog if None. The bundles of the other catalogs are kept.
+      - hash_length (int): The number of hexadecimal digits of the content hash in the file names.
+
+    Returns:
+      - None
+    """
+
+    self.output_directory = output_directory
+    self.courses = courses
+    self.hash_length = hash_length
+    self.manifest_path = os.path.join(output_directory, "manifest.json")
+
+
+  def __figure_index(self,
+                     figure: dict) -> dict:
+    """
+    Index the traces of a fullscreen figure, so a client can highlight a course without scanning every trace.
+    The edges of a merged edge trace are indexed by the course their segments start from.
+
+    Args:
+      - figure (dict): The serialized fullscreen figure.
+
+    Returns:
+      - dict: {"nodes": {course: trace index}, "edges": {course: [{"trace", "relation"}]}, "aggregates": {aggregate: [trace index]}}.
+    """
+
+    index = {"nodes": {}, "edges": {}, "aggregates": {}}
+    for i, trace in enumerate(figure["data"]):
+      meta = trace.get("meta") or ""
+      if meta.startswith("aggregate_"):
+        index["aggregates"].setdefault(meta, []).append(i)
+      if not trace.get("customdata"):
+        continue
+      if meta.startswith("edges_"):
+        for course in dict.fromkeys(trace["customdata"][::3]):
+          index["edges"].setdefault(course, []).append({
+            "trace": i,
+            "relation": meta.split("_")[1],
+          })
+        continue
+      custom_data = trace["customdata"][0]
+      if "edge" in custom_data:
+        index["edges"].setdefault(custom_data.split("_")[-1], []).append({
+          "trace": i,
+          "relation": custom_data.split("_")[1],
+        })
+      else:
+        for course in trace["customdata"]:
+          index["nodes"].setdefault(course, i)
+    return index
+
+
+  def __write(self,
+              course_name: str,
+              track: str,
+              kind: str,
+              obj) -> str:
+    """
+    Write an object to a content-hashed JSON file, unless a file with the same content exists.
+
+    Args:
+      - course_name (str): The name of the course.
+      - track (str): The track, e.g. track_1.
+      - kind (str): One of KINDS.
+      - obj: The object, a figure or an index.
+
+    Returns:
+      - str: The path of the file relative to the output directory.
+    """
+
+    from plotly.io.json import to_json_plotly
+
+    content = to_json_plotly(obj).encode("utf-8")
+    content_hash = hashlib.blake2b(content, digest_size=self.hash_length // 2).hexdigest()
+    relative_path = f"{course_name}/{track}.{kind}.{content_hash}.json"
+    file_path = os.path.join(self.output_directory, relative_path)
+    if not os.path.exists(file_path):
+      os.makedirs(os.path.dirname(file_path), exist_ok=True)
+      with open(f"{file_path}.tmp", "wb") as f:
+        f.write(content)
+      os.replace(f"{file_path}.tmp", file_path)
+    return relative_path
+
+
+  def __build_catalog(self,
+                      database_handler,
+                      course_name: str) -> dict:
+    """
+    Render every track of a catalog to its bundle files.
+
+    Args:
+      - database_handler (DatabaseHandler): The handler the course data is read from.
+      - course_name (str): The name of the course.
+
+    Returns:
+      - dict: The manifest entry of the catalog, its version and the file paths of every track.
+    """
+
+    from src.generate_3d_graph import Generate3DGraph
+
+    catalog_version = database_handler.get_catalog_version(course_name)
+    course_bundle = database_handler.get_course_bundle(course_name=course_name)
+    interactive_3d_graph_obj = Generate3DGraph(
+      course_name=course_name,
+      course_catalog=course_bundle.course_catalog,
+      all_tracks_course_information=course_bundle.all_tracks_course_information,
+    )
+
+    tracks = {}
+    for track in course_bundle.all_tracks_course_information:
+      interactive_3d_graph_obj.run(track=track)
+      rendered = {
+        "figure": interactive_3d_graph_obj.inline_figure,
+        "fullscreen": interactive_3d_graph_obj.fullscreen_figure,
+        "index": self.__figure_index(interactive_3d_graph_obj.fullscreen_figure),
+      }
+      tracks[track] = {
+        kind: self.__write(course_name, track, kind, rendered[kind])
+        for kind in self.KINDS
+      }
+    return {"version": catalog_version, "tracks": tracks}
+
+
+  def __load_manifest(self) -> dict:
+    """
+    Load the manifest of the previous build.
+
+    Args:
+      - None
+
+    Returns:
+      - dict: The manifest, empty if there was no build.
+    """
+
+    if not os.path.exists(self.manifest_path):
+      return {"catalogs": {}}
+    with open(self.manifest_path) as f:
+      return json.load(f)
+
+
+  def __prune(self,
+              manifest: dict) -> int:
+    """
+    Remove the bundle files the manifest no longer refers to.
+
+    Args:
+      - manifest (dict): The new manifest.
+
+    Returns:
+      - int: The number of removed files.
+    """
+
+    referenced = {
+      os.path.normpath(os.path.join(self.output_directory, file_path))
+      for catalog in manifest["catalogs"].values()
+      for track_files in catalog["tracks"].values()
+      for file_path in track_files.values()
+    }
+    n_removed = 0
+    for file_path in glob(os.path.join(self.output_directory, "*", "*.json")):
+      if os.path.normpath(file_path) not in referenced:
+        os.remove(file_path)
+        n_removed += 1
+    return n_removed
+
+
+  def run(self) -> dict:
+    """
+    Build the bundles, then atomically replace the manifest, so the app never refers to a missing file,
+    and remove the files of the previous build.
+
+    Args:
+      - None
+
+    Returns:
+      - dict: The new manifest.
+    """
+
+    from src.utils.database_handler import DatabaseHandler
+
+    database_handler = DatabaseHandler()
+    manifest = self.__load_manifest()
+    courses_catalog = database_handler.get_courses_catalog()
+    catalogs = {
+      course_name: catalog
+      for course_name, catalog in manifest["catalogs"].items()
+      if course_name in courses_catalog
+    }
+    for course_name in self.courses if self.courses is not None else courses_catalog:
+      catalogs[course_name] = self.__build_catalog(database_handler, course_name)
+
+    manifest = {
+      "build_id": hashlib.blake2b(json.dumps(catalogs, sort_keys=True).encode("utf-8"), digest_size=self.hash_length // 2).hexdigest(),
+      "catalogs": catalogs,
+    }
+    os.makedirs(self.output_directory, exist_ok=True)
+    with open(f"{self.manifest_path}.tmp", "w") as f:
+      json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(f"{self.manifest_path}.tmp", self.manifest_path)
+    manifest["n_removed"] = self.__prune(manifest)
+    return manifest
+
+
+if __name__ == "__main__":
+  parser = ArgumentParser(description="Prebuild the figures of every track of every catalog as content-hashed static files.")
+  parser.add_argument("--output-directory", default="assets/figures", help="The directory the bundles are written to, the directory of the STATIC_FIGURES_CONSTS section.")
+  parser.add_argument("--courses", nargs="+", default=None, help="The catalogs to build, every catalog by default.")
+  args = parser.parse_args()
+
+  manifest = BuildFigureBundles(
+    output_directory=args.output_directory,
+    courses=args.courses,
+  ).run()
+  n_tracks = sum(len(catalog["tracks"]) for catalog in manifest["catalogs"].values())
+  print(f"Built {n_tracks} tracks of {len(manifest['catalogs'])} catalogs to {args.output_directory}, removed {manifest['n_removed']} stale files")
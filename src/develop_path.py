@@ -1,8 +1,10 @@
-import numpy as np
 from dash import html
-import plotly.graph_objects as go
 from warnings import filterwarnings
 from consts import CourseTrajectoryConsts
+from src.layout_engine import LayoutEngine
+from src.utils.trace_handler import trace_handler
+from src.utils.figure_serializer import figure_serializer
+from src.utils.course_formatting import add_intermediate_br_tags, dynamic_color_choice_for_semester
 
 
 filterwarnings("ignore")
@@ -60,62 +62,52 @@ class DevelopPath:
     self.complete_path_from_start = course_trajectory_consts["complete_path_from_start"]
     self.critical_courses_threshold = course_trajectory_consts["critical_courses_threshold"]
     self.critical_courses_threshold_circle = course_trajectory_consts["critical_courses_threshold_circle"]
+    self.lazy_hover_descriptions = course_trajectory_consts["lazy_hover_descriptions"]
 
 
-  def __dynamic_color_choice_for_semester(self,
-                                          courses_in_year: dict) -> dict:
+  def __get_hover_text(self,
+                       course: str,
+                       course_information: dict) -> str:
     """
-    Assign colors to courses based on their semester.
+    Get the hover text of a course, its description wrapped with <br> tags when preparing the data.
+    Data prepared before the hover text was stored is wrapped here.
+    With lazy hover descriptions only the course code and name are embedded in the figure,
+    the description is looked up by the browser in the course-descriptions-store.
     
     Args:
-      - courses_in_year (dict): The courses in a year.
+      - course (str): The course code.
+      - course_information (dict): The prepared information of the course.
     
     Returns:
-      - dict: The dictionary with the course colors.
+      - str: The course description with <br> tags inserted.
     """
 
-    semester_colors = {}
-    cnt = 0
-    for year in courses_in_year:
-      for semester in courses_in_year[year]:
-        semester_colors[
-          (year, semester)
-        ] = f"hsl({cnt * (360 // (len(courses_in_year) * len(courses_in_year[year])))}, 70%, 50%)"
-        cnt += 1
-    return semester_colors
-           
-
-
-  def __add_intermediate_br_tags(self,
-                                 description: str,
-                                 max_chars=50) -> str:
+    if self.lazy_hover_descriptions:
+      return self.__get_display_name(course, course_information)
+    hover_text = course_information.get("hover_text")
+    if hover_text is None:
+      hover_text = add_intermediate_br_tags(course_information.get("course_description", ""))
+    return hover_text
+
+
+  def __get_display_name(self,
+                         course: str,
+                         course_information: dict) -> str:
     """
-    Insert <br> tags into the description string after every max_chars characters
-    without breaking words.
+    Get the legend name of a course, precomputed by PrepareCoursesData when available.
     
     Args:
-      - description (str): The original description string.
-      - max_chars (int): Maximum number of characters before inserting a <br> tag (default is 64).
+      - course (str): The course code.
+      - course_information (dict): The prepared information of the course.
     
     Returns:
-      - str: The modified description with <br> tags inserted.
+      - str: The course code followed by the course name if there is one.
     """
-    
-    words = description.split()
-    lines = []
-    current_line = ""
-    
-    for word in words:
-        if len(current_line) + len(word) <= max_chars:
-            current_line += word + " "
-        else:
-            lines.append(current_line.strip())
-            current_line = word + " "
-    
-    if current_line:
-        lines.append(current_line.strip())
-    
-    return "<br>".join(lines)
+
+    if "display_name" in course_information:
+      return course_information["display_name"]
+    course_name = course_information.get("course_name", "")
+    return f"{course}-{course_name}" if course_name else course
   
 
   def __create_circle(self,
@@ -133,6 +125,8 @@ class DevelopPath:
       - list[int]: The list of points in the circle.
     """
 
+    import numpy as np
+
     if tower == "pre-knowledge":
       radius = self.radius_circle / 2
     else:
@@ -151,41 +145,11 @@ class DevelopPath:
     return x, y, z
   
 
-  def __create_random_points_on_circle(self, z_level, num_points, angle_offset=0):
-    theta = np.linspace(0, 2 * np.pi, num_points) + angle_offset
-    x = self.radius_circle * np.cos(theta)
-    y = self.radius_circle * np.sin(theta)
-    z = np.full(num_points, z_level)
-    return x.tolist(), y.tolist(), z.tolist()
-  
-
-  def __dynamic_color_choice_for_semester(self,
-                                          courses_in_year: dict) -> dict:
-    """
-    Assign colors to courses based on their semester.
-    
-    Args:
-      - courses_in_year (dict): The courses in a year.
-    
-    Returns:
-      - dict: The dictionary with the course colors.
-    """
-
-    semester_colors = {}
-    cnt = 0
-    for year in courses_in_year:
-      semester_colors[year] = {}
-      for semester in courses_in_year[year]:
-        semester_colors[year][semester] = "gray"
-        cnt += 1
-    return semester_colors
-  
-
   def __develop_path_to_target(self,
                                track: str,
                                target_course: str,
                                path_to_target: list,
-                               last_camera_position: dict) -> go.Figure:
+                               last_camera_position: dict) -> dict:
     """
     Create a 3D graph of the course trajectory for a particular track.
     
@@ -195,260 +159,111 @@ class DevelopPath:
       - path_to_target (list): The path to the target course.
 
     Returns:
-      - go.Figure: The 3D graph of the course trajectory.
+      - dict: The serialized 3D graph of the course trajectory.
     """
 
+    import plotly.graph_objects as go
+
     courses = self.course_catalog[track]
     fig = go.Figure()
-    semester_colors = self.__dynamic_color_choice_for_semester(courses)
-    course_positions, course_colors = {}, {}
-    
-    taught_courses = set()
-    for year in courses:
-      if year != "extra_course_related_info":
-        for semester in courses[year]:
-          taught_courses.update(courses[year][semester].keys())
-
-    z_level = self.z_level
-    semester_elevation = {}
-    for year in courses:
-      if year == "extra_course_related_info":
-        continue
-      for semester in courses[year]:
-        courses_in_semester = list(courses[year][semester].keys())
-        n_courses = len(courses_in_semester)
-        if year not in semester_elevation:
-          semester_elevation[year] = {}
-
-        semester_elevation[year][semester] = z_level
-        course_colors.update({course: semester_colors[year][semester] for course in courses_in_semester})
-            
-        fig.add_trace(go.Scatter3d(
-          x=[0],
-          y=[0],
-          z=[z_level],
-          text=f"Year: {year}, Semester: {semester}",
-          mode='text',
-          showlegend=False,
-          textposition='middle center',
-          textfont=dict(size=12, color='black', family="Arial", weight="bold"),
-          hoverinfo='skip'  
-        ))
+    semester_colors = dynamic_color_choice_for_semester(courses, color="gray")
+    course_colors = {}
+
+    layout = LayoutEngine(
+      courses=courses,
+      radius_circle=self.radius_circle,
+      z_level=self.z_level,
+      z_increment=self.z_increment,
+      left_shift=self.left_shift,
+      seed=f"{self.course_name}/{track}",
+    ).run()
+
+    for year, semester, z_level, first_slot, end_slot in layout.rings:
+      courses_in_semester = layout.courses[first_slot:end_slot]
+      course_colors.update({course: semester_colors[year][semester] for course in courses_in_semester})
+          
+      fig.add_trace(go.Scatter3d(
+        x=[0],
+        y=[0],
+        z=[z_level],
+        text=f"Year: {year}, Semester: {semester}",
+        mode='text',
+        showlegend=False,
+        textposition='middle center',
+        textfont=dict(size=12, color='black', family="Arial", weight="bold"),
+        hoverinfo='skip'  
+      ))
 
-        course_cnt, critical_course_cnt = 0, 0
-        angle_offset = np.random.uniform(0, 2 * np.pi)
-        x, y, z = self.__create_random_points_on_circle(z_level, n_courses + 1, angle_offset)
-        course_positions.update({course: (x[i], y[i], z[i]) for i, course in enumerate(courses_in_semester)})
-    
-        for i, course in enumerate(courses_in_semester):
-          course_desc, course_name = "", ""
-          course_cnt += 1
-          if course in self.all_tracks_course_information[track]:
-            if "course_description" in self.all_tracks_course_information[track][course]:
-              course_desc = self.__add_intermediate_br_tags(self.all_tracks_course_information[track][course]["course_description"])
-            if "course_name" in self.all_tracks_course_information[track][course]:
-              course_name = self.all_tracks_course_information[track][course]["course_name"]
-
-            self.all_tracks_course_information[track][course]["location"] = {"x": x[i], "y": y[i], "z": z[i]}
-
-          if course in self.all_tracks_course_information[track] and self.all_tracks_course_information[track][course]["dependency_count"] >= self.critical_courses_threshold:
-            critical_course_cnt += 1
-            fig.add_trace(go.Scatter3d(
-              x=[x[i]],
-              y=[y[i]],
-              z=[z[i]],
-              text=course,  
-              mode='markers+text',
-              customdata=[course],
-              hoverinfo='text',  
-              marker=dict(size=self.special_marker_size, color=course_colors[course]),
-              textfont=dict(size=12, color='black', family="Arial", weight="bold"),
-              textposition='top center',
-              hovertext=course_desc + f"<br><br>Dependencies: {self.all_tracks_course_information[track][course]['dependency_count']}",
-              name=f"{course}-{course_name}" if course_name else course
-            ))
-          else:
-            fig.add_trace(go.Scatter3d(
-              x=[x[i]],
-              y=[y[i]],
-              z=[z[i]],
-              text=course, 
-              customdata=[course], 
-              mode='markers+text',
-              hoverinfo='text',  
-              marker=dict(size=self.marker_size, color=course_colors[course]),
-              textfont=dict(size=12, color='black', family="Arial", weight="bold"),
-              textposition='top center',
-              hovertext=course_desc,
-              name=f"{course}-{course_name}" if course_name else course
-            ))
+      course_cnt, critical_course_cnt = 0, 0
+      for i, course in enumerate(courses_in_semester, start=first_slot):
+        course_desc, display_name = "", course
+        course_cnt += 1
+        if course in self.all_tracks_course_information[track]:
+          course_desc = self.__get_hover_text(course, self.all_tracks_course_information[track][course])
+          display_name = self.__get_display_name(course, self.all_tracks_course_information[track][course])
 
-        if critical_course_cnt >= self.critical_courses_threshold_circle:
-          circle_x, circle_y, circle_z = self.__create_circle("", 100, z_level)
+        if course in self.all_tracks_course_information[track] and self.all_tracks_course_information[track][course]["dependency_count"] >= self.critical_courses_threshold:
+          critical_course_cnt += 1
           fig.add_trace(go.Scatter3d(
-            x=circle_x,
-            y=circle_y,
-            z=circle_z,
-            mode='lines',
-            line=dict(color='black', width=10),
-            name=f"Year: {year}, Semester: {semester}",
-            hoverinfo='skip'  
+            x=[layout.x[i]],
+            y=[layout.y[i]],
+            z=[layout.z[i]],
+            text=course,  
+            mode='markers+text',
+            customdata=[course],
+            hoverinfo='text',  
+            marker=dict(size=self.special_marker_size, color=course_colors[course]),
+            textfont=dict(size=12, color='black', family="Arial", weight="bold"),
+            textposition='top center',
+            hovertext=course_desc + f"<br><br>Dependencies: {self.all_tracks_course_information[track][course]['dependency_count']}",
+            name=display_name
           ))
         else:
-          circle_x, circle_y, circle_z = self.__create_circle("", 100, z_level)
           fig.add_trace(go.Scatter3d(
-            x=circle_x,
-            y=circle_y,
-            z=circle_z,
-            mode='lines',
-            line=dict(color='black', width=2, dash='dash'),
-            name=f"Year: {year}, Semester: {semester}",
-            hoverinfo='skip'  
+            x=[layout.x[i]],
+            y=[layout.y[i]],
+            z=[layout.z[i]],
+            text=course, 
+            customdata=[course], 
+            mode='markers+text',
+            hoverinfo='text',  
+            marker=dict(size=self.marker_size, color=course_colors[course]),
+            textfont=dict(size=12, color='black', family="Arial", weight="bold"),
+            textposition='top center',
+            hovertext=course_desc,
+            name=display_name
           ))
 
-        z_level += self.z_increment
+      if critical_course_cnt >= self.critical_courses_threshold_circle:
+        circle_x, circle_y, circle_z = self.__create_circle("", 100, z_level)
+        fig.add_trace(go.Scatter3d(
+          x=circle_x,
+          y=circle_y,
+          z=circle_z,
+          mode='lines',
+          line=dict(color='black', width=10),
+          name=f"Year: {year}, Semester: {semester}",
+          hoverinfo='skip'  
+        ))
+      else:
+        circle_x, circle_y, circle_z = self.__create_circle("", 100, z_level)
+        fig.add_trace(go.Scatter3d(
+          x=circle_x,
+          y=circle_y,
+          z=circle_z,
+          mode='lines',
+          line=dict(color='black', width=2, dash='dash'),
+          name=f"Year: {year}, Semester: {semester}",
+          hoverinfo='skip'  
+        ))
 
-    external_radius = self.radius_circle
-    external_positions = {}
-    unique_prereqs = []
-    unique_prereqs_complete_info = []
 
-    for year in courses:
-      if year == "extra_course_related_info":
-        continue
-      for semester in courses[year]:
-        for course in courses[year][semester]:
-          details = courses[year][semester][course]
-          course_name = ""
-          if "course_name" in details:
-            course_name = details["course_name"]
-          
-          if 'prerequisites' in details:
-            prerequisites_data = details['prerequisites']
-            if isinstance(prerequisites_data, list):
-              for item in prerequisites_data:
-                if isinstance(item, list):
-                  for prereq in item:
-                    if isinstance(prereq, list):
-                      for sub_prereq in prereq:
-                        if sub_prereq not in taught_courses:
-                          if sub_prereq not in unique_prereqs:
-                            unique_prereqs.append(sub_prereq)
-                            unique_prereqs_complete_info.append([sub_prereq, int(year), int(semester), semester_elevation[year][semester]])
-                          elif sub_prereq in unique_prereqs:
-                            index = unique_prereqs.index(sub_prereq)
-                            already_present_prereq, already_present_year, already_present_semester, already_present_semester_elevation = unique_prereqs_complete_info[index]
-                            if already_present_year > int(year):
-                              unique_prereqs_complete_info[index] = [sub_prereq, int(year), int(semester), semester_elevation[year][semester]]
-                            elif already_present_year == int(year) and already_present_semester > int(semester):
-                              unique_prereqs_complete_info[index] = [sub_prereq, int(year), int(semester), semester_elevation[year][semester]]
-
-                    elif prereq not in taught_courses:
-                      if prereq not in unique_prereqs:
-                        unique_prereqs.append(prereq)
-                        unique_prereqs_complete_info.append([prereq, int(year), int(semester), semester_elevation[year][semester]])
-                      elif prereq in unique_prereqs:
-                        index = unique_prereqs.index(prereq)
-                        already_present_prereq, already_present_year, already_present_semester, already_present_semester_elevation = unique_prereqs_complete_info[index]
-                        if already_present_year > int(year):
-                          unique_prereqs_complete_info[index] = [prereq, int(year), int(semester), semester_elevation[year][semester]]
-                        elif already_present_year == int(year) and already_present_semester > int(semester):
-                          unique_prereqs_complete_info[index] = [prereq, int(year), int(semester), semester_elevation[year][semester]]
-                else:
-                  if item not in taught_courses:
-                    if item not in unique_prereqs:
-                      unique_prereqs.append(item)
-                      unique_prereqs_complete_info.append([item, int(year), int(semester), semester_elevation[year][semester]])
-                    elif item in unique_prereqs:
-                      index = unique_prereqs.index(item)
-                      already_present_item, already_present_year, already_present_semester, already_present_semester_elevation = unique_prereqs_complete_info[index]
-                      if already_present_year > int(year):
-                        unique_prereqs_complete_info[index] = [item, int(year), int(semester), semester_elevation[year][semester]]
-                      elif already_present_year == int(year) and already_present_semester > int(semester):
-                        unique_prereqs_complete_info[index] = [item, int(year), int(semester), semester_elevation[year][semester]]
-            else:
-              if prerequisites_data not in taught_courses:
-                if prerequisites_data not in unique_prereqs:
-                  unique_prereqs.append(prerequisites_data)
-                  unique_prereqs_complete_info.append([prerequisites_data, int(year), int(semester), semester_elevation[year][semester]])
-                elif prerequisites_data in unique_prereqs:
-                  index = unique_prereqs.index(prerequisites_data)
-                  already_present_prerequisites_data, already_present_year, already_present_semester, already_present_semester_elevation = unique_prereqs_complete_info[index]
-                  if already_present_year > int(year):
-                    unique_prereqs_complete_info[index] = [prerequisites_data, int(year), int(semester), semester_elevation[year][semester]]
-                  elif already_present_year == int(year) and already_present_semester > int(semester):
-                    unique_prereqs_complete_info[index] = [prerequisites_data, int(year), int(semester), semester_elevation[year][semester]]
-
-          if 'corequisites' in details:
-            prerequisites_data = details['corequisites']
-            if isinstance(prerequisites_data, list):
-              for item in prerequisites_data:
-                if isinstance(item, list):
-                  for prereq in item:
-                    if isinstance(prereq, list):
-                      for sub_prereq in prereq:
-                        if sub_prereq not in taught_courses:
-                          if sub_prereq not in unique_prereqs:
-                            unique_prereqs.append(sub_prereq)
-                            unique_prereqs_complete_info.append([sub_prereq, int(year), int(semester), semester_elevation[year][semester]])
-                          elif sub_prereq in unique_prereqs:
-                            index = unique_prereqs.index(sub_prereq)
-                            already_present_prereq, already_present_year, already_present_semester, already_present_semester_elevation = unique_prereqs_complete_info[index]
-                            if already_present_year > int(year):
-                              unique_prereqs_complete_info[index] = [sub_prereq, int(year), int(semester), semester_elevation[year][semester]]
-                            elif already_present_year == int(year) and already_present_semester > int(semester):
-                              unique_prereqs_complete_info[index] = [sub_prereq, int(year), int(semester), semester_elevation[year][semester]]
-
-                    elif prereq not in taught_courses:
-                      if prereq not in unique_prereqs:
-                        unique_prereqs.append(prereq)
-                        unique_prereqs_complete_info.append([prereq, int(year), int(semester), semester_elevation[year][semester]])
-                      elif prereq in unique_prereqs:
-                        index = unique_prereqs.index(prereq)
-                        already_present_prereq, already_present_year, already_present_semester, already_present_semester_elevation = unique_prereqs_complete_info[index]
-                        if already_present_year > int(year):
-                          unique_prereqs_complete_info[index] = [prereq, int(year), int(semester), semester_elevation[year][semester]]
-                        elif already_present_year == int(year) and already_present_semester > int(semester):
-                          unique_prereqs_complete_info[index] = [prereq, int(year), int(semester), semester_elevation[year][semester]]
-
-                else:
-                  if item not in taught_courses:
-                    if item not in unique_prereqs:
-                      unique_prereqs.append(item)
-                      unique_prereqs_complete_info.append([item, int(year), int(semester), semester_elevation[year][semester]])
-                    elif item in unique_prereqs:
-                      index = unique_prereqs.index(item)
-                      already_present_item, already_present_year, already_present_semester, already_present_semester_elevation = unique_prereqs_complete_info[index]
-                      if already_present_year > int(year):
-                        unique_prereqs_complete_info[index] = [item, int(year), int(semester), semester_elevation[year][semester]]
-                      elif already_present_year == int(year) and already_present_semester > int(semester):
-                        unique_prereqs_complete_info[index] = [item, int(year), int(semester), semester_elevation[year][semester]]
-
-            else:
-              if prerequisites_data not in taught_courses:
-                if prerequisites_data not in unique_prereqs:
-                  unique_prereqs.append(prerequisites_data)
-                  unique_prereqs_complete_info.append([prerequisites_data, int(year), int(semester), semester_elevation[year][semester]])
-                elif prerequisites_data in unique_prereqs:
-                  index = unique_prereqs.index(prerequisites_data)
-                  already_present_prerequisites_data, already_present_year, already_present_semester, already_present_semester_elevation = unique_prereqs_complete_info[index]
-                  if already_present_year > int(year):
-                    unique_prereqs_complete_info[index] = [prerequisites_data, int(year), int(semester), semester_elevation[year][semester]]
-                  elif already_present_year == int(year) and already_present_semester > int(semester):
-                    unique_prereqs_complete_info[index] = [prerequisites_data, int(year), int(semester), semester_elevation[year][semester]]
-
-    unique_prereqs.sort()
-    unique_prereqs_complete_info.sort(key=lambda x: x[0])
     left_shift = self.left_shift
     already_present_semester_circle = []
     course_cnt, critical_course_cnt = 0, 0
 
-    for i, prereq in enumerate(unique_prereqs):
-      prerequisites_data, year, semester, semester_elevation = unique_prereqs_complete_info[i]
-      
-      x = (external_radius / 2) * np.cos(2 * np.pi * i / len(unique_prereqs)) + left_shift
-      y = (external_radius / 2) * np.sin(2 * np.pi * i / len(unique_prereqs))
-      z = semester_elevation
+    for prereq, year, semester, semester_elevation in layout.pre_knowledge:
+      x, y, z = layout.position(prereq)
       course_cnt += 1
 
       if [year, semester] not in already_present_semester_circle:
@@ -476,18 +291,12 @@ class DevelopPath:
           hoverinfo='skip'  
       ))
 
-      external_positions[prereq] = (x, y, z)
-      course_positions[prereq] = (x, y, z)
       course_colors[prereq] = '#000000' 
       
-      course_desc, course_name = "", ""
+      course_desc, display_name = "", prereq
       if prereq in self.all_tracks_course_information:
-          if "course_description" in self.all_tracks_course_information[prereq]:
-              course_desc = self.__add_intermediate_br_tags(self.all_tracks_course_information[prereq]["course_description"])
-          if "course_name" in self.all_tracks_course_information[prereq]:
-              course_name = self.all_tracks_course_information[prereq]["course_name"]
-
-          self.all_tracks_course_information[prereq]["location"] = {"x": x, "y": y, "z": z}
+          course_desc = self.__get_hover_text(prereq, self.all_tracks_course_information[prereq])
+          display_name = self.__get_display_name(prereq, self.all_tracks_course_information[prereq])
       if prereq in self.all_tracks_course_information and self.all_tracks_course_information[prereq]["dependency_count"] >= self.critical_courses_threshold:
           critical_course_cnt += 1
           fig.add_trace(go.Scatter3d(
@@ -502,7 +311,7 @@ class DevelopPath:
               marker=dict(size=self.special_marker_size, color='gray'),
               textfont=dict(size=12, color='black', family="Arial", weight="bold"),
               showlegend=False,
-              name=f"{prereq}-{course_name}" if course_name else prereq
+              name=display_name
           ))
       else:
           fig.add_trace(go.Scatter3d(
@@ -517,7 +326,7 @@ class DevelopPath:
               marker=dict(size=self.marker_size, color='gray'),
               showlegend=False,
               textfont=dict(size=12, color='black', family="Arial", weight="bold"),
-              name=f"{prereq}-{course_name}" if course_name else prereq
+              name=display_name
           ))
 
     edge_traces = []
@@ -527,7 +336,7 @@ class DevelopPath:
       for semester in courses[year]:
         courses_in_semester = list(courses[year][semester].keys())
         for course in courses_in_semester:
-          x1, y1, z1 = course_positions[course]
+          x1, y1, z1 = layout.position(course)
           course_year = self.all_tracks_course_information[track][course]["year"] if course in self.all_tracks_course_information[track] else 0
           course_semester = self.all_tracks_course_information[track][course]["semester"] if course in self.all_tracks_course_information[track] else 0
           if 'prerequisites' in courses[year][semester][course]:
@@ -536,8 +345,8 @@ class DevelopPath:
                 for sub_prereq_list in prereq:
                   if isinstance(sub_prereq_list, list):
                     for sub_prereq in sub_prereq_list:
-                      if sub_prereq in course_positions:
-                        x0, y0, z0 = course_positions[sub_prereq]
+                      if sub_prereq in layout.course_index:
+                        x0, y0, z0 = layout.position(sub_prereq)
                         sub_prereq_year = self.all_tracks_course_information[track][sub_prereq]["year"] if sub_prereq in self.all_tracks_course_information[track] else 0
                         sub_prereq_semester = self.all_tracks_course_information[track][sub_prereq]["semester"] if sub_prereq in self.all_tracks_course_information[track] else 0
                         uid = f"inbetween_edges_prerequisites_{course_year}_{course_semester}_{sub_prereq_year}_{sub_prereq_semester}_{year}_{semester}"
@@ -552,8 +361,8 @@ class DevelopPath:
                           line=dict(color=self.color_for_prerequisites, width=2),  
                           hoverinfo='skip'  
                         ))
-                  elif sub_prereq_list in course_positions:
-                    x0, y0, z0 = course_positions[sub_prereq_list]
+                  elif sub_prereq_list in layout.course_index:
+                    x0, y0, z0 = layout.position(sub_prereq_list)
                     sub_prereq_year = self.all_tracks_course_information[track][sub_prereq_list]["year"] if sub_prereq_list in self.all_tracks_course_information[track] else 0
                     sub_prereq_semester = self.all_tracks_course_information[track][sub_prereq_list]["semester"] if sub_prereq_list in self.all_tracks_course_information[track] else 0
                     uid = f"inbetween_edges_prerequisites_{course_year}_{course_semester}_{sub_prereq_year}_{sub_prereq_semester}_{year}_{semester}"
@@ -568,8 +377,8 @@ class DevelopPath:
                       line=dict(color=self.color_for_prerequisites, width=2), 
                       hoverinfo='skip' 
                     ))
-              elif prereq in course_positions:
-                x0, y0, z0 = course_positions[prereq]
+              elif prereq in layout.course_index:
+                x0, y0, z0 = layout.position(prereq)
                 prereq_year = self.all_tracks_course_information[track][prereq]["year"] if prereq in self.all_tracks_course_information[track] else 0
                 prereq_semester = self.all_tracks_course_information[track][prereq]["semester"] if prereq in self.all_tracks_course_information[track] else 0
                 uid = f"inbetween_edges_prerequisites_{course_year}_{course_semester}_{prereq_year}_{prereq_semester}_{year}_{semester}"
@@ -592,8 +401,8 @@ class DevelopPath:
                   for sub_coreq in coreq:
                     if isinstance(sub_coreq, list):
                       for c in sub_coreq:
-                        if c in course_positions:
-                          x0, y0, z0 = course_positions[c]
+                        if c in layout.course_index:
+                          x0, y0, z0 = layout.position(c)
                           coreq_year = self.all_tracks_course_information[track][c]["year"] if c in self.all_tracks_course_information[track] else 0
                           coreq_semester = self.all_tracks_course_information[track][c]["semester"] if c in self.all_tracks_course_information[track] else 0
                           uid = f"inbetween_edges_corequisites_{year}_{semester}_{coreq_year}_{coreq_semester}_{course_year}_{course_semester}"
@@ -608,8 +417,8 @@ class DevelopPath:
                             line=dict(color=self.color_for_corequisites, width=2), 
                             hoverinfo='skip'  
                           ))
-                    elif sub_coreq in course_positions:
-                      x0, y0, z0 = course_positions[sub_coreq]
+                    elif sub_coreq in layout.course_index:
+                      x0, y0, z0 = layout.position(sub_coreq)
                       coreq_year = self.all_tracks_course_information[track][sub_coreq]["year"] if sub_coreq in self.all_tracks_course_information[track] else 0
                       coreq_semester = self.all_tracks_course_information[track][sub_coreq]["semester"] if sub_coreq in self.all_tracks_course_information[track] else 0
                       uid = f"inbetween_edges_corequisites_{year}_{semester}_{coreq_year}_{coreq_semester}_{course_year}_{course_semester}"
@@ -624,8 +433,8 @@ class DevelopPath:
                         line=dict(color=self.color_for_corequisites, width=2),
                         hoverinfo='skip' 
                       ))
-                elif coreq in course_positions:
-                  x0, y0, z0 = course_positions[coreq]
+                elif coreq in layout.course_index:
+                  x0, y0, z0 = layout.position(coreq)
                   coreq_year = self.all_tracks_course_information[track][coreq]["year"] if coreq in self.all_tracks_course_information[track] else 0
                   coreq_semester = self.all_tracks_course_information[track][coreq]["semester"] if coreq in self.all_tracks_course_information[track] else 0
                   uid = f"inbetween_edges_corequisites_{year}_{semester}_{coreq_year}_{coreq_semester}_{course_year}_{course_semester}"
@@ -676,7 +485,7 @@ class DevelopPath:
           camera=last_camera_position
         ),
       )
-      return fig
+      return figure_serializer.serialize(fig)
     
     already_in_legend = set()
     modified_path_to_target = {}
@@ -684,23 +493,21 @@ class DevelopPath:
       source = path_to_target[i]["source"]
       destination = path_to_target[i]["destination"]
       relation = path_to_target[i]["relation"]
-      if source in course_positions:
-        x0, y0, z0 = course_positions[source]
+      if source in layout.course_index:
+        x0, y0, z0 = layout.position(source)
       
-      if destination in course_positions:
-        x1, y1, z1 = course_positions[destination]
+      if destination in layout.course_index:
+        x1, y1, z1 = layout.position(destination)
 
       source_course_desc, source_course_name = "", ""
       if source in self.all_tracks_course_information[track]:
-        if "course_description" in self.all_tracks_course_information[track][source]:
-          source_course_desc = self.__add_intermediate_br_tags(self.all_tracks_course_information[track][source]["course_description"])
+        source_course_desc = self.__get_hover_text(source, self.all_tracks_course_information[track][source])
         if "course_name" in self.all_tracks_course_information[track][source]:
           source_course_name = self.all_tracks_course_information[track][source]["course_name"]
       
       destination_course_desc, destination_course_name = "", ""
       if destination in self.all_tracks_course_information[track]:
-        if "course_description" in self.all_tracks_course_information[track][destination]:
-          destination_course_desc = self.__add_intermediate_br_tags(self.all_tracks_course_information[track][destination]["course_description"])
+        destination_course_desc = self.__get_hover_text(destination, self.all_tracks_course_information[track][destination])
         if "course_name" in self.all_tracks_course_information[track][destination]:
           destination_course_name = self.all_tracks_course_information[track][destination]["course_name"]
 
@@ -892,13 +699,13 @@ class DevelopPath:
       ),
     )
 
-    return fig, complete_path_sorted
+    return figure_serializer.serialize(fig), complete_path_sorted
   
 
   def run(self,
           track: str,
           target_course: str,
-          last_camera_position: dict) -> go.Figure:
+          last_camera_position: dict) -> dict:
     """
     Generate a 3d graph of the course catalog.
     
@@ -907,7 +714,7 @@ class DevelopPath:
       - target_course (str): The target course.
     
     Returns:
-      - go.Figure: The 3D graph of the course trajectory to the target course.
+      - dict: The serialized 3D graph of the course trajectory to the target course.
     """
 
     if target_course not in self.all_tracks_course_information[track] and target_course != "None":
@@ -917,13 +724,15 @@ class DevelopPath:
 
       self.track = track
       if target_course != "None":
-        path_to_target = self.all_tracks_course_information[track][target_course]["complete_path"]
+        target_course_information = self.all_tracks_course_information[track][target_course]
+        path_to_target = target_course_information.get("complete path", target_course_information.get("complete_path", []))
       else:
         path_to_target = []
 
-      return self.__develop_path_to_target(
-        track=track,
-        target_course=target_course,
-        path_to_target=path_to_target,
-        last_camera_position=last_camera_position
-      )
\ No newline at end of file
+      with trace_handler.span("develop_path_to_target", track=track, target_course=target_course):
+        return self.__develop_path_to_target(
+          track=track,
+          target_course=target_course,
+          path_to_target=path_to_target,
+          last_camera_position=last_camera_position
+        )
\ No newline at end of file
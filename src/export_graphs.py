@@ -0,0 +1,341 @@
+import os
+import json
+import hashlib
+import multiprocessing
+from time import perf_counter
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+
+class ExportGraphs:
+  """
+  The ExportGraphs class exports the graph of every track of every catalog as a standalone interactive HTML file, viewable offline.
+  The plotly.js bundle is written once next to the catalog directories and referenced by every file.
+  """
+
+  PLOTLYJS_FILE_NAME = "plotly.min.js"
+  MANIFEST_FILE_NAME = "manifest.json"
+
+
+  def __init__(self,
+               output_directory: str,
+               courses: list = None,
+               max_workers: int = None,
+               force: bool = False,
+               database_handler=None) -> None:
+    """
+    Initialize the ExportGraphs class.
+
+    Args:
+      - output_directory (str): The directory the files are written to, one subdirectory per catalog.
+      - courses (list): The catalogs to export, every catalog if None.
+      - max_workers (int): The number of rendering processes, the number of CPUs if None.
+      - force (bool): Render every track, even the ones whose data did not change since the last export.
+      - database_handler (DatabaseHandler): The handler the course data is read from, a new DatabaseHandler if None.
+
+    Returns:
+      - None
+    """
+
+    self.database_handler = database_handler
+    self.output_directory = output_directory
+    self.courses = courses
+    self.max_workers = max_workers or os.cpu_count()
+    self.force = force
+    self.manifest_path = os.path.join(output_directory, self.MANIFEST_FILE_NAME)
+
+
+  def __getstate__(self) -> dict:
+    """
+    Get the state sent to the rendering processes with each task, without the database handler, they only render.
+
+    Args:
+      - None
+
+    Returns:
+      - dict: The attributes of the instance.
+    """
+
+    return {**self.__dict__, "database_handler": None}
+
+
+  def __hash(self,
+             content: bytes) -> str:
+    """
+    Hash a content.
+
+    Args:
+      - content (bytes): The content.
+
+    Returns:
+      - str: The hexadecimal digest.
+    """
+
+    return hashlib.blake2b(content, digest_size=16).hexdigest()
+
+
+  def __load_manifest(self) -> dict:
+    """
+    Load the manifest of the previous export.
+
+    Args:
+      - None
+
+    Returns:
+      - dict: The {relative path: {"input_hash", "content_hash"}} mapping of the exported files, empty if there was no export.
+    """
+
+    if not os.path.exists(self.manifest_path):
+      return {}
+    with open(self.manifest_path) as f:
+      return json.load(f)
+
+
+  def __write_plotlyjs(self) -> str:
+    """
+    Write the plotly.js bundle shared by every file, unless it is up to date.
+
+    Args:
+      - None
+
+    Returns:
+      - str: The plotly.js version, part of the input hash of every file.
+    """
+
+    from plotly.offline import get_plotlyjs, get_plotlyjs_version
+
+    plotlyjs = get_plotlyjs().encode("utf-8")
+    file_path = os.path.join(self.output_directory, self.PLOTLYJS_FILE_NAME)
+    if not os.path.exists(file_path) or os.path.getsize(file_path) != len(plotlyjs):
+      with open(file_path, "wb") as f:
+        f.write(plotlyjs)
+    return get_plotlyjs_version()
+
+
+  def __iterate_tasks(self,
+                      manifest: dict,
+                      plotlyjs_version: str):
+    """
+    Yield the tracks to render in chunks, each chunk holding tracks of a single catalog, so a catalog is sent to at most max_workers processes
+    instead of once per track. Tracks whose input hash matches the manifest and whose file exists are skipped.
+
+    Args:
+      - manifest (dict): The manifest of the previous export.
+      - plotlyjs_version (str): The plotly.js version of the shared bundle.
+
+    Returns:
+      - generator: (render arguments, [(relative path, input hash, track)]) tuples, the render arguments being None for the skipped tracks.
+    """
+
+    from src.utils.database_handler import DatabaseHandler
+
+    database_handler = self.database_handler or DatabaseHandler()
+    for course_name in self.courses if self.courses is not None else database_handler.get_courses_catalog():
+      course_bundle = database_handler.get_course_bundle(course_name=course_name)
+      catalog_hash = self.__hash(
+        json.dumps([plotlyjs_version, course_name, course_bundle], sort_keys=True, default=str).encode("utf-8")
+      )
+      skipped_tasks, tasks = [], []
+      for track in course_bundle.all_tracks_course_information:
+        relative_path = f"{course_name}/{track}.html"
+        input_hash = self.__hash(f"{catalog_hash}:{track}".encode("utf-8"))
+        if (not self.force
+            and manifest.get(relative_path, {}).get("input_hash") == input_hash
+            and os.path.exists(os.path.join(self.output_directory, relative_path))):
+          skipped_tasks.append((relative_path, input_hash, track))
+        else:
+          tasks.append((relative_path, input_hash, track))
+
+      if skipped_tasks:
+        yield None, skipped_tasks
+      for i in range(min(self.max_workers, len(tasks))):
+        yield (
+          course_name,
+          course_bundle.course_catalog,
+          course_bundle.all_tracks_course_information,
+          [track for _, _, track in tasks[i::self.max_workers]],
+        ), tasks[i::self.max_workers]
+
+
+  def render_tracks(self,
+                    course_name: str,
+                    course_catalog: dict,
+                    all_tracks_course_information: dict,
+                    tracks: list) -> list:
+    """
+    Render tracks of a catalog to standalone HTML pages, in a worker process. A track failing to render does not stop the others.
+
+    Args:
+      - course_name (str): The name of the course.
+      - course_catalog (dict): The course catalog.
+      - all_tracks_course_information (dict): The course information.
+      - tracks (list): The tracks to render.
+
+    Returns:
+      - list: (HTML page, None) or (None, error message) tuples, one per track.
+    """
+
+    rendered = []
+    for track in tracks:
+      try:
+        rendered.append((self.render_track(course_name, course_catalog, all_tracks_course_information, track), None))
+      except Exception as error:
+        rendered.append((None, f"{type(error).__name__}: {error}"))
+    return rendered
+
+
+  def render_track(self,
+                   course_name: str,
+                   course_catalog: dict,
+                   all_tracks_course_information: dict,
+                   track: str) -> bytes:
+    """
+    Render the graph of a track to a standalone HTML page, in a worker process.
+    The page has a fixed div id, so the same data always renders to the same content.
+    Every course is drawn with its description, a standalone page cannot expand level of detail aggregates or load descriptions lazily.
+
+    Args:
+      - course_name (str): The name of the course.
+      - course_catalog (dict): The course catalog.
+      - all_tracks_course_information (dict): The course information.
+      - track (str): The track, e.g. track_1.
+
+    Returns:
+      - bytes: The HTML page.
+    """
+
+    import plotly.io as pio
+    from src.generate_3d_graph import Generate3DGraph
+
+    interactive_3d_graph_obj = Generate3DGraph(
+      course_name=course_name,
+      course_catalog=course_catalog,
+      all_tracks_course_information=all_tracks_course_information,
+      standalone=True,
+    )
+    interactive_3d_graph_obj.run(track=track)
+    figure = interactive_3d_graph_obj.inline_figure
+    figure["layout"]["title"] = {
+      "text": f"Interactive Course Trajectory for {course_name.replace('_', ' ').title()}, {track.replace('_', ' ').title()}",
+      "x": 0.5,
+    }
+    return pio.to_html(
+      figure,
+      include_plotlyjs=f"../{self.PLOTLYJS_FILE_NAME}",
+      full_html=True,
+      validate=False,
+      div_id=f"{course_name}-{track}",
+    ).encode("utf-8")
+
+
+  def __save(self,
+             relative_path: str,
+             html: bytes,
+             previous_content_hash: str) -> tuple:
+    """
+    Write a rendered page, unless the file already holds the same content.
+
+    Args:
+      - relative_path (str): The path of the file relative to the output directory.
+      - html (bytes): The HTML page.
+      - previous_content_hash (str): The content hash of the file in the manifest, None if the file is new.
+
+    Returns:
+      - tuple: (content hash, whether the file was written).
+    """
+
+    content_hash = self.__hash(html)
+    file_path = os.path.join(self.output_directory, relative_path)
+    if content_hash == previous_content_hash and os.path.exists(file_path):
+      return content_hash, False
+
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    with open(f"{file_path}.tmp", "wb") as f:
+      f.write(html)
+    os.replace(f"{file_path}.tmp", file_path)
+    return content_hash, True
+
+
+  def run(self) -> dict:
+    """
+    Export the graphs, rendering the changed tracks in a process pool.
+    The pool starts its processes with spawn, forking a process holding MongoDB client threads is unsafe.
+    A track failing to render is reported and keeps its previous manifest entry, so it is rendered again by the next export, the others are still written.
+
+    Args:
+      - None
+
+    Returns:
+      - dict: The number of rendered, written, unchanged (rendered to the same content) and skipped (same data) tracks, the bytes written,
+        the failed tracks with their error, the elapsed seconds and the throughput in tracks per second.
+    """
+
+    start = perf_counter()
+    os.makedirs(self.output_directory, exist_ok=True)
+    plotlyjs_version = self.__write_plotlyjs()
+    manifest = self.__load_manifest()
+    report = {"rendered": 0, "written": 0, "unchanged": 0, "skipped": 0, "bytes_written": 0, "failed": []}
+
+    new_manifest = {}
+    with ProcessPoolExecutor(max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+      futures = {}
+      for arguments, tasks in self.__iterate_tasks(manifest, plotlyjs_version):
+        if arguments is None:
+          for relative_path, _, _ in tasks:
+            new_manifest[relative_path] = manifest[relative_path]
+          report["skipped"] += len(tasks)
+          continue
+        futures[executor.submit(self.render_tracks, *arguments)] = tasks
+
+      for future in as_completed(futures):
+        tasks = futures[future]
+        try:
+          rendered = future.result()
+        except Exception as error:
+          rendered = [(None, f"{type(error).__name__}: {error}")] * len(tasks)
+
+        for (relative_path, input_hash, _), (html, error) in zip(tasks, rendered):
+          if html is None:
+            report["failed"].append({"path": relative_path, "error": error})
+            if relative_path in manifest:
+              new_manifest[relative_path] = manifest[relative_path]
+            continue
+
+          content_hash, written = self.__save(relative_path, html, manifest.get(relative_path, {}).get("content_hash"))
+          new_manifest[relative_path] = {"input_hash": input_hash, "content_hash": content_hash}
+          report["rendered"] += 1
+          report["written" if written else "unchanged"] += 1
+          report["bytes_written"] += len(html) if written else 0
+
+    if self.courses is not None:
+      new_manifest = {**manifest, **new_manifest}
+    with open(f"{self.manifest_path}.tmp", "w") as f:
+      json.dump(new_manifest, f, indent=2, sort_keys=True)
+    os.replace(f"{self.manifest_path}.tmp", self.manifest_path)
+
+    report["seconds"] = round(perf_counter() - start, 3)
+    report["tracks_per_second"] = round(report["rendered"] / report["seconds"], 2) if report["seconds"] else 0.0
+    return report
+
+
+if __name__ == "__main__":
+  parser = ArgumentParser(description="Export the graph of every track of every catalog as standalone interactive HTML files.")
+  parser.add_argument("--output-directory", default="exports/graphs", help="The directory the files are written to.")
+  parser.add_argument("--courses", nargs="+", default=None, help="The catalogs to export, every catalog by default.")
+  parser.add_argument("--workers", type=int, default=None, dest="max_workers", help="The number of rendering processes, the number of CPUs by default.")
+  parser.add_argument("--force", action="store_true", help="Render every track, even the unchanged ones.")
+  args = parser.parse_args()
+
+  report = ExportGraphs(
+    output_directory=args.output_directory,
+    courses=args.courses,
+    max_workers=args.max_workers,
+    force=args.force,
+  ).run()
+  print(
+    f"Rendered {report['rendered']} tracks in {report['seconds']}s ({report['tracks_per_second']} tracks/s), "
+    f"{report['written']} written ({report['bytes_written'] / 2 ** 20:.1f} MB), "
+    f"{report['unchanged']} unchanged, {report['skipped']} skipped, {len(report['failed'])} failed"
+  )
+  for failure in report["failed"]:
+    print(f"Failed to render {failure['path']}: {failure['error']}")
@@ -0,0 +1,214 @@
+import os
+import csv
+import json
+from glob import glob
+from argparse import ArgumentParser
+
+
+class ExportPaths:
+  """
+  The ExportPaths class exports the prepared prerequisite path of every course, in every track, in every catalog as a flat table.
+  """
+
+  FIELDS = ["catalog", "track", "target_course", "step", "source", "destination", "relation"]
+
+
+  def __init__(self,
+               output_path: str,
+               file_format: str = "csv",
+               source: str = "files",
+               data_directory: str = "data") -> None:
+    """
+    Initialize the ExportPaths class.
+
+    Args:
+      - output_path (str): The file the table is written to.
+      - file_format (str): Either "csv" or "parquet".
+      - source (str): Either "files" to read the PrepareCoursesData output or "mongo" to read the database.
+      - data_directory (str): The directory holding the PrepareCoursesData output.
+
+    Returns:
+      - None
+    """
+
+    self.output_path = output_path
+    self.file_format = file_format
+    self.source = source
+    self.data_directory = data_directory
+
+
+  def __iterate_tracks(self):
+    """
+    Yield the prepared information of each track, one track at a time. From the files only one track file is loaded at a time.
+    From MongoDB a catalog is fetched at once, then dropped from the cache once its tracks are exported.
+
+    Args:
+      - None
+
+    Returns:
+      - generator: (course_name, track, track_information) tuples.
+    """
+
+    if self.source == "mongo":
+      from src.utils.database_handler import DatabaseHandler
+
+      database_handler = DatabaseHandler()
+      for course_name in database_handler.get_courses_catalog():
+        for track, track_information in database_handler.get_course_track_information(course_name=course_name).items():
+          yield course_name, track, track_information
+        database_handler.cache.invalidate_course(course_name)
+      return
+
+    file_paths = glob(os.path.join(self.data_directory, "*", "track_*", "track_*_specific_information.json"))
+    for file_path in sorted(file_paths, key=lambda file_path: self.__track_order(file_path)):
+      track_directory = os.path.dirname(file_path)
+      with open(file_path) as f:
+        yield os.path.basename(os.path.dirname(track_directory)), os.path.basename(track_directory), json.load(f)
+
+
+  def __track_order(self,
+                    file_path: str) -> tuple:
+    """
+    Order the track files by catalog, then by track number, track_10 coming after track_9.
+
+    Args:
+      - file_path (str): The path of the track file.
+
+    Returns:
+      - tuple: The (course_name, track number) sort key.
+    """
+
+    track_directory = os.path.dirname(file_path)
+    return os.path.basename(os.path.dirname(track_directory)), int(os.path.basename(track_directory).split("_")[-1])
+
+
+  def __track_columns(self,
+                      course_name: str,
+                      track: str,
+                      track_information: dict) -> dict:
+    """
+    Flatten the complete path of every course of a track into columns in a single pass.
+
+    Args:
+      - course_name (str): The name of the course.
+      - track (str): The track, e.g. track_1.
+      - track_information (dict): The prepared course information of the track.
+
+    Returns:
+      - dict: The column name to column values mapping.
+    """
+
+    columns = {field: [] for field in self.FIELDS}
+    for target_course, course_information in track_information.items():
+      complete_path = course_information.get("complete path", course_information.get("complete_path", []))
+      n_edges = len(complete_path)
+      columns["target_course"] += [target_course] * n_edges
+      columns["step"] += range(1, n_edges + 1)
+      columns["source"] += [edge["source"] for edge in complete_path]
+      columns["destination"] += [edge["destination"] for edge in complete_path]
+      columns["relation"] += [edge["relation"] for edge in complete_path]
+
+    n_rows = len(columns["step"])
+    columns["catalog"] = [course_name] * n_rows
+    columns["track"] = [track] * n_rows
+    return columns
+
+
+  def __iterate_batches(self):
+    """
+    Yield one batch of columns per track. Reading the files, memory stays bounded by the largest track,
+    reading MongoDB by the largest catalog.
+
+    Args:
+      - None
+
+    Returns:
+      - generator: The column batches.
+    """
+
+    for course_name, track, track_information in self.__iterate_tracks():
+      yield self.__track_columns(course_name, track, track_information)
+
+
+  def __write_csv(self) -> int:
+    """
+    Stream the batches to a CSV file.
+
+    Args:
+      - None
+
+    Returns:
+      - int: The number of rows written.
+    """
+
+    n_rows = 0
+    with open(self.output_path, "w", newline="") as f:
+      writer = csv.writer(f)
+      writer.writerow(self.FIELDS)
+      for columns in self.__iterate_batches():
+        writer.writerows(zip(*(columns[field] for field in self.FIELDS)))
+        n_rows += len(columns["step"])
+    return n_rows
+
+
+  def __write_parquet(self) -> int:
+    """
+    Stream the batches to a Parquet file, one row group per track.
+
+    Args:
+      - None
+
+    Returns:
+      - int: The number of rows written.
+    """
+
+    try:
+      import pyarrow as pa
+      import pyarrow.parquet as pq
+    except ImportError as e:
+      raise ImportError("pyarrow is required for the parquet format, install it or use --format csv") from e
+
+    schema = pa.schema([(field, pa.int32() if field == "step" else pa.string()) for field in self.FIELDS])
+    n_rows = 0
+    with pq.ParquetWriter(self.output_path, schema) as writer:
+      for columns in self.__iterate_batches():
+        writer.write_table(pa.Table.from_pydict(columns, schema=schema))
+        n_rows += len(columns["step"])
+    return n_rows
+
+
+  def run(self) -> int:
+    """
+    Export the prerequisite paths.
+
+    Args:
+      - None
+
+    Returns:
+      - int: The number of rows written.
+    """
+
+    output_directory = os.path.dirname(self.output_path)
+    if output_directory:
+      os.makedirs(output_directory, exist_ok=True)
+
+    if self.file_format == "parquet":
+      return self.__write_parquet()
+    return self.__write_csv()
+
+
+if __name__ == "__main__":
+  parser = ArgumentParser(description="Export the prerequisite path of every course in every track and catalog.")
+  parser.add_argument("--output", default="exports/course_paths.csv", help="The file the table is written to.")
+  parser.add_argument("--format", choices=["csv", "parquet"], default="csv", dest="file_format")
+  parser.add_argument("--source", choices=["files", "mongo"], default="files", help="Read the PrepareCoursesData output or the database.")
+  parser.add_argument("--data-directory", default="data", help="The directory holding the PrepareCoursesData output.")
+  args = parser.parse_args()
+
+  n_rows = ExportPaths(
+    output_path=args.output,
+    file_format=args.file_format,
+    source=args.source,
+    data_directory=args.data_directory,
+  ).run()
+  print(f"Exported {n_rows} rows to {args.output}")
@@ -1,9 +1,12 @@
-import numpy as np
-from dash import dcc, html
-import plotly.graph_objects as go
+from dash import html
 from warnings import filterwarnings
 import dash_bootstrap_components as dbc
 from consts import CourseTrajectoryConsts
+from src.layout_engine import LayoutEngine
+from src.track_layout import track_layout
+from src.utils.trace_handler import trace_handler
+from src.utils.figure_serializer import figure_serializer
+from src.utils.course_formatting import add_intermediate_br_tags, dynamic_color_choice_for_semester
 
 
 filterwarnings("ignore")
@@ -18,7 +21,8 @@ class Generate3DGraph(html.Div):
   def __init__(self,
                course_name: str,
                course_catalog: dict,
-               all_tracks_course_information: dict) -> None:
+               all_tracks_course_information: dict,
+               standalone: bool = False) -> None:
     """
     Initialize the Generate3DGraph class.
     
@@ -26,11 +30,16 @@ class Generate3DGraph(html.Div):
       - course_name (str): The name of the course.
       - course_catalog (dict): The course catalog.
       - all_tracks_course_information (dict): The course information.
+      - standalone (bool): Render for a page without the Dash app, e.g. an exported HTML file: every course is drawn, without level of detail aggregates,
+        and the descriptions are embedded in the hover text, as there are no clientside callbacks to expand an aggregate or look a description up.
     
     Returns:
       - None
     """
     self.last_camera_position = None
+    self.standalone = standalone
+    self.inline_figure = None
+    self.fullscreen_figure = None
     self.course_name = course_name
     self.course_catalog = course_catalog
     self.all_tracks_course_information = all_tracks_course_information
@@ -62,61 +71,57 @@ class Generate3DGraph(html.Div):
     self.complete_path_from_start = course_trajectory_consts["complete_path_from_start"]
     self.critical_courses_threshold = course_trajectory_consts["critical_courses_threshold"]
     self.critical_courses_threshold_circle = course_trajectory_consts["critical_courses_threshold_circle"]
+    self.lazy_hover_descriptions = course_trajectory_consts["lazy_hover_descriptions"]
+    self.lod_node_threshold = course_trajectory_consts["lod_node_threshold"]
+    self.lod_ring_points = course_trajectory_consts["lod_ring_points"]
+    if self.standalone:
+      self.lazy_hover_descriptions = False
+      self.lod_node_threshold = 0
 
 
-  def __dynamic_color_choice_for_semester(self,
-                                          courses_in_year: dict) -> dict:
+  def __get_hover_text(self,
+                       course: str,
+                       course_information: dict) -> str:
     """
-    Assign colors to courses based on their semester.
+    Get the hover text of a course, its description wrapped with <br> tags when preparing the data.
+    Data prepared before the hover text was stored is wrapped here.
+    With lazy hover descriptions only the course code and name are embedded in the figure,
+    the description is looked up by the browser in the course-descriptions-store.
     
     Args:
-      - courses_in_year (dict): The courses in a year.
+      - course (str): The course code.
+      - course_information (dict): The prepared information of the course.
     
     Returns:
-      - dict: The dictionary with the course colors.
+      - str: The course description with <br> tags inserted.
     """
 
-    semester_colors = {}
-    cnt = 0
-    for year in courses_in_year:
-      semester_colors[year] = {}
-      for semester in courses_in_year[year]:
-        semester_colors[year][semester] = f"hsl({cnt * (360 // (len(courses_in_year) * len(courses_in_year[year])))}, 70%, 50%)"
-        cnt += 1
-    return semester_colors
-           
+    if self.lazy_hover_descriptions:
+      return self.__get_display_name(course, course_information)
+    hover_text = course_information.get("hover_text")
+    if hover_text is None:
+      hover_text = add_intermediate_br_tags(course_information.get("course_description", ""))
+    return hover_text
 
 
-  def __add_intermediate_br_tags(self,
-                                 description: str,
-                                 max_chars=50) -> str:
+  def __get_display_name(self,
+                         course: str,
+                         course_information: dict) -> str:
     """
-    Insert <br> tags into the description string after every max_chars characters
-    without breaking words.
+    Get the legend name of a course, precomputed by PrepareCoursesData when available.
     
     Args:
-      - description (str): The original description string.
-      - max_chars (int): Maximum number of characters before inserting a <br> tag (default is 64).
+      - course (str): The course code.
+      - course_information (dict): The prepared information of the course.
     
     Returns:
-      - str: The modified description with <br> tags inserted.
+      - str: The course code followed by the course name if there is one.
     """
-    
-    words = description.split()
-    lines = []
-    current_line = ""
-    
-    for word in words:
-        if len(current_line) + len(word) <= max_chars:
-            current_line += word + " "
-        else:
-            lines.append(current_line.strip())
-            current_line = word + " "
-    
-    if current_line:
-        lines.append(current_line.strip())
-    
-    return "<br>".join(lines)
+
+    if "display_name" in course_information:
+      return course_information["display_name"]
+    course_name = course_information.get("course_name", "")
+    return f"{course}-{course_name}" if course_name else course
   
 
   def __create_circle(self,
@@ -134,6 +139,8 @@ class Generate3DGraph(html.Div):
       - list[int]: The list of points in the circle.
     """
 
+    import numpy as np
+
     if tower == "pre-knowledge":
       radius = self.radius_circle / 2
     else:
@@ -152,16 +159,133 @@ class Generate3DGraph(html.Div):
     return x, y, z
   
 
-  def __create_random_points_on_circle(self, z_level, num_points, angle_offset=0):
-    theta = np.linspace(0, 2 * np.pi, num_points) + angle_offset
-    x = self.radius_circle * np.cos(theta)
-    y = self.radius_circle * np.sin(theta)
-    z = np.full(num_points, z_level)
-    return x.tolist(), y.tolist(), z.tolist()
-  
+  def __add_semester_aggregate(self,
+                               fig: "go.Figure",
+                               layout: LayoutEngine,
+                               year: str,
+                               semester: str,
+                               z_level: int,
+                               slots: list,
+                               hover_texts: list,
+                               course_colors: dict) -> None:
+    """
+    Collapse the non-critical courses of a semester into one aggregate node at the center of its ring.
+    The courses are kept in a single hidden trace, shown when the aggregate node is clicked.
+    
+    Args:
+      - fig (go.Figure): The figure the traces are added to.
+      - layout (LayoutEngine): The layout of the track.
+      - year (str): The year of the semester.
+      - semester (str): The semester.
+      - z_level (int): The elevation of the semester ring.
+      - slots (list): The layout slots of the collapsed courses.
+      - hover_texts (list): The hover text of every collapsed course.
+      - course_colors (dict): The color of every course.
+    
+    Returns:
+      - str: The id of the aggregate node, the custom data of its marker and the meta of the hidden trace.
+    """
+
+    import plotly.graph_objects as go
+
+    aggregate_id = f"aggregate_{year}_{semester}"
+    courses = [layout.courses[slot] for slot in slots]
+    fig.add_trace(go.Scatter3d(
+      x=[0],
+      y=[0],
+      z=[z_level],
+      customdata=[aggregate_id],
+      mode='markers',
+      hoverinfo='text',
+      hovertext=f"{len(courses)} courses, click to expand",
+      marker=dict(size=self.special_marker_size, color=course_colors[courses[0]], opacity=0.5),
+      showlegend=False,
+      name=f"Year: {year}, Semester: {semester} ({len(courses)} courses)"
+    ))
+    fig.add_trace(go.Scatter3d(
+      x=layout.x[slots],
+      y=layout.y[slots],
+      z=layout.z[slots],
+      customdata=courses,
+      meta=aggregate_id,
+      mode='markers',
+      hoverinfo='text',
+      hovertext=hover_texts,
+      marker=dict(size=self.marker_size, color=[course_colors[course] for course in courses]),
+      visible=False,
+      showlegend=False,
+      name=f"Year: {year}, Semester: {semester}"
+    ))
+    return aggregate_id
+
+
+  def __add_merged_edges(self,
+                         fig: "go.Figure",
+                         layout: LayoutEngine,
+                         edges: list,
+                         aggregate_nodes: dict,
+                         aggregate_positions: dict) -> None:
+    """
+    Draw the edges of a level of detail graph as one trace per relation, the segments being separated by None.
+    An edge to a collapsed course is drawn to the aggregate node of its semester, edges within an aggregate are dropped,
+    and edges between the same nodes are drawn once.
+    The custom data of each segment point is the node of its requisite, the node whose click shows the segment.
+    
+    Args:
+      - fig (go.Figure): The figure the traces are added to.
+      - layout (LayoutEngine): The layout of the track.
+      - edges (list): The (relation, course, requisite, uid) edges of the track.
+      - aggregate_nodes (dict): The aggregate node id of every collapsed course.
+      - aggregate_positions (dict): The position of every aggregate node.
+    
+    Returns:
+      - None
+    """
+
+    import plotly.graph_objects as go
+
+    segments = {"prerequisites": {}, "corequisites": {}}
+    for relation, course, requisite, _ in edges:
+      source = aggregate_nodes.get(requisite, requisite)
+      destination = aggregate_nodes.get(course, course)
+      if source != destination:
+        segments[relation].setdefault((source, destination), None)
+
+    for relation, edge_kind, color in (
+      ("prerequisites", "pre", self.color_for_prerequisites),
+      ("corequisites", "coreq", self.color_for_corequisites),
+    ):
+      if not segments[relation]:
+        continue
+
+      x, y, z, custom_data = [], [], [], []
+      for source, destination in segments[relation]:
+        for node in (source, destination):
+          node_x, node_y, node_z = aggregate_positions[node] if node in aggregate_positions else layout.position(node)
+          x.append(node_x)
+          y.append(node_y)
+          z.append(node_z)
+        x.append(None)
+        y.append(None)
+        z.append(None)
+        custom_data.extend((source, source, None))
+
+      fig.add_trace(go.Scatter3d(
+        x=x,
+        y=y,
+        z=z,
+        customdata=custom_data,
+        meta=f"edges_{edge_kind}",
+        uid=f"edges_{relation}",
+        mode='lines',
+        showlegend=False,
+        line=dict(color=color, width=2),
+        hoverinfo='skip'
+      ))
+
 
   def __create_course_trajectory(self,
-                                 track: str) -> go.Figure:
+                                 track: str) -> "go.Figure":
     """
     Create a 3D graph of the course trajectory for a particular track.
     
@@ -172,265 +296,142 @@ class Generate3DGraph(html.Div):
       - go.Figure: The 3D graph of the course trajectory.
     """
 
+    import plotly.graph_objects as go
+
     courses = self.course_catalog[track]
     fig = go.Figure()
-    semester_colors = self.__dynamic_color_choice_for_semester(courses)
-    course_positions, course_colors = {}, {}
-    
-    taught_courses = set()
-    for year in courses:
-      if year != "extra_course_related_info":
-        for semester in courses[year]:
-          taught_courses.update(courses[year][semester].keys())
-
-    z_level = self.z_level
-    semester_elevation = {}
-    for year in courses:
-      if year == "extra_course_related_info":
-        continue
-      for semester in courses[year]:
-        courses_in_semester = list(courses[year][semester].keys())
-        n_courses = len(courses_in_semester)
-        if year not in semester_elevation:
-          semester_elevation[year] = {}
-
-        semester_elevation[year][semester] = z_level
-        course_colors.update({course: semester_colors[year][semester] for course in courses_in_semester})
-            
-        fig.add_trace(go.Scatter3d(
-          x=[0],
-          y=[0],
-          z=[z_level],
-          text=f"Year: {year}, Semester: {semester}",
-          mode='text',
-          showlegend=False,
-          textposition='middle center',
-          textfont=dict(size=12, color='black', family="Arial", weight="bold"),
-          hoverinfo='skip'  
-        ))
+    semester_colors = dynamic_color_choice_for_semester(courses)
+    course_colors = {}
+
+    with trace_handler.span("layout"):
+      layout = LayoutEngine(
+        courses=courses,
+        radius_circle=self.radius_circle,
+        z_level=self.z_level,
+        z_increment=self.z_increment,
+        left_shift=self.left_shift,
+        seed=f"{self.course_name}/{track}",
+      ).run()
+
+    level_of_detail = 0 < self.lod_node_threshold < len(layout.courses)
+    ring_points = self.lod_ring_points if level_of_detail else 100
+
+    aggregate_nodes, aggregate_positions = {}, {}
+    trace_handler.begin_span("node_loop", level_of_detail=level_of_detail)
+    for year, semester, z_level, first_slot, end_slot in layout.rings:
+      courses_in_semester = layout.courses[first_slot:end_slot]
+      course_colors.update({
+        course: self.all_tracks_course_information[track].get(course, {}).get("color", semester_colors[year][semester])
+        for course in courses_in_semester
+      })
+          
+      fig.add_trace(go.Scatter3d(
+        x=[0],
+        y=[0],
+        z=[z_level],
+        text=f"Year: {year}, Semester: {semester}",
+        mode='text',
+        showlegend=False,
+        textposition='middle center',
+        textfont=dict(size=12, color='black', family="Arial", weight="bold"),
+        hoverinfo='skip'  
+      ))
 
-        course_cnt, critical_course_cnt = 0, 0
-        angle_offset = np.random.uniform(0, 2 * np.pi)
-        x, y, z = self.__create_random_points_on_circle(z_level, n_courses + 1, angle_offset)
-        course_positions.update({course: (x[i], y[i], z[i]) for i, course in enumerate(courses_in_semester)})
-    
-        for i, course in enumerate(courses_in_semester):
-          course_desc, course_name = "", ""
-          course_cnt += 1
-          if course in self.all_tracks_course_information[track]:
-            if "course_description" in self.all_tracks_course_information[track][course]:
-              course_desc = self.__add_intermediate_br_tags(self.all_tracks_course_information[track][course]["course_description"])
-            if "course_name" in self.all_tracks_course_information[track][course]:
-              course_name = self.all_tracks_course_information[track][course]["course_name"]
-
-            self.all_tracks_course_information[track][course]["location"] = {"x": x[i], "y": y[i], "z": z[i]}
-
-          if course in self.all_tracks_course_information[track] and self.all_tracks_course_information[track][course]["dependency_count"] >= self.critical_courses_threshold:
-            critical_course_cnt += 1
-            fig.add_trace(go.Scatter3d(
-              x=[x[i]],
-              y=[y[i]],
-              z=[z[i]],
-              text=course,  
-              mode='markers+text',
-              customdata=[course],
-              hoverinfo='text',  
-              marker=dict(size=self.special_marker_size, color=course_colors[course]),
-              textfont=dict(size=12, color='black', family="Arial", weight="bold"),
-              textposition='top center',
-              hovertext=course_desc + f"<br><br>Dependencies: {self.all_tracks_course_information[track][course]['dependency_count']}",
-              name=f"{course}-{course_name}" if course_name else course
-            ))
-          else:
-            fig.add_trace(go.Scatter3d(
-              x=[x[i]],
-              y=[y[i]],
-              z=[z[i]],
-              text=course, 
-              customdata=[course], 
-              mode='markers+text',
-              hoverinfo='text',  
-              marker=dict(size=self.marker_size, color=course_colors[course]),
-              textfont=dict(size=12, color='black', family="Arial", weight="bold"),
-              textposition='top center',
-              hovertext=course_desc,
-              name=f"{course}-{course_name}" if course_name else course
-            ))
+      course_cnt, critical_course_cnt = 0, 0
+      collapsed_slots, collapsed_hover_texts = [], []
+      for i, course in enumerate(courses_in_semester, start=first_slot):
+        course_desc, display_name = "", course
+        course_cnt += 1
+        if course in self.all_tracks_course_information[track]:
+          course_desc = self.__get_hover_text(course, self.all_tracks_course_information[track][course])
+          display_name = self.__get_display_name(course, self.all_tracks_course_information[track][course])
 
-        if critical_course_cnt >= self.critical_courses_threshold_circle:
-          circle_x, circle_y, circle_z = self.__create_circle("", 100, z_level)
+        if course in self.all_tracks_course_information[track] and self.all_tracks_course_information[track][course]["dependency_count"] >= self.critical_courses_threshold:
+          critical_course_cnt += 1
           fig.add_trace(go.Scatter3d(
-            x=circle_x,
-            y=circle_y,
-            z=circle_z,
-            mode='lines',
-            line=dict(color='black', width=10),
-            name=f"Year: {year}, Semester: {semester}",
-            hoverinfo='skip'  
+            x=[layout.x[i]],
+            y=[layout.y[i]],
+            z=[layout.z[i]],
+            text=course,  
+            mode='markers+text',
+            customdata=[course],
+            hoverinfo='text',  
+            marker=dict(size=self.special_marker_size, color=course_colors[course]),
+            textfont=dict(size=12, color='black', family="Arial", weight="bold"),
+            textposition='top center',
+            hovertext=course_desc + f"<br><br>Dependencies: {self.all_tracks_course_information[track][course]['dependency_count']}",
+            name=display_name
           ))
+        elif level_of_detail:
+          collapsed_slots.append(i)
+          collapsed_hover_texts.append(course_desc)
         else:
-          circle_x, circle_y, circle_z = self.__create_circle("", 100, z_level)
           fig.add_trace(go.Scatter3d(
-            x=circle_x,
-            y=circle_y,
-            z=circle_z,
-            mode='lines',
-            line=dict(color='black', width=2, dash='dash'),
-            name=f"Year: {year}, Semester: {semester}",
-            hoverinfo='skip'  
+            x=[layout.x[i]],
+            y=[layout.y[i]],
+            z=[layout.z[i]],
+            text=course, 
+            customdata=[course], 
+            mode='markers+text',
+            hoverinfo='text',  
+            marker=dict(size=self.marker_size, color=course_colors[course]),
+            textfont=dict(size=12, color='black', family="Arial", weight="bold"),
+            textposition='top center',
+            hovertext=course_desc,
+            name=display_name
           ))
 
-        z_level += self.z_increment
+      if collapsed_slots:
+        aggregate_id = self.__add_semester_aggregate(
+          fig=fig,
+          layout=layout,
+          year=year,
+          semester=semester,
+          z_level=z_level,
+          slots=collapsed_slots,
+          hover_texts=collapsed_hover_texts,
+          course_colors=course_colors,
+        )
+        aggregate_positions[aggregate_id] = (0, 0, z_level)
+        aggregate_nodes.update({layout.courses[slot]: aggregate_id for slot in collapsed_slots})
+
+      if critical_course_cnt >= self.critical_courses_threshold_circle:
+        circle_x, circle_y, circle_z = self.__create_circle("", ring_points, z_level)
+        fig.add_trace(go.Scatter3d(
+          x=circle_x,
+          y=circle_y,
+          z=circle_z,
+          mode='lines',
+          line=dict(color='black', width=10),
+          name=f"Year: {year}, Semester: {semester}",
+          hoverinfo='skip'  
+        ))
+      else:
+        circle_x, circle_y, circle_z = self.__create_circle("", ring_points, z_level)
+        fig.add_trace(go.Scatter3d(
+          x=circle_x,
+          y=circle_y,
+          z=circle_z,
+          mode='lines',
+          line=dict(color='black', width=2, dash='dash'),
+          name=f"Year: {year}, Semester: {semester}",
+          hoverinfo='skip'  
+        ))
 
-    external_radius = self.radius_circle
-    external_positions = {}
-    unique_prereqs = []
-    unique_prereqs_complete_info = []
+    trace_handler.end_span()
 
-    for year in courses:
-      if year == "extra_course_related_info":
-        continue
-      for semester in courses[year]:
-        for course in courses[year][semester]:
-          details = courses[year][semester][course]
-          course_name = ""
-          if "course_name" in details:
-            course_name = details["course_name"]
-          
-          if 'prerequisites' in details:
-            prerequisites_data = details['prerequisites']
-            if isinstance(prerequisites_data, list):
-              for item in prerequisites_data:
-                if isinstance(item, list):
-                  for prereq in item:
-                    if isinstance(prereq, list):
-                      for sub_prereq in prereq:
-                        if sub_prereq not in taught_courses:
-                          if sub_prereq not in unique_prereqs:
-                            unique_prereqs.append(sub_prereq)
-                            unique_prereqs_complete_info.append([sub_prereq, int(year), int(semester), semester_elevation[year][semester]])
-                          elif sub_prereq in unique_prereqs:
-                            index = unique_prereqs.index(sub_prereq)
-                            already_present_prereq, already_present_year, already_present_semester, already_present_semester_elevation = unique_prereqs_complete_info[index]
-                            if already_present_year > int(year):
-                              unique_prereqs_complete_info[index] = [sub_prereq, int(year), int(semester), semester_elevation[year][semester]]
-                            elif already_present_year == int(year) and already_present_semester > int(semester):
-                              unique_prereqs_complete_info[index] = [sub_prereq, int(year), int(semester), semester_elevation[year][semester]]
-
-                    elif prereq not in taught_courses:
-                      if prereq not in unique_prereqs:
-                        unique_prereqs.append(prereq)
-                        unique_prereqs_complete_info.append([prereq, int(year), int(semester), semester_elevation[year][semester]])
-                      elif prereq in unique_prereqs:
-                        index = unique_prereqs.index(prereq)
-                        already_present_prereq, already_present_year, already_present_semester, already_present_semester_elevation = unique_prereqs_complete_info[index]
-                        if already_present_year > int(year):
-                          unique_prereqs_complete_info[index] = [prereq, int(year), int(semester), semester_elevation[year][semester]]
-                        elif already_present_year == int(year) and already_present_semester > int(semester):
-                          unique_prereqs_complete_info[index] = [prereq, int(year), int(semester), semester_elevation[year][semester]]
-
-                else:
-                  if item not in taught_courses:
-                    if item not in unique_prereqs:
-                      unique_prereqs.append(item)
-                      unique_prereqs_complete_info.append([item, int(year), int(semester), semester_elevation[year][semester]])
-                    elif item in unique_prereqs:
-                      index = unique_prereqs.index(item)
-                      already_present_item, already_present_year, already_present_semester, already_present_semester_elevation = unique_prereqs_complete_info[index]
-                      if already_present_year > int(year):
-                        unique_prereqs_complete_info[index] = [item, int(year), int(semester), semester_elevation[year][semester]]
-                      elif already_present_year == int(year) and already_present_semester > int(semester):
-                        unique_prereqs_complete_info[index] = [item, int(year), int(semester), semester_elevation[year][semester]]
-
-            else:
-              if prerequisites_data not in taught_courses:
-                if prerequisites_data not in unique_prereqs:
-                  unique_prereqs.append(prerequisites_data)
-                  unique_prereqs_complete_info.append([prerequisites_data, int(year), int(semester), semester_elevation[year][semester]])
-                elif prerequisites_data in unique_prereqs:
-                  index = unique_prereqs.index(prerequisites_data)
-                  already_present_prerequisites_data, already_present_year, already_present_semester, already_present_semester_elevation = unique_prereqs_complete_info[index]
-                  if already_present_year > int(year):
-                    unique_prereqs_complete_info[index] = [prerequisites_data, int(year), int(semester), semester_elevation[year][semester]]
-                  elif already_present_year == int(year) and already_present_semester > int(semester):
-                    unique_prereqs_complete_info[index] = [prerequisites_data, int(year), int(semester), semester_elevation[year][semester]]
-          
-          if 'corequisites' in details:
-            prerequisites_data = details['corequisites']
-            if isinstance(prerequisites_data, list):
-              for item in prerequisites_data:
-                if isinstance(item, list):
-                  for prereq in item:
-                    if isinstance(prereq, list):
-                      for sub_prereq in prereq:
-                        if sub_prereq not in taught_courses:
-                          if sub_prereq not in unique_prereqs:
-                            unique_prereqs.append(sub_prereq)
-                            unique_prereqs_complete_info.append([sub_prereq, int(year), int(semester), semester_elevation[year][semester]])
-                          elif sub_prereq in unique_prereqs:
-                            index = unique_prereqs.index(sub_prereq)
-                            already_present_prereq, already_present_year, already_present_semester, already_present_semester_elevation = unique_prereqs_complete_info[index]
-                            if already_present_year > int(year):
-                              unique_prereqs_complete_info[index] = [sub_prereq, int(year), int(semester), semester_elevation[year][semester]]
-                            elif already_present_year == int(year) and already_present_semester > int(semester):
-                              unique_prereqs_complete_info[index] = [sub_prereq, int(year), int(semester), semester_elevation[year][semester]]
-
-                    elif prereq not in taught_courses:
-                      if prereq not in unique_prereqs:
-                        unique_prereqs.append(prereq)
-                        unique_prereqs_complete_info.append([prereq, int(year), int(semester), semester_elevation[year][semester]])
-                      elif prereq in unique_prereqs:
-                        index = unique_prereqs.index(prereq)
-                        already_present_prereq, already_present_year, already_present_semester, already_present_semester_elevation = unique_prereqs_complete_info[index]
-                        if already_present_year > int(year):
-                          unique_prereqs_complete_info[index] = [prereq, int(year), int(semester), semester_elevation[year][semester]]
-                        elif already_present_year == int(year) and already_present_semester > int(semester):
-                          unique_prereqs_complete_info[index] = [prereq, int(year), int(semester), semester_elevation[year][semester]]
-
-                else:
-                  if item not in taught_courses:
-                    if item not in unique_prereqs:
-                      unique_prereqs.append(item)
-                      unique_prereqs_complete_info.append([item, int(year), int(semester), semester_elevation[year][semester]])
-                    elif item in unique_prereqs:
-                      index = unique_prereqs.index(item)
-                      already_present_item, already_present_year, already_present_semester, already_present_semester_elevation = unique_prereqs_complete_info[index]
-                      if already_present_year > int(year):
-                        unique_prereqs_complete_info[index] = [item, int(year), int(semester), semester_elevation[year][semester]]
-                      elif already_present_year == int(year) and already_present_semester > int(semester):
-                        unique_prereqs_complete_info[index] = [item, int(year), int(semester), semester_elevation[year][semester]]
-
-            else:
-              if prerequisites_data not in taught_courses:
-                if prerequisites_data not in unique_prereqs:
-                  unique_prereqs.append(prerequisites_data)
-                  unique_prereqs_complete_info.append([prerequisites_data, int(year), int(semester), semester_elevation[year][semester]])
-                elif prerequisites_data in unique_prereqs:
-                  index = unique_prereqs.index(prerequisites_data)
-                  already_present_prerequisites_data, already_present_year, already_present_semester, already_present_semester_elevation = unique_prereqs_complete_info[index]
-                  if already_present_year > int(year):
-                    unique_prereqs_complete_info[index] = [prerequisites_data, int(year), int(semester), semester_elevation[year][semester]]
-                  elif already_present_year == int(year) and already_present_semester > int(semester):
-                    unique_prereqs_complete_info[index] = [prerequisites_data, int(year), int(semester), semester_elevation[year][semester]]
-                         
-
-    unique_prereqs.sort()
-    unique_prereqs_complete_info.sort(key=lambda x: x[0])
+    trace_handler.begin_span("pre_knowledge_nodes", count=len(layout.pre_knowledge))
     left_shift = self.left_shift
     already_present_semester_circle = []
     course_cnt, critical_course_cnt = 0, 0
 
-    for i, prereq in enumerate(unique_prereqs):
-      prerequisites_data, year, semester, semester_elevation = unique_prereqs_complete_info[i]
-      
-      x = (external_radius / 2) * np.cos(2 * np.pi * i / len(unique_prereqs)) + left_shift
-      y = (external_radius / 2) * np.sin(2 * np.pi * i / len(unique_prereqs))
-      z = semester_elevation
+    for prereq, year, semester, semester_elevation in layout.pre_knowledge:
+      x, y, z = layout.position(prereq)
       course_cnt += 1
 
       if [year, semester] not in already_present_semester_circle:
           already_present_semester_circle.append([year, semester])
-          circle_x, circle_y, circle_z = self.__create_circle("pre-knowledge", 100, semester_elevation)
+          circle_x, circle_y, circle_z = self.__create_circle("pre-knowledge", ring_points, semester_elevation)
           fig.add_trace(go.Scatter3d(
               x=circle_x + left_shift,
               y=circle_y,
@@ -453,18 +454,12 @@ class Generate3DGraph(html.Div):
           hoverinfo='skip'  
       ))
 
-      external_positions[prereq] = (x, y, z)
-      course_positions[prereq] = (x, y, z)
       course_colors[prereq] = '#000000' 
       
-      course_desc, course_name = "", ""
+      course_desc, display_name = "", prereq
       if prereq in self.all_tracks_course_information:
-          if "course_description" in self.all_tracks_course_information[prereq]:
-              course_desc = self.__add_intermediate_br_tags(self.all_tracks_course_information[prereq]["course_description"])
-          if "course_name" in self.all_tracks_course_information[prereq]:
-              course_name = self.all_tracks_course_information[prereq]["course_name"]
-
-          self.all_tracks_course_information[prereq]["location"] = {"x": x, "y": y, "z": z}
+          course_desc = self.__get_hover_text(prereq, self.all_tracks_course_information[prereq])
+          display_name = self.__get_display_name(prereq, self.all_tracks_course_information[prereq])
       if prereq in self.all_tracks_course_information and self.all_tracks_course_information[prereq]["dependency_count"] >= self.critical_courses_threshold:
           critical_course_cnt += 1
           fig.add_trace(go.Scatter3d(
@@ -479,7 +474,7 @@ class Generate3DGraph(html.Div):
               marker=dict(size=self.special_marker_size, color='#000000'),
               textfont=dict(size=12, color='black', family="Arial", weight="bold"),
               showlegend=False,
-              name=f"{prereq}-{course_name}" if course_name else prereq
+              name=display_name
           ))
       else:
           fig.add_trace(go.Scatter3d(
@@ -488,23 +483,25 @@ class Generate3DGraph(html.Div):
               z=[z],
               customdata=[prereq],
               text=prereq,
-              mode='markers+text',
+              mode='markers' if level_of_detail else 'markers+text',
               hoverinfo='text', 
               hovertext=course_desc,
               marker=dict(size=self.marker_size, color='#000000'),
               showlegend=False,
               textfont=dict(size=12, color='black', family="Arial", weight="bold"),
-              name=f"{prereq}-{course_name}" if course_name else prereq
+              name=display_name
           ))
 
-    edge_traces = []
+    trace_handler.end_span()
+
+    trace_handler.begin_span("edge_creation")
+    edges = []
     for year in courses:
       if year == "extra_course_related_info":
         continue
       for semester in courses[year]:
         courses_in_semester = list(courses[year][semester].keys())
         for course in courses_in_semester:
-          x1, y1, z1 = course_positions[course]
           course_year = self.all_tracks_course_information[track][course]["year"] if course in self.all_tracks_course_information[track] else 0
           course_semester = self.all_tracks_course_information[track][course]["semester"] if course in self.all_tracks_course_information[track] else 0
           if 'prerequisites' in courses[year][semester][course]:
@@ -513,54 +510,21 @@ class Generate3DGraph(html.Div):
                 for sub_prereq_list in prereq:
                   if isinstance(sub_prereq_list, list):
                     for sub_prereq in sub_prereq_list:
-                      if sub_prereq in course_positions:
-                        x0, y0, z0 = course_positions[sub_prereq]
+                      if sub_prereq in layout.course_index:
                         sub_prereq_year = self.all_tracks_course_information[track][sub_prereq]["year"] if sub_prereq in self.all_tracks_course_information[track] else 0
                         sub_prereq_semester = self.all_tracks_course_information[track][sub_prereq]["semester"] if sub_prereq in self.all_tracks_course_information[track] else 0
                         uid = f"inbetween_edges_prerequisites_{course_year}_{course_semester}_{sub_prereq_year}_{sub_prereq_semester}_{year}_{semester}"
-                        edge_traces.append(go.Scatter3d(
-                          customdata=[f"edge_pre_{course}_{sub_prereq}"],
-                          uid=uid,
-                          x=[x0, x1],
-                          y=[y0, y1],
-                          z=[z0, z1],
-                          mode='lines',
-                          showlegend=False,
-                          line=dict(color=self.color_for_prerequisites, width=2),  
-                          hoverinfo='skip'  
-                        ))
-                  elif sub_prereq_list in course_positions:
-                    x0, y0, z0 = course_positions[sub_prereq_list]
+                        edges.append(("prerequisites", course, sub_prereq, uid))
+                  elif sub_prereq_list in layout.course_index:
                     sub_prereq_year = self.all_tracks_course_information[track][sub_prereq_list]["year"] if sub_prereq_list in self.all_tracks_course_information[track] else 0
                     sub_prereq_semester = self.all_tracks_course_information[track][sub_prereq_list]["semester"] if sub_prereq_list in self.all_tracks_course_information[track] else 0
                     uid = f"inbetween_edges_prerequisites_{course_year}_{course_semester}_{sub_prereq_year}_{sub_prereq_semester}_{year}_{semester}"
-                    edge_traces.append(go.Scatter3d(
-                      customdata=[f"edge_pre_{course}_{sub_prereq_list}"],
-                      uid=uid,
-                      x=[x0, x1],
-                      y=[y0, y1],
-                      z=[z0, z1],
-                      mode='lines',
-                      showlegend=False,
-                      line=dict(color=self.color_for_prerequisites, width=2), 
-                      hoverinfo='skip' 
-                    ))
-              elif prereq in course_positions:
-                x0, y0, z0 = course_positions[prereq]
+                    edges.append(("prerequisites", course, sub_prereq_list, uid))
+              elif prereq in layout.course_index:
                 prereq_year = self.all_tracks_course_information[track][prereq]["year"] if prereq in self.all_tracks_course_information[track] else 0
                 prereq_semester = self.all_tracks_course_information[track][prereq]["semester"] if prereq in self.all_tracks_course_information[track] else 0
                 uid = f"inbetween_edges_prerequisites_{course_year}_{course_semester}_{prereq_year}_{prereq_semester}_{year}_{semester}"
-                edge_traces.append(go.Scatter3d(
-                  customdata=[f"edge_pre_{course}_{prereq}"],
-                  uid=uid,
-                  x=[x0, x1],
-                  y=[y0, y1],
-                  z=[z0, z1],
-                  mode='lines',
-                  showlegend=False,
-                  line=dict(color=self.color_for_prerequisites, width=2),  
-                  hoverinfo='skip'  
-                ))
+                edges.append(("prerequisites", course, prereq, uid))
 
             
             if 'corequisites' in courses[year][semester][course]:
@@ -569,57 +533,46 @@ class Generate3DGraph(html.Div):
                   for sub_coreq in coreq:
                     if isinstance(sub_coreq, list):
                       for c in sub_coreq:
-                        if c in course_positions:
-                          x0, y0, z0 = course_positions[c]
+                        if c in layout.course_index:
                           coreq_year = self.all_tracks_course_information[track][c]["year"] if c in self.all_tracks_course_information[track] else 0
                           coreq_semester = self.all_tracks_course_information[track][c]["semester"] if c in self.all_tracks_course_information[track] else 0
                           uid = f"inbetween_edges_corequisites_{year}_{semester}_{coreq_year}_{coreq_semester}_{course_year}_{course_semester}"
-                          edge_traces.append(go.Scatter3d(
-                            customdata=[f"edge_coreq_{course}_{c}"],
-                            uid=uid,
-                            x=[x0, x1],
-                            y=[y0, y1],
-                            z=[z0, z1],
-                            mode='lines',
-                            showlegend=False,
-                            line=dict(color=self.color_for_corequisites, width=2), 
-                            hoverinfo='skip'  
-                          ))
-                    elif sub_coreq in course_positions:
-                      x0, y0, z0 = course_positions[sub_coreq]
+                          edges.append(("corequisites", course, c, uid))
+                    elif sub_coreq in layout.course_index:
                       coreq_year = self.all_tracks_course_information[track][sub_coreq]["year"] if sub_coreq in self.all_tracks_course_information[track] else 0
                       coreq_semester = self.all_tracks_course_information[track][sub_coreq]["semester"] if sub_coreq in self.all_tracks_course_information[track] else 0
                       uid = f"inbetween_edges_corequisites_{year}_{semester}_{coreq_year}_{coreq_semester}_{course_year}_{course_semester}"
-                      edge_traces.append(go.Scatter3d(
-                        customdata=[f"edge_coreq_{course}_{sub_coreq}"],
-                        uid=uid,
-                        x=[x0, x1],
-                        y=[y0, y1],
-                        z=[z0, z1],
-                        mode='lines',
-                        showlegend=False,
-                        line=dict(color=self.color_for_corequisites, width=2),
-                        hoverinfo='skip' 
-                      ))
-                elif coreq in course_positions:
-                  x0, y0, z0 = course_positions[coreq]
+                      edges.append(("corequisites", course, sub_coreq, uid))
+                elif coreq in layout.course_index:
                   coreq_year = self.all_tracks_course_information[track][coreq]["year"] if coreq in self.all_tracks_course_information[track] else 0
                   coreq_semester = self.all_tracks_course_information[track][coreq]["semester"] if coreq in self.all_tracks_course_information[track] else 0
                   uid = f"inbetween_edges_corequisites_{year}_{semester}_{coreq_year}_{coreq_semester}_{course_year}_{course_semester}"
-                  edge_traces.append(go.Scatter3d(
-                    customdata=[f"edge_coreq_{course}_{coreq}"],
-                    uid=uid,
-                    x=[x0, x1],
-                    y=[y0, y1],
-                    z=[z0, z1],
-                    mode='lines',
-                    showlegend=False,
-                    line=dict(color=self.color_for_corequisites, width=2),  
-                    hoverinfo='skip'  
-                  ))
-    
-    for edge_trace in edge_traces:
-      fig.add_trace(edge_trace)
+                  edges.append(("corequisites", course, coreq, uid))
+
+    if level_of_detail:
+      self.__add_merged_edges(
+        fig=fig,
+        layout=layout,
+        edges=edges,
+        aggregate_nodes=aggregate_nodes,
+        aggregate_positions=aggregate_positions,
+      )
+    else:
+      for relation, course, requisite, uid in edges:
+        x0, y0, z0 = layout.position(requisite)
+        x1, y1, z1 = layout.position(course)
+        fig.add_trace(go.Scatter3d(
+          customdata=[f"edge_{'pre' if relation == 'prerequisites' else 'coreq'}_{course}_{requisite}"],
+          uid=uid,
+          x=[x0, x1],
+          y=[y0, y1],
+          z=[z0, z1],
+          mode='lines',
+          showlegend=False,
+          line=dict(color=self.color_for_prerequisites if relation == "prerequisites" else self.color_for_corequisites, width=2),
+          hoverinfo='skip'
+        ))
+    trace_handler.end_span()
     
     course_name = self.course_name.replace('_', ' ').title()
     fig.update_layout(
@@ -650,19 +603,23 @@ class Generate3DGraph(html.Div):
 
   def __interactive_dash_app(self,
                              track: str,
-                             course_graph: go.Figure,
+                             course_graph: "go.Figure",
                              list_of_courses_dropdownmenuitem: list) -> None:
     """
-    Create an interactive Dash app for the 3D course graph.
+    Create an interactive Dash app for the 3D course graph. The fullscreen graph is left empty in the layout,
+    its figure is kept in self.fullscreen_figure and sent when the modal is first opened.
+    The inline figure is also kept in self.inline_figure, e.g. for the prebuilt figure bundles.
 
     Args:
       - course_graph (go.Figure): The course graph.
       - list_of_courses_dropdownmenuitem (list): The list of courses for the dropdown menu.
     
     Returns:
-      - None
+      - html.Div: The layout of the track.
     """
     
+    import plotly.graph_objects as go
+
     colored_graph = go.Figure(course_graph)
 
     course_graph.update_layout(
@@ -694,162 +651,18 @@ class Generate3DGraph(html.Div):
     
     for i in range(len(course_graph["data"])):
       if "customdata" in course_graph["data"][i]:
-        if course_graph["data"][i]["customdata"] and "edge" in course_graph["data"][i]["customdata"][0]:
+        if str(course_graph["data"][i]["meta"]).startswith("edges_") or (course_graph["data"][i]["customdata"] and "edge" in course_graph["data"][i]["customdata"][0]):
           course_graph["data"][i]["visible"] = False
           course_graph["data"][i]["line"]["color"] = "gray"
         elif "customdata" in course_graph["data"][i] and course_graph["data"][i]["customdata"] and course_graph["data"][i]["customdata"][0] not in self.all_tracks_course_information:
           course_graph["data"][i]["marker"]["color"] = "gray"
     
-    layout = html.Div(
-      [
-        html.Div(
-          dcc.Graph(
-            id=f"3d_course_graph",
-            figure=colored_graph,
-            style={
-              "height": "100%",
-            }
-          ),
-          style={
-            "position": "absolute",
-            "height": "92%",
-            "width": "98%",
-            "border-radius": "1.2rem",
-            "overflow": "hidden",
-          },
-        ),
-        dbc.Modal(
-          children=[
-            dcc.Graph(
-              id=f"3d_course_graph",
-              figure=course_graph,
-              style={
-                "width": "100%",
-                "height": "100%",
-                "position": "absolute",
-              }
-            ),
-            html.Div(
-              children=[
-                html.Div(
-                  children=[
-                    html.P(
-                      children=["Enter a course to develop a path to it:"],
-                      style={
-                        "font-size": "0.8rem",
-                        "color": "black",
-                        "font-weight": "bold",
-                        "margin-bottom": "0.2rem",
-                      }
-                    ),
-                    dbc.Input(
-                      id="path-to",
-                      type="text",
-                      placeholder="Enter course (reset to clear)",
-                      style={
-                        "width": "100%",
-                        "font-size": "0.8rem",
-                        "border": "1px solid black",
-                        "border-radius": "1.2rem",
-                      }
-                    ),
-                    html.Div(
-                      children=[
-                        dbc.Button(
-                          id="path-to-button",
-                          children=["Develop Path"],
-                          style={
-                            "width": "40%",
-                            "font-size": "0.8rem",
-                            "padding": "0.3rem 0.6rem",
-                            "border": "1px solid black",
-                            "border-radius": "1.2rem",
-                            "background": "#131314",
-                            "color": "white",
-                            "align-items": "center",
-                            "margin-right": "1rem",
-                          }
-                        ),
-                        dbc.Button(
-                          id="reset-button",
-                          children=["Reset"],
-                          style={
-                            "width": "40%",
-                            "font-size": "0.8rem",
-                            "padding": "0.3rem 0.6rem",
-                            "border": "1px solid black",
-                            "border-radius": "1.2rem",
-                            "background": "#131314",
-                            "align-items": "center",
-                            "color": "white",
-                          }
-                        ),
-                      ],
-                      style={
-                        "display": "flex",
-                        "margin-top": "0.5rem",
-                        "flex-direction": "row",
-                      }
-                    ),
-                    html.P(
-                      id="complete-path-area",
-                      style={
-                        "color": "black",
-                        "margin": "0.5rem",
-                        "min-height": "wrap-content",
-                      }
-                    ),
-                  ],
-                )
-              ],
-              style={
-                "position": "absolute",
-                "top": "0",
-                "left": "0",
-                "height": "100%",
-                "width": "17%",
-                "padding": "0.5rem 1rem",
-                "padding-top": "5.5rem",
-              },
-            ),
-            html.Div(
-              id='click-data'
-            ),
-          ],
-          style={
-            "height": "100vh",
-            "overflow": "hidden",
-          },
-          id="modal-fs",
-          fullscreen=True,
-        ),
-        dbc.Button(
-          children=[
-            "Open in fullscreen",
-          ],
-          title="Provide more information and control over interactions on 3D graph. Press 'Esc' to exit fullscreen.",
-          style={
-            "bottom": "0.5rem",
-            "position": "absolute",
-            "margin": "0.8rem 0.6rem",
-            "border": "1.5px solid black",
-            "border-radius": "1.2rem",
-            "font-weight": "bold",
-            "background": "linear-gradient(to right, #f12711, #a562f8)",
-            "color": "black"
-          },
-          id="open-fs",
-        ),
-        dcc.Store(id="camera", storage_type="session"),
-        dcc.Store(id='click-count', data={}, storage_type="session"),
-      ],
-      style={
-        "height": "100%",
-        "border-radius": "1.2rem",
-      }
-    )
+    self.inline_figure = figure_serializer.serialize(colored_graph)
+    self.fullscreen_figure = figure_serializer.serialize(course_graph)
 
-    return layout
+    return track_layout(
+      inline_figure=self.inline_figure,
+    )
 
 
   def __generate_courses_information_for_track(self,
@@ -879,32 +692,31 @@ class Generate3DGraph(html.Div):
   
 
   def run(self,
-          track=None) -> None:
+          track=None):
     """
     Generate a 3d graph of the course catalog.
     
     Args:
-      - None
+      - track (str): The track to be rendered, every track if None.
     
     Returns:
-      - None
+      - html.Div: The layout of the track, or the {track: layout} dictionary of every track if track is None.
     """
 
     if track is None:
-      all_tracks_3d_graphs = {}
-      track_specific_figure = []
-
-      for track in self.all_tracks_course_information:
-        track_specific_figure.append(self.__create_course_trajectory(track))
-      
-      return all_tracks_3d_graphs
+      return {
+        track: self.run(track=track)
+        for track in self.all_tracks_course_information
+      }
     
     elif track:
       self.track = track
-      course_graph = self.__create_course_trajectory(track)
+      with trace_handler.span("create_course_trajectory", track=track):
+        course_graph = self.__create_course_trajectory(track)
       list_of_courses_dropdownmenuitem = self.__generate_courses_information_for_track(track)
-      return self.__interactive_dash_app(
-        track=track,
-        course_graph=course_graph,
-        list_of_courses_dropdownmenuitem=list_of_courses_dropdownmenuitem
-      )
\ No newline at end of file
+      with trace_handler.span("interactive_dash_app_layout", track=track):
+        return self.__interactive_dash_app(
+          track=track,
+          course_graph=course_graph,
+          list_of_courses_dropdownmenuitem=list_of_courses_dropdownmenuitem
+        )
\ No newline at end of file
@@ -0,0 +1,159 @@
+from hashlib import blake2b
+
+
+class LayoutEngine:
+  """
+  The LayoutEngine class computes the position of every node of a track in one vectorized pass.
+  Positions are stored as a structure of arrays indexed by slot: the courses taught in the track,
+  ring by ring, followed by the pre-knowledge courses sorted by code.
+  """
+
+
+  def __init__(self,
+               courses: dict,
+               radius_circle: int,
+               z_level: int,
+               z_increment: int,
+               left_shift: float,
+               seed: str = None) -> None:
+    """
+    Initialize the LayoutEngine class.
+
+    Args:
+      - courses (dict): The course catalog of the track, {year: {semester: {course: details}}}.
+      - radius_circle (int): The radius of the semester rings.
+      - z_level (int): The elevation of the first semester ring.
+      - z_increment (int): The elevation between two semester rings.
+      - left_shift (float): The x offset of the pre-knowledge rings.
+      - seed (str): Seeds the rotation of the rings, e.g. course_name/track, so every renderer places a course at the same position.
+
+    Returns:
+      - None
+    """
+
+    self.courses_catalog = courses
+    self.radius_circle = radius_circle
+    self.z_level = z_level
+    self.z_increment = z_increment
+    self.left_shift = left_shift
+    self.seed = seed
+
+
+  def __random_generator(self) -> "np.random.Generator":
+    """
+    Create the random generator of the ring rotations.
+
+    Args:
+      - None
+
+    Returns:
+      - np.random.Generator: A generator seeded from the seed string, unseeded if there is none.
+    """
+
+    import numpy as np
+
+    if self.seed is None:
+      return np.random.default_rng()
+    return np.random.default_rng(int.from_bytes(blake2b(self.seed.encode(), digest_size=8).digest(), "big"))
+
+
+  def __flatten(self,
+                requisites) -> list:
+    """
+    Flatten the nested and/or groups of prerequisites or corequisites into course codes.
+
+    Args:
+      - requisites (str | list): A course code or a nested list of course codes.
+
+    Returns:
+      - list: The course codes.
+    """
+
+    if not isinstance(requisites, list):
+      return [requisites]
+    return [course for item in requisites for course in self.__flatten(item)]
+
+
+  def run(self) -> "LayoutEngine":
+    """
+    Compute the rings and the node positions of the track.
+
+    Args:
+      - None
+
+    Returns:
+      - LayoutEngine: The engine, with the following attributes:
+        - courses (list): The course code of every slot.
+        - course_index (dict): The slot of every course, the last ring a course appears in wins.
+        - x, y, z (np.ndarray): The position of every slot.
+        - rings (list): (year, semester, z_level, first slot, end slot) per semester ring.
+        - pre_knowledge (list): (course, year, semester, z_level) per pre-knowledge course, from the first slot after the rings on.
+    """
+
+    import numpy as np
+
+    self.courses, self.rings = [], []
+    ring_sizes, z_level = [], self.z_level
+    semester_elevation = {}
+    for year, semesters in self.courses_catalog.items():
+      if year == "extra_course_related_info":
+        continue
+      for semester, courses_in_semester in semesters.items():
+        semester_elevation[(year, semester)] = z_level
+        self.rings.append((year, semester, z_level, len(self.courses), len(self.courses) + len(courses_in_semester)))
+        self.courses.extend(courses_in_semester)
+        ring_sizes.append(len(courses_in_semester))
+        z_level += self.z_increment
+
+    taught_courses = set(self.courses)
+    earliest = {}
+    for year, semester in semester_elevation:
+      for details in self.courses_catalog[year][semester].values():
+        for key in ("prerequisites", "corequisites"):
+          for course in self.__flatten(details.get(key, [])):
+            if course not in taught_courses and (course not in earliest or earliest[course][:2] > (int(year), int(semester))):
+              earliest[course] = (int(year), int(semester), semester_elevation[(year, semester)])
+    self.pre_knowledge = [(course, *earliest[course]) for course in sorted(earliest)]
+
+    ring_sizes = np.array(ring_sizes, dtype=np.int64)
+    n_taught, n_pre_knowledge = len(self.courses), len(self.pre_knowledge)
+    ring_of_slot = np.repeat(np.arange(len(ring_sizes)), ring_sizes)
+    position_in_ring = np.arange(n_taught) - np.repeat(np.cumsum(ring_sizes) - ring_sizes, ring_sizes)
+    offsets = self.__random_generator().uniform(0, 2 * np.pi, size=len(ring_sizes))
+    theta = 2 * np.pi * position_in_ring / np.maximum(ring_sizes[ring_of_slot], 1) + offsets[ring_of_slot]
+    pre_knowledge_theta = 2 * np.pi * np.arange(n_pre_knowledge) / max(n_pre_knowledge, 1)
+
+    self.x = np.concatenate([
+      self.radius_circle * np.cos(theta),
+      (self.radius_circle / 2) * np.cos(pre_knowledge_theta) + self.left_shift,
+    ])
+    self.y = np.concatenate([
+      self.radius_circle * np.sin(theta),
+      (self.radius_circle / 2) * np.sin(pre_knowledge_theta),
+    ])
+    self.z = np.concatenate([
+      np.array([ring[2] for ring in self.rings], dtype=np.float64)[ring_of_slot],
+      np.array([elevation for _, _, _, elevation in self.pre_knowledge], dtype=np.float64),
+    ])
+
+    self.courses.extend(course for course, _, _, _ in self.pre_knowledge)
+    self.course_index = {course: slot for slot, course in enumerate(self.courses)}
+    return self
+
+
+  def position(self,
+               course: str) -> tuple:
+    """
+    Get the position of a course.
+
+    Args:
+      - course (str): The course code.
+
+    Returns:
+      - tuple: (x, y, z), None if the course is not placed.
+    """
+
+    slot = self.course_index.get(course)
+    if slot is None:
+      return None
+    return self.x[slot], self.y[slot], self.z[slot]
@@ -1,7 +1,11 @@
 import os
 import json
+from copy import deepcopy
 from shutil import rmtree
 from warnings import filterwarnings
+from src.utils.database_handler import DatabaseHandler
+from src.utils.course_records import split_course_table
+from src.utils.course_formatting import add_intermediate_br_tags, dynamic_color_choice_for_semester
 
 filterwarnings("ignore")
 
@@ -14,13 +18,15 @@ class PrepareCoursesData:
   
   def __init__(self,
                course_name: str,
-               course_catalog: dict) -> None:
+               course_catalog: dict,
+               database_handler: DatabaseHandler = None) -> None:
     """
     This method is responsible for initializing the class.
     
     Args:
       - course_name (str): The name of the course.
       - course_catalog (dict): A dictionary containing the course catalog.
+      - database_handler (DatabaseHandler): If given, the catalog and the prepared information are published to the database and the catalog version is bumped.
     
     Returns:
       - None
@@ -28,6 +34,8 @@ class PrepareCoursesData:
     
     self.course_name = course_name
     self.course_catalog = course_catalog
+    self.database_handler = database_handler
+    self.published_course_catalog = deepcopy(course_catalog) if database_handler is not None else None
   
 
   def __all_track_seperate_information_generation(self) -> dict:
@@ -294,6 +302,55 @@ class PrepareCoursesData:
     return all_tracks_information
   
 
+  def __generate_render_information(self,
+                                    all_tracks_information: dict) -> dict:
+    """
+    This method is responsible for precomputing what the renderers display for each course, once per catalog
+    instead of on every render: the legend name, the semester color and the hover text, the description wrapped with <br> tags.
+    
+    Args:
+      - all_tracks_information (dict): A dictionary containing all track's course information.
+    
+    Returns:
+      - all_tracks_information (dict): A dictionary containing all track's course information along with the display name, color and hover text.
+    """
+
+    for track in all_tracks_information.keys():
+      semester_colors = dynamic_color_choice_for_semester(self.course_catalog[track])
+      for course, course_information in all_tracks_information[track].items():
+        course_name = course_information.get("course_name", "")
+        course_information["display_name"] = f"{course}-{course_name}" if course_name else course
+        course_information["color"] = semester_colors[course_information["year"]][course_information["semester"]]
+        course_information["hover_text"] = add_intermediate_br_tags(course_information.get("course_description", ""))
+
+    return all_tracks_information
+
+
+  def __save_course_table(self,
+                          all_tracks_information: dict) -> None:
+    """
+    This method is responsible for saving the prepared information split into the course table of the catalog,
+    holding the fields shared by every track once, and the placements of the courses in each track.
+    
+    Args:
+      - all_tracks_information (dict): A dictionary containing all track's course information.
+    
+    Returns:
+      - None
+    """
+
+    course_table, all_tracks_placements = split_course_table(all_tracks_information)
+    with open(f'data/{self.course_name}/course_table.json', 'w') as f:
+      json.dump(course_table, f, indent=2)
+
+    for track in all_tracks_placements.keys():
+      with open(f'data/{self.course_name}/{track}/{track}_specific_information.json', 'w') as f:
+        json.dump(all_tracks_placements[track], f, indent=2)
+
+    with open(f'data/{self.course_name}/all_tracks_information.json', 'w') as f:
+      json.dump(all_tracks_placements, f, indent=2)
+  
+
   def run(self) -> dict:
     """
     This method is responsible for running the prepare course data process.
@@ -312,8 +369,18 @@ class PrepareCoursesData:
     all_tracks_information = self.__compute_dependencies(
       all_tracks_information=all_tracks_information
     )
-    
-    with open(f'data/{self.course_name}/all_tracks_information.json', 'w') as f:
-      json.dump(all_tracks_information, f, indent=2)
+    all_tracks_information = self.__generate_render_information(
+      all_tracks_information=all_tracks_information
+    )
+    self.__save_course_table(
+      all_tracks_information=all_tracks_information
+    )
+
+    if self.database_handler is not None:
+      self.database_handler.publish_course(
+        course_name=self.course_name,
+        course_catalog=self.published_course_catalog,
+        all_tracks_information=all_tracks_information,
+      )
     
     return all_tracks_information
\ No newline at end of file
@@ -0,0 +1,329 @@
+import json
+from hashlib import blake2b
+from consts import QueryAPIConsts
+from flask import Blueprint, Flask, Response, request
+from src.utils.cache_handler import CacheHandler
+from src.utils.database_handler import DatabaseHandler
+
+
+class QueryAPI:
+  """
+  The QueryAPI class exposes a read-only JSON API over the prepared course data for advising tools.
+  """
+
+
+  def __init__(self,
+               database_handler: DatabaseHandler) -> None:
+    """
+    Initialize the QueryAPI class.
+
+    Args:
+      - database_handler (DatabaseHandler): The database handler whose prepared data and cache back the API.
+
+    Returns:
+      - None
+    """
+
+    query_api_consts = QueryAPIConsts().get_constants()
+    self.url_prefix = query_api_consts["url_prefix"]
+    self.max_age = query_api_consts["max_age"]
+    self.database_handler = database_handler
+    self.cache = database_handler.cache
+    self.response_cache = CacheHandler(
+      max_entries=query_api_consts["cache_max_entries"],
+    )
+    database_handler.register_cache(self.response_cache)
+
+
+  def __json_response(self,
+                      key: tuple,
+                      factory,
+                      cacheable: bool = True) -> Response:
+    """
+    Serve a compact JSON body with an ETag, answering If-None-Match with 304 Not Modified.
+    The encoded body and its ETag are cached in the response cache, apart from the course data,
+    so repeated queries skip the JSON encoding and arbitrary queries cannot evict the course data or the figures.
+
+    Args:
+      - key (tuple): The cache key of the response, conventionally ("api", course_name, ...).
+      - factory (callable): A callable without arguments producing the JSON serializable payload.
+      - cacheable (bool): Whether the body is cached, False for queries about unknown courses.
+
+    Returns:
+      - Response: The JSON response.
+    """
+
+    def encode() -> tuple:
+      body = json.dumps(factory(), separators=(",", ":")).encode("utf-8")
+      return body, blake2b(body, digest_size=12).hexdigest()
+
+    body, etag = self.response_cache.get_or_set(key=key, factory=encode) if cacheable else encode()
+    response = Response(body, mimetype="application/json")
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = self.max_age
+    return response.make_conditional(request)
+
+
+  def __error_response(self,
+                       message: str,
+                       status: int = 404) -> Response:
+    """
+    Create a JSON error response.
+
+    Args:
+      - message (str): The error message.
+      - status (int): The HTTP status code.
+
+    Returns:
+      - Response: The JSON error response.
+    """
+
+    return Response(
+      json.dumps({"error": message}, separators=(",", ":")),
+      status=status,
+      mimetype="application/json",
+    )
+
+
+  def __get_track_information(self,
+                              course_name: str,
+                              track: str) -> dict:
+    """
+    Get the prepared information of a track, or None if the course or track does not exist.
+
+    Args:
+      - course_name (str): The name of the course.
+      - track (str): The track, e.g. track_1.
+
+    Returns:
+      - dict: The prepared course information of the track.
+    """
+
+    return self.database_handler.get_course_track_information(
+      course_name=course_name
+    ).get(track)
+
+
+  def __complete_path(self,
+                      course_information: dict) -> list:
+    """
+    Get the prepared path to a course.
+
+    Args:
+      - course_information (dict): The prepared information of the course.
+
+    Returns:
+      - list: The list of {"source", "destination", "relation"} edges.
+    """
+
+    return course_information.get("complete path", course_information.get("complete_path", []))
+
+
+  def __dependents_index(self,
+                         course_name: str,
+                         track: str,
+                         track_information: dict) -> dict:
+    """
+    Build the index of courses depending on each course of a track from the prepared paths.
+
+    Args:
+      - course_name (str): The name of the course.
+      - track (str): The track, e.g. track_1.
+      - track_information (dict): The prepared course information of the track.
+
+    Returns:
+      - dict: The {course: {"direct": [...], "all": [...]}} index.
+    """
+
+    def build() -> dict:
+      direct, transitive = {}, {}
+      for target_course, course_information in track_information.items():
+        for edge in self.__complete_path(course_information):
+          transitive.setdefault(edge["source"], set()).add(target_course)
+          if edge["destination"] == target_course:
+            direct.setdefault(edge["source"], set()).add(target_course)
+
+      return {
+        course: {
+          "direct": sorted(direct.get(course, ())),
+          "all": sorted(transitive[course]),
+        }
+        for course in transitive
+      }
+
+    return self.cache.get_or_set(
+      key=("dependents", course_name, track),
+      factory=build,
+    )
+
+
+  def catalogs(self) -> Response:
+    """
+    List the course catalogs with their number of tracks.
+
+    Args:
+      - None
+
+    Returns:
+      - Response: {"catalogs": [[course_name, tracks_count], ...]}
+    """
+
+    tracks_count_per_course = self.database_handler.get_tracks_count_per_course()
+    return self.__json_response(
+      key=("api", None, "catalogs"),
+      factory=lambda: {
+        "catalogs": [
+          [course_name, tracks_count_per_course.get(course_name, 0)]
+          for course_name in self.database_handler.get_courses_catalog()
+        ]
+      },
+    )
+
+
+  def descriptions(self,
+                   course_name: str) -> Response:
+    """
+    Get the description of every course of a catalog, fetched once by the browser for the lazy hover descriptions.
+
+    Args:
+      - course_name (str): The name of the course.
+
+    Returns:
+      - Response: {course: description}
+    """
+
+    if course_name not in self.database_handler.get_courses_catalog():
+      return self.__error_response(f"Unknown catalog '{course_name}'")
+
+    return self.__json_response(
+      key=("api", course_name, "descriptions"),
+      factory=lambda: self.database_handler.get_course_descriptions(course_name=course_name),
+    )
+
+
+  def track_summary(self,
+                    course_name: str,
+                    track: str) -> Response:
+    """
+    List the courses of a track with their placement and dependency counts.
+
+    Args:
+      - course_name (str): The name of the course.
+      - track (str): The track, e.g. track_1.
+
+    Returns:
+      - Response: {"fields": [...], "rows": [[...], ...]} ordered by dependency count.
+    """
+
+    track_information = self.__get_track_information(course_name, track)
+    if track_information is None:
+      return self.__error_response(f"Unknown track '{track}' for '{course_name}'")
+
+    return self.__json_response(
+      key=("api", course_name, track, "courses"),
+      factory=lambda: {
+        "fields": ["course", "course_name", "year", "semester", "dependency_count", "on_dependant_courses_count"],
+        "rows": [
+          [
+            course,
+            course_information.get("course_name", ""),
+            course_information.get("year"),
+            course_information.get("semester"),
+            course_information.get("dependency_count", 0),
+            course_information.get("on_dependant_courses_count", 0),
+          ]
+          for course, course_information in track_information.items()
+        ],
+      },
+    )
+
+
+  def paths(self,
+            course_name: str,
+            track: str) -> Response:
+    """
+    Get the prerequisite paths to one or more target courses given as repeated ?course= arguments.
+
+    Args:
+      - course_name (str): The name of the course.
+      - track (str): The track, e.g. track_1.
+
+    Returns:
+      - Response: {"paths": {target_course: [[source, destination, relation], ...]}, "unknown": [...]}
+    """
+
+    track_information = self.__get_track_information(course_name, track)
+    if track_information is None:
+      return self.__error_response(f"Unknown track '{track}' for '{course_name}'")
+
+    target_courses = tuple(dict.fromkeys(request.args.getlist("course")))
+    if not target_courses:
+      return self.__error_response("At least one ?course= argument is required", status=400)
+
+    return self.__json_response(
+      key=("api", course_name, track, "paths", target_courses),
+      factory=lambda: {
+        "paths": {
+          target_course: [
+            [edge["source"], edge["destination"], edge["relation"]]
+            for edge in self.__complete_path(track_information[target_course])
+          ]
+          for target_course in target_courses
+          if target_course in track_information
+        },
+        "unknown": [target_course for target_course in target_courses if target_course not in track_information],
+      },
+      cacheable=all(target_course in track_information for target_course in target_courses),
+    )
+
+
+  def dependents(self,
+                 course_name: str,
+                 track: str,
+                 course: str) -> Response:
+    """
+    Get the courses that directly or transitively depend on a course.
+
+    Args:
+      - course_name (str): The name of the course.
+      - track (str): The track, e.g. track_1.
+      - course (str): The course code.
+
+    Returns:
+      - Response: {"course": course, "direct": [...], "all": [...]}
+    """
+
+    track_information = self.__get_track_information(course_name, track)
+    if track_information is None:
+      return self.__error_response(f"Unknown track '{track}' for '{course_name}'")
+
+    return self.__json_response(
+      key=("api", course_name, track, "dependents", course),
+      factory=lambda: {
+        "course": course,
+        **self.__dependents_index(course_name, track, track_information).get(course, {"direct": [], "all": []}),
+      },
+      cacheable=course in track_information,
+    )
+
+
+  def register(self,
+               server: Flask) -> None:
+    """
+    Mount the API routes on the Flask server.
+
+    Args:
+      - server (Flask): The Flask server of the Dash app.
+
+    Returns:
+      - None
+    """
+
+    blueprint = Blueprint("query_api", __name__, url_prefix=self.url_prefix)
+    blueprint.add_url_rule("/catalogs", view_func=self.catalogs)
+    blueprint.add_url_rule("/catalogs/<course_name>/descriptions", view_func=self.descriptions)
+    blueprint.add_url_rule("/catalogs/<course_name>/<track>/courses", view_func=self.track_summary)
+    blueprint.add_url_rule("/catalogs/<course_name>/<track>/paths", view_func=self.paths)
+    blueprint.add_url_rule("/catalogs/<course_name>/<track>/dependents/<course>", view_func=self.dependents)
+    server.register_blueprint(blueprint)
@@ -0,0 +1,183 @@
+from dash import dcc, html
+import dash_bootstrap_components as dbc
+
+
+EMPTY_FIGURE = {
+  "data": [],
+  "layout": {
+    "xaxis": {"visible": False},
+    "yaxis": {"visible": False},
+  },
+}
+
+
+def track_layout(inline_figure: dict = None,
+                 figure_bundle: dict = None) -> html.Div:
+  """
+  Create the layout of a track: the inline graph, the fullscreen modal and the stores of the track callbacks.
+  The fullscreen graph is left empty, its figure is sent when the modal is first opened.
+
+  Args:
+    - inline_figure (dict): The serialized figure of the inline graph, left empty if None.
+    - figure_bundle (dict): The URLs of the prebuilt figures of the track, fetched by the browser. None if the figures are rendered by the server.
+
+  Returns:
+    - html.Div: The layout of the track.
+  """
+
+  return html.Div(
+    [
+      html.Div(
+        dcc.Graph(
+          id="3d_course_graph_inline",
+          figure=inline_figure if inline_figure is not None else EMPTY_FIGURE,
+          style={
+            "height": "100%",
+          }
+        ),
+        style={
+          "position": "absolute",
+          "height": "92%",
+          "width": "98%",
+          "border-radius": "1.2rem",
+          "overflow": "hidden",
+        },
+      ),
+      html.Div(
+        id="course-description",
+        style={
+          "display": "none",
+        },
+      ),
+      dbc.Modal(
+        children=[
+          dcc.Graph(
+            id="3d_course_graph",
+            style={
+              "width": "100%",
+              "height": "100%",
+              "position": "absolute",
+            }
+          ),
+          html.Div(
+            children=[
+              html.Div(
+                children=[
+                  html.P(
+                    children=["Enter a course to develop a path to it:"],
+                    style={
+                      "font-size": "0.8rem",
+                      "color": "black",
+                      "font-weight": "bold",
+                      "margin-bottom": "0.2rem",
+                    }
+                  ),
+                  dbc.Input(
+                    id="path-to",
+                    type="text",
+                    placeholder="Enter course (reset to clear)",
+                    style={
+                      "width": "100%",
+                      "font-size": "0.8rem",
+                      "border": "1px solid black",
+                      "border-radius": "1.2rem",
+                    }
+                  ),
+                  html.Div(
+                    children=[
+                      dbc.Button(
+                        id="path-to-button",
+                        children=["Develop Path"],
+                        style={
+                          "width": "40%",
+                          "font-size": "0.8rem",
+                          "padding": "0.3rem 0.6rem",
+                          "border": "1px solid black",
+                          "border-radius": "1.2rem",
+                          "background": "#131314",
+                          "color": "white",
+                          "align-items": "center",
+                          "margin-right": "1rem",
+                        }
+                      ),
+                      dbc.Button(
+                        id="reset-button",
+                        children=["Reset"],
+                        style={
+                          "width": "40%",
+                          "font-size": "0.8rem",
+                          "padding": "0.3rem 0.6rem",
+                          "border": "1px solid black",
+                          "border-radius": "1.2rem",
+                          "background": "#131314",
+                          "align-items": "center",
+                          "color": "white",
+                        }
+                      ),
+                    ],
+                    style={
+                      "display": "flex",
+                      "margin-top": "0.5rem",
+                      "flex-direction": "row",
+                    }
+                  ),
+                  html.P(
+                    id="complete-path-area",
+                    style={
+                      "color": "black",
+                      "margin": "0.5rem",
+                      "min-height": "wrap-content",
+                    }
+                  ),
+                ],
+              )
+            ],
+            style={
+              "position": "absolute",
+              "top": "0",
+              "left": "0",
+              "height": "100%",
+              "width": "17%",
+              "padding": "0.5rem 1rem",
+              "padding-top": "5.5rem",
+            },
+          ),
+          html.Div(
+            id='click-data'
+          ),
+        ],
+        style={
+          "height": "100vh",
+          "overflow": "hidden",
+        },
+        id="modal-fs",
+        fullscreen=True,
+      ),
+      dbc.Button(
+        children=[
+          "Open in fullscreen",
+        ],
+        title="Provide more information and control over interactions on 3D graph. Press 'Esc' to exit fullscreen.",
+        style={
+          "bottom": "0.5rem",
+          "position": "absolute",
+          "margin": "0.8rem 0.6rem",
+          "border": "1.5px solid black",
+          "border-radius": "1.2rem",
+          "font-weight": "bold",
+          "background": "linear-gradient(to right, #f12711, #a562f8)",
+          "color": "black"
+        },
+        id="open-fs",
+      ),
+      dcc.Store(id="fullscreen-loaded", data=False),
+      dcc.Store(id="figure-bundle", data=figure_bundle),
+      dcc.Store(id="camera", storage_type="session"),
+      dcc.Store(id='click-count', data={}, storage_type="session"),
+    ],
+    style={
+      "height": "100%",
+      "border-radius": "1.2rem",
+    }
+  )
+
@@ -0,0 +1,527 @@
+import asyncio
+from time import monotonic
+from inspect import iscoroutinefunction
+from types import MappingProxyType
+from typing import TYPE_CHECKING
+from src.utils.cache_handler import CacheHandler
+from src.utils.course_records import CourseRecordCompactor, join_course_table
+from consts import MondoDBConsts, CacheConsts
+from src.utils.metrics_handler import metrics_handler
+from src.utils.database_handler import CatalogSnapshot, CourseBundle, STAGING_SUFFIX
+
+if TYPE_CHECKING:
+  import pymongo
+
+
+class AsyncDatabaseHandler:
+  """
+  The asyncio variant of DatabaseHandler, for ASGI deployments where a request waiting on MongoDB must not hold a worker thread.
+  It has the same cache keys, snapshot and version semantics as DatabaseHandler.
+  """
+
+
+  def __init__(self,
+               pymongo_client: "pymongo.AsyncMongoClient" = None,
+               cache: CacheHandler = None) -> None:
+    """
+    Initialize the AsyncDatabaseHandler class. Nothing is sent to MongoDB until the handler is first used.
+
+    Args:
+      - pymongo_client (pymongo.AsyncMongoClient): An already connected client. A synchronous client, e.g. an in-process stand-in, is run on worker threads. Connects to the configured cluster on first use if None.
+      - cache (CacheHandler): The cache, e.g. the one of the DatabaseHandler of the same process so both see the same data. A new one if None.
+
+    Returns:
+      - None
+    """
+
+    cache_consts = CacheConsts().get_constants()
+    self.pymongo_client = pymongo_client
+    self.version_poll_interval = cache_consts["version_poll_interval_s"]
+    self.compact_records = cache_consts["compact_records"]
+    self.cache = cache if cache is not None else CacheHandler(
+      max_entries=cache_consts["max_entries"],
+    )
+    self.__snapshot = None
+    self.__last_version_poll = monotonic()
+    self.__connect_lock = None
+    self.__refreshing = False
+    self.__fetches = {}
+
+
+  async def __call(self,
+                   method,
+                   *args,
+                   **kwargs):
+    """
+    Await a method of the client, running it on a worker thread if the client is synchronous.
+
+    Args:
+      - method (callable): A database or collection method, e.g. count_documents.
+      - args, kwargs: The arguments of the method.
+
+    Returns:
+      - The result of the method.
+    """
+
+    if iscoroutinefunction(method):
+      return await method(*args, **kwargs)
+    return await asyncio.to_thread(method, *args, **kwargs)
+
+
+  async def __find_all(self,
+                       collection,
+                       **kwargs) -> list:
+    """
+    Fetch every document of a find.
+
+    Args:
+      - collection (pymongo.asynchronous.collection.AsyncCollection): The collection.
+      - kwargs: The arguments of find, e.g. the projection.
+
+    Returns:
+      - list: The documents.
+    """
+
+    if iscoroutinefunction(collection.find_one):
+      return await collection.find(**kwargs).to_list(None)
+    return await asyncio.to_thread(lambda: list(collection.find(**kwargs)))
+
+
+  async def __connect(self) -> None:
+    """
+    Open the MongoDB client and load the first snapshot of the catalogs, unless already done.
+    A failed attempt is retried on the next use.
+
+    Args:
+      - None
+
+    Returns:
+      - None
+    """
+
+    if self.__connect_lock is None:
+      self.__connect_lock = asyncio.Lock()
+
+    async with self.__connect_lock:
+      if self.__snapshot is not None:
+        return
+
+      if self.pymongo_client is None:
+        import pymongo
+        from src.utils.mongo_command_listener import MongoCommandListener
+
+        mongo_db_consts = MondoDBConsts().get_constants()
+        self.pymongo_client = pymongo.AsyncMongoClient(
+          host=mongo_db_consts["host"],
+          event_listeners=[MongoCommandListener(metrics_handler)],
+        )
+      self.courses_catalog_db = self.pymongo_client["courses_catalog"]
+      self.courses_track_db = self.pymongo_client["courses_track_information"]
+      self.courses_table_db = self.pymongo_client["courses_table"]
+      self.catalog_versions_collection = self.pymongo_client["courses_metadata"]["catalog_versions"]
+      self.__snapshot = await self.__setup_meta_data()
+      self.__last_version_poll = monotonic()
+
+
+  async def __get_snapshot(self) -> CatalogSnapshot:
+    """
+    Get the current snapshot of the catalogs, connecting on first use.
+
+    Args:
+      - None
+
+    Returns:
+      - CatalogSnapshot: The current snapshot.
+    """
+
+    if self.__snapshot is None:
+      await self.__connect()
+    return self.__snapshot
+
+
+  async def __setup_meta_data(self) -> CatalogSnapshot:
+    """
+    Set up the meta data for the database, the track counts being read concurrently.
+
+    Args:
+      - None
+
+    Returns:
+      - CatalogSnapshot: The catalogs, their tracks count and their versions.
+    """
+
+    catalog_versions, courses_catalog_collection, courses_track_information_collection = await asyncio.gather(
+      self.__fetch_catalog_versions(),
+      self.__call(self.courses_catalog_db.list_collection_names),
+      self.__call(self.courses_track_db.list_collection_names),
+    )
+    courses_catalog_collection = sorted(
+      course_name
+      for course_name in set(courses_catalog_collection) & set(courses_track_information_collection)
+      if not course_name.endswith(STAGING_SUFFIX)
+    )
+    tracks_counts = await asyncio.gather(*[
+      self.__call(self.courses_track_db[course_name].count_documents, {})
+      for course_name in courses_catalog_collection
+    ])
+
+    return CatalogSnapshot(
+      courses_catalog_collection=tuple(courses_catalog_collection),
+      tracks_count_per_course=MappingProxyType(dict(zip(courses_catalog_collection, tracks_counts))),
+      catalog_versions=MappingProxyType(catalog_versions),
+    )
+
+
+  async def __fetch_catalog_versions(self) -> dict:
+    """
+    Fetch the version of every catalog from the metadata collection.
+
+    Args:
+      - None
+
+    Returns:
+      - dict: The {course_name: version} mapping, catalogs never published through bump_catalog_version are missing.
+    """
+
+    return {
+      document["_id"]: document["version"]
+      for document in await self.__find_all(self.catalog_versions_collection, filter={}, projection={"version": True})
+    }
+
+
+  async def __get_or_set(self,
+                         key: tuple,
+                         factory) -> dict:
+    """
+    Get a cached value, computing and caching it with the factory on a miss, like CacheHandler.get_or_set.
+    Concurrent misses on the same key await one shared task, so MongoDB is queried once. A waiter being cancelled does not cancel the task.
+
+    Args:
+      - key (tuple): The cache key, conventionally (namespace, course_name, ...).
+      - factory (callable): A coroutine function without arguments producing the value.
+
+    Returns:
+      - The cached or freshly computed value.
+    """
+
+    sentinel = object()
+    value = self.cache.get(key, sentinel)
+    if value is not sentinel:
+      return value
+
+    task = self.__fetches.get(key)
+    if task is None:
+      async def fetch():
+        value = await factory()
+        self.cache.set(key, value)
+        return value
+
+      def forget(done_task) -> None:
+        if self.__fetches.get(key) is done_task:
+          del self.__fetches[key]
+
+      task = self.__fetches[key] = asyncio.ensure_future(fetch())
+      task.add_done_callback(forget)
+    return await asyncio.shield(task)
+
+
+  async def __fetch_tracks(self,
+                           collection,
+                           course_table_collection=None) -> dict:
+    """
+    Fetch and compact the track documents of a collection.
+    The track placements are joined with the course table of the catalog, read concurrently, when its collection is given.
+
+    Args:
+      - collection (pymongo.asynchronous.collection.AsyncCollection): The collection of the course
+      - course_table_collection (pymongo.asynchronous.collection.AsyncCollection): The course table collection of the course, None for the catalog documents.
+
+    Returns:
+      - dict: The track documents keyed as track_1, track_2, ...
+    """
+
+    if course_table_collection is None:
+      all_tracks = {
+        f"track_{idx}": track
+        for idx, track in enumerate(await self.__find_all(collection, projection={"_id": False}), start=1)
+      }
+      if self.compact_records:
+        return CourseRecordCompactor().compact_catalog(all_tracks)
+      return all_tracks
+
+    tracks, course_table_documents = await asyncio.gather(
+      self.__find_all(collection, projection={"_id": False}),
+      self.__find_all(course_table_collection),
+    )
+    all_tracks_placements = {f"track_{idx}": track for idx, track in enumerate(tracks, start=1)}
+    course_table = {document.pop("_id"): document for document in course_table_documents}
+    if self.compact_records:
+      return CourseRecordCompactor().compact_track_information(all_tracks_placements, course_table=course_table)
+    return join_course_table(course_table, all_tracks_placements)
+
+
+  async def get_catalog_snapshot(self) -> CatalogSnapshot:
+    """
+    Get the current snapshot of the catalogs, for readers needing the catalog list, track counts and versions to agree.
+
+    Args:
+      - None
+
+    Returns:
+      - CatalogSnapshot: The snapshot, never mutated, a refresh publishes a new one.
+    """
+
+    return await self.__get_snapshot()
+
+
+  @metrics_handler.instrument_database
+  async def get_tracks_count_per_course(self) -> dict:
+    """
+    Get the tracks count per course.
+
+    Args:
+      - None
+
+    Returns:
+      - dict: The read-only dictionary of tracks count per course.
+    """
+
+    return (await self.__get_snapshot()).tracks_count_per_course
+
+
+  @metrics_handler.instrument_database
+  async def get_courses_catalog(self) -> tuple:
+    """
+    Get the courses catalog.
+
+    Args:
+      - None
+
+    Returns:
+      - tuple: The sorted names of the courses catalog.
+    """
+
+    return (await self.__get_snapshot()).courses_catalog_collection
+
+
+  async def __get_course_catalog_information(self,
+                                             course_name: str) -> dict:
+    """
+    Get the course catalog information from the cache, fetching it on a miss. Not instrumented,
+    so the public methods built on it record their latency once.
+
+    Args:
+      - course_name (str): The name of the course
+
+    Returns:
+      - dict: The course catalog information for the course
+    """
+
+    if course_name not in (await self.__get_snapshot()).courses_catalog_collection:
+      return {}
+
+    return await self.__get_or_set(
+      ("course_catalog", course_name),
+      lambda: self.__fetch_tracks(self.courses_catalog_db[course_name]),
+    )
+
+
+  async def __get_course_track_information(self,
+                                           course_name: str) -> dict:
+    """
+    Get the course track information from the cache, fetching it on a miss. Not instrumented,
+    so the public methods built on it record their latency once.
+
+    Args:
+      - course_name (str): The name of the course
+
+    Returns:
+      - dict: The course track information for the course
+    """
+
+    if course_name not in (await self.__get_snapshot()).courses_catalog_collection:
+      return {}
+
+    return await self.__get_or_set(
+      ("course_track", course_name),
+      lambda: self.__fetch_tracks(
+        self.courses_track_db[course_name],
+        course_table_collection=self.courses_table_db[course_name],
+      ),
+    )
+
+
+  @metrics_handler.instrument_database
+  async def get_course_catalog_information(self,
+                                           course_name: str) -> dict:
+    """
+    Get the course catalog information.
+
+    Args:
+      - course_name (str): The name of the course
+
+    Returns:
+      - dict: The course catalog information for the course
+    """
+
+    return await self.__get_course_catalog_information(course_name)
+
+
+  @metrics_handler.instrument_database
+  async def get_course_track_information(self,
+                                         course_name: str) -> dict:
+    """
+    Get the course track information.
+
+    Args:
+      - course_name (str): The name of the course
+
+    Returns:
+      - dict: The course track information for the course
+    """
+
+    return await self.__get_course_track_information(course_name)
+
+
+  @metrics_handler.instrument_database
+  async def get_course_bundle(self,
+                              course_name: str) -> CourseBundle:
+    """
+    Get the course catalog and track information of a course, both read concurrently on a cache miss.
+
+    Args:
+      - course_name (str): The name of the course
+
+    Returns:
+      - CourseBundle: The course catalog and track information for the course, empty if the course is unknown
+    """
+
+    course_catalog, all_tracks_course_information = await asyncio.gather(
+      self.__get_course_catalog_information(course_name),
+      self.__get_course_track_information(course_name),
+    )
+    return CourseBundle(
+      course_catalog=course_catalog,
+      all_tracks_course_information=all_tracks_course_information,
+    )
+
+
+  @metrics_handler.instrument_database
+  async def get_course_descriptions(self,
+                                    course_name: str) -> dict:
+    """
+    Get the description of every course of a catalog, the lookup table of the lazy hover descriptions.
+
+    Args:
+      - course_name (str): The name of the course
+
+    Returns:
+      - dict: The {course: description} mapping over all tracks of the course
+    """
+
+    if course_name not in (await self.__get_snapshot()).courses_catalog_collection:
+      return {}
+
+    async def build() -> dict:
+      course_descriptions = {}
+      for track_information in (await self.__get_course_track_information(course_name)).values():
+        for course, course_information in track_information.items():
+          course_descriptions.setdefault(course, course_information.get("course_description", ""))
+      return course_descriptions
+
+    return await self.__get_or_set(
+      key=("course_descriptions", course_name),
+      factory=build,
+    )
+
+
+  async def get_track_information(self,
+                                  course_name: str,
+                                  track: str) -> dict:
+    """
+    Get the prepared information of a single track.
+
+    Args:
+      - course_name (str): The name of the course
+      - track (str): The track, e.g. track_1
+
+    Returns:
+      - dict: The prepared course information of the track, None if the course or track does not exist
+    """
+
+    return (await self.get_course_track_information(course_name=course_name)).get(track)
+
+
+  async def get_course_information(self,
+                                   course_name: str,
+                                   track: str,
+                                   course: str) -> dict:
+    """
+    Get the prepared information of a single course of a track.
+
+    Args:
+      - course_name (str): The name of the course
+      - track (str): The track, e.g. track_1
+      - course (str): The course code
+
+    Returns:
+      - dict: The prepared information of the course, None if the course, track or course code does not exist
+    """
+
+    return ((await self.get_track_information(course_name=course_name, track=track)) or {}).get(course)
+
+
+  async def get_catalog_version(self,
+                                course_name: str) -> int:
+    """
+    Get the last seen version of a catalog.
+
+    Args:
+      - course_name (str): The name of the course
+
+    Returns:
+      - int: The version, 0 if the catalog was never published through bump_catalog_version
+    """
+
+    return (await self.__get_snapshot()).catalog_versions.get(course_name, 0)
+
+
+  async def refresh_catalog_versions(self,
+                                     force: bool = False) -> list:
+    """
+    Poll the catalog versions, at most once per version_poll_interval_s unless forced.
+    On a change a new snapshot is built and swapped in, then the cached data of every changed, added or removed catalog is dropped.
+    A poll is skipped while another one is running.
+
+    Args:
+      - force (bool): Poll even if the last poll is recent.
+
+    Returns:
+      - list: The names of the changed catalogs, empty if nothing changed or the poll was skipped
+    """
+
+    if not force and monotonic() - self.__last_version_poll < self.version_poll_interval:
+      return []
+    current_snapshot = await self.__get_snapshot()
+    if self.__refreshing:
+      return []
+
+    self.__refreshing = True
+    try:
+      self.__last_version_poll = monotonic()
+      catalog_versions = await self.__fetch_catalog_versions()
+      changed_catalogs = sorted(
+        course_name
+        for course_name in set(catalog_versions) | set(current_snapshot.catalog_versions)
+        if catalog_versions.get(course_name) != current_snapshot.catalog_versions.get(course_name)
+      )
+      if not changed_catalogs:
+        return []
+
+      self.__snapshot = await self.__setup_meta_data()
+      for course_name in changed_catalogs:
+        self.cache.invalidate_course(course_name)
+      self.cache.invalidate_course(None)
+      return changed_catalogs
+    finally:
+      self.__refreshing = False
@@ -0,0 +1,186 @@
+import os
+from weakref import WeakMethod
+from threading import Lock, RLock
+from collections import OrderedDict
+
+
+def register_at_fork_weakly(method) -> None:
+  """
+  Call a bound method in the child process after a fork, as long as its object is alive.
+  os.register_at_fork keeps its callbacks forever, registering the method itself would keep a short-lived object,
+  e.g. the DatabaseHandler of a script, and its cached data alive.
+
+  Args:
+    - method (callable): The bound method.
+
+  Returns:
+    - None
+  """
+
+  reference = WeakMethod(method)
+
+  def after_in_child() -> None:
+    method = reference()
+    if method is not None:
+      method()
+
+  os.register_at_fork(after_in_child=after_in_child)
+
+
+class CacheHandler:
+  """
+  A thread-safe least recently used cache for the prepared course data.
+  """
+
+
+  def __init__(self,
+               max_entries: int = 256) -> None:
+    """
+    Initialize the CacheHandler class.
+
+    Args:
+      - max_entries (int): The maximum number of entries kept before the least recently used one is evicted.
+
+    Returns:
+      - None
+    """
+
+    self.max_entries = max_entries
+    self.hits = 0
+    self.misses = 0
+    self.__entries = OrderedDict()
+    self.__lock = RLock()
+    self.__key_locks = {}
+    register_at_fork_weakly(self.__after_fork)
+
+
+  def __after_fork(self) -> None:
+    """
+    Replace the locks in a forked process, e.g. a preloaded gunicorn worker, as another thread may have held them during the fork.
+
+    Args:
+      - None
+
+    Returns:
+      - None
+    """
+
+    self.__lock = RLock()
+    self.__key_locks = {}
+
+
+  def get(self,
+          key: tuple,
+          default=None):
+    """
+    Get a cached value.
+
+    Args:
+      - key (tuple): The cache key, conventionally (namespace, course_name, ...).
+      - default: The value returned when the key is not cached.
+
+    Returns:
+      - The cached value or the default.
+    """
+
+    with self.__lock:
+      if key in self.__entries:
+        self.hits += 1
+        self.__entries.move_to_end(key)
+        return self.__entries[key]
+
+      self.misses += 1
+      return default
+
+
+  def set(self,
+          key: tuple,
+          value) -> None:
+    """
+    Cache a value, evicting the least recently used entry if the cache is full.
+
+    Args:
+      - key (tuple): The cache key, conventionally (namespace, course_name, ...).
+      - value: The value to be cached.
+
+    Returns:
+      - None
+    """
+
+    with self.__lock:
+      self.__entries[key] = value
+      self.__entries.move_to_end(key)
+      while len(self.__entries) > self.max_entries:
+        self.__entries.popitem(last=False)
+
+
+  def get_or_set(self,
+                 key: tuple,
+                 factory):
+    """
+    Get a cached value, computing and caching it with the factory on a miss.
+    Concurrent misses on the same key run the factory once, the other callers wait for its value.
+
+    Args:
+      - key (tuple): The cache key, conventionally (namespace, course_name, ...).
+      - factory (callable): A callable without arguments producing the value.
+
+    Returns:
+      - The cached or freshly computed value.
+    """
+
+    sentinel = object()
+    value = self.get(key, sentinel)
+    if value is not sentinel:
+      return value
+
+    with self.__lock:
+      key_lock = self.__key_locks.setdefault(key, Lock())
+    try:
+      with key_lock:
+        with self.__lock:
+          value = self.__entries.get(key, sentinel)
+        if value is sentinel:
+          value = factory()
+          self.set(key, value)
+      return value
+    finally:
+      with self.__lock:
+        if self.__key_locks.get(key) is key_lock:
+          del self.__key_locks[key]
+
+
+  def __len__(self) -> int:
+    return len(self.__entries)
+
+
+  def invalidate_course(self,
+                        course_name: str) -> None:
+    """
+    Drop every cached entry belonging to a course catalog.
+
+    Args:
+      - course_name (str): The name of the course.
+
+    Returns:
+      - None
+    """
+
+    with self.__lock:
+      for key in [key for key in self.__entries if len(key) > 1 and key[1] == course_name]:
+        del self.__entries[key]
+
+
+  def clear(self) -> None:
+    """
+    Drop every cached entry.
+
+    Args:
+      - None
+
+    Returns:
+      - None
+    """
+
+    with self.__lock:
+      self.__entries.clear()
@@ -0,0 +1,56 @@
+from functools import lru_cache
+
+
+@lru_cache(maxsize=8192)
+def add_intermediate_br_tags(description: str,
+                             max_chars: int = 50) -> str:
+  """
+  Insert <br> tags into the description string after every max_chars characters
+  without breaking words. The result is memoized, as every track of a catalog renders the same descriptions.
+
+  Args:
+    - description (str): The original description string.
+    - max_chars (int): Maximum number of characters before inserting a <br> tag (default is 50).
+
+  Returns:
+    - str: The modified description with <br> tags inserted.
+  """
+
+  words = description.split()
+  lines = []
+  current_line = ""
+
+  for word in words:
+    if len(current_line) + len(word) <= max_chars:
+      current_line += word + " "
+    else:
+      lines.append(current_line.strip())
+      current_line = word + " "
+
+  if current_line:
+    lines.append(current_line.strip())
+
+  return "<br>".join(lines)
+
+
+def dynamic_color_choice_for_semester(courses_in_year: dict,
+                                      color: str = None) -> dict:
+  """
+  Assign colors to courses based on their semester.
+
+  Args:
+    - courses_in_year (dict): The courses in a year.
+    - color (str): The color of every semester, a color per semester on the hue circle if None.
+
+  Returns:
+    - dict: The {year: {semester: color}} dictionary.
+  """
+
+  semester_colors = {}
+  cnt = 0
+  for year in courses_in_year:
+    semester_colors[year] = {}
+    for semester in courses_in_year[year]:
+      semester_colors[year][semester] = color or f"hsl({cnt * (360 // (len(courses_in_year) * len(courses_in_year[year])))}, 70%, 50%)"
+      cnt += 1
+  return semester_colors
@@ -0,0 +1,404 @@
+from sys import intern
+from array import array
+from operator import attrgetter
+from collections.abc import Mapping, Sequence
+
+
+RELATIONS = ("prerequisite", "corequisite")
+RELATION_IDS = {relation: relation_id for relation_id, relation in enumerate(RELATIONS)}
+COURSE_TABLE_FIELDS = ("course_name", "course_description", "course_link", "prerequisites", "corequisites", "display_name", "hover_text")
+
+
+def split_course_table(all_tracks_information: dict) -> tuple:
+  """
+  Split the prepared track information into a catalog-level course table and per-track placements,
+  so the fields a course has in every track are stored once.
+
+  Args:
+    - all_tracks_information (dict): The prepared track information, {track: {course: course information}}.
+
+  Returns:
+    - tuple: (course_table, all_tracks_placements). The course table holds the COURSE_TABLE_FIELDS of each course as first seen,
+      a placement holds the other fields of the course in the track (year, semester, dependency counts, complete path...)
+      along with the table fields differing from the table.
+  """
+
+  course_table, all_tracks_placements = {}, {}
+  for track, track_information in all_tracks_information.items():
+    all_tracks_placements[track] = {}
+    for course, course_information in track_information.items():
+      shared = {key: course_information[key] for key in COURSE_TABLE_FIELDS if key in course_information}
+      course_table.setdefault(course, shared)
+      all_tracks_placements[track][course] = {
+        key: value
+        for key, value in course_information.items()
+        if key not in shared or course_table[course].get(key) != value
+      }
+  return course_table, all_tracks_placements
+
+
+def join_course_table(course_table: dict,
+                      all_tracks_placements: dict) -> dict:
+  """
+  Join a course table and per-track placements back into the prepared track information.
+  The table entries are shared, not copied, between the tracks.
+
+  Args:
+    - course_table (dict): The {course: table fields} course table, empty for data stored before the split.
+    - all_tracks_placements (dict): The {track: {course: placement}} placements.
+
+  Returns:
+    - dict: The prepared track information, {track: {course: course information}}.
+  """
+
+  return {
+    track: {
+      course: {**course_table.get(course, {}), **placement}
+      for course, placement in track_placements.items()
+    }
+    for track, track_placements in all_tracks_placements.items()
+  }
+
+
+class PathEdge(Mapping):
+  """
+  A read-only {"source", "destination", "relation"} edge of a complete path, the relation being stored as its index in RELATIONS.
+  """
+
+  KEYS = ("source", "destination", "relation")
+  __slots__ = ("source", "destination", "relation_id")
+
+
+  def __init__(self,
+               source: str,
+               destination: str,
+               relation_id: int) -> None:
+    """
+    Initialize the PathEdge class.
+
+    Args:
+      - source (str): The interned source course code.
+      - destination (str): The interned destination course code.
+      - relation_id (int): The index of the relation in RELATIONS.
+
+    Returns:
+      - None
+    """
+
+    self.source = source
+    self.destination = destination
+    self.relation_id = relation_id
+
+
+  def __getitem__(self,
+                  key: str):
+    if key == "source":
+      return self.source
+    if key == "destination":
+      return self.destination
+    if key == "relation":
+      return RELATIONS[self.relation_id]
+    raise KeyError(key)
+
+
+  def __iter__(self):
+    return iter(self.KEYS)
+
+
+  def __len__(self) -> int:
+    return len(self.KEYS)
+
+
+  def __repr__(self) -> str:
+    return repr(dict(self))
+
+
+class CompletePath(Sequence):
+  """
+  A read-only complete path stored as a flat array of (source id, destination id, relation id) triples,
+  the ids indexing the course codes table shared by every path of a catalog. Its items are PathEdge.
+  """
+
+  __slots__ = ("codes", "edges")
+
+
+  def __init__(self,
+               codes: list,
+               edges: array) -> None:
+    """
+    Initialize the CompletePath class.
+
+    Args:
+      - codes (list): The course codes table of the catalog.
+      - edges (array): The flat array of (source id, destination id, relation id) triples.
+
+    Returns:
+      - None
+    """
+
+    self.codes = codes
+    self.edges = edges
+
+
+  def __getitem__(self,
+                  index):
+    if isinstance(index, slice):
+      return [self[i] for i in range(*index.indices(len(self)))]
+
+    if index < 0:
+      index += len(self)
+    if not 0 <= index < len(self):
+      raise IndexError("path index out of range")
+    source_id, destination_id, relation_id = self.edges[3 * index:3 * index + 3]
+    return PathEdge(self.codes[source_id], self.codes[destination_id], relation_id)
+
+
+  def __len__(self) -> int:
+    return len(self.edges) // 3
+
+
+  def __eq__(self,
+             other) -> bool:
+    if not isinstance(other, Sequence) or isinstance(other, str):
+      return NotImplemented
+    return list(self) == list(other)
+
+
+  def __repr__(self) -> str:
+    return repr(list(self))
+
+
+class CourseRecord(Mapping):
+  """
+  A read-only course of the prepared track information, the usual fields being stored in slots instead of a per-course dictionary.
+  Unusual fields are kept in an extra dictionary.
+  """
+
+  FIELDS = {
+    "course_name": "course_name",
+    "course_description": "course_description",
+    "course_link": "course_link",
+    "prerequisites": "prerequisites",
+    "corequisites": "corequisites",
+    "track": "track",
+    "year": "year",
+    "semester": "semester",
+    "complete path": "complete_path",
+    "dependency_count": "dependency_count",
+    "on_dependant_courses_count": "on_dependant_courses_count",
+    "color": "color",
+    "display_name": "display_name",
+    "hover_text": "hover_text",
+  }
+  GETTERS = {key: attrgetter(attribute) for key, attribute in FIELDS.items()}
+  __slots__ = tuple(FIELDS.values()) + ("extra", "length")
+
+
+  def __init__(self,
+               course_information: dict) -> None:
+    """
+    Initialize the CourseRecord class.
+
+    Args:
+      - course_information (dict): The prepared information of the course, already compacted.
+
+    Returns:
+      - None
+    """
+
+    self.extra = None
+    for key, value in course_information.items():
+      if key in self.FIELDS:
+        setattr(self, self.FIELDS[key], value)
+      else:
+        if self.extra is None:
+          self.extra = {}
+        self.extra[key] = value
+    self.length = len(course_information)
+
+
+  def __getitem__(self,
+                  key: str):
+    getter = self.GETTERS.get(key)
+    if getter is not None:
+      try:
+        return getter(self)
+      except AttributeError:
+        raise KeyError(key) from None
+    if self.extra is not None and key in self.extra:
+      return self.extra[key]
+    raise KeyError(key)
+
+
+  def __iter__(self):
+    for key, attribute in self.FIELDS.items():
+      if hasattr(self, attribute):
+        yield key
+    if self.extra is not None:
+      yield from self.extra
+
+
+  def __len__(self) -> int:
+    return self.length
+
+
+  def __repr__(self) -> str:
+    return repr(dict(self))
+
+
+class CourseRecordCompactor:
+  """
+  The CourseRecordCompactor class converts the documents of a catalog read from MongoDB to a compact, read-only representation:
+  course codes and repeated field values are interned, courses become CourseRecord and complete paths become CompletePath.
+  """
+
+
+  def __init__(self) -> None:
+    """
+    Initialize the CourseRecordCompactor class, with an empty course codes table.
+
+    Args:
+      - None
+
+    Returns:
+      - None
+    """
+
+    self.codes = []
+    self.__code_ids = {}
+
+
+  def __code_id(self,
+                code: str) -> int:
+    """
+    Get the id of a course code, adding it to the codes table if it is new.
+
+    Args:
+      - code (str): The course code.
+
+    Returns:
+      - int: The index of the code in the codes table.
+    """
+
+    code_id = self.__code_ids.get(code)
+    if code_id is None:
+      code_id = self.__code_ids[code] = len(self.codes)
+      self.codes.append(intern(code))
+    return code_id
+
+
+  def __intern(self,
+               value):
+    """
+    Intern the strings of a value, recursing into lists and dictionaries without changing their types.
+
+    Args:
+      - value: A value of a document.
+
+    Returns:
+      - The value with interned strings.
+    """
+
+    if isinstance(value, str):
+      return intern(value)
+    if isinstance(value, list):
+      return [self.__intern(item) for item in value]
+    if isinstance(value, dict):
+      return {intern(key): self.__intern(item) for key, item in value.items()}
+    return value
+
+
+  def __complete_path(self,
+                      complete_path: list) -> CompletePath:
+    """
+    Encode a complete path.
+
+    Args:
+      - complete_path (list): The list of {"source", "destination", "relation"} edges.
+
+    Returns:
+      - CompletePath: The encoded path.
+    """
+
+    edges = array("I")
+    for edge in complete_path:
+      edges.extend((
+        self.__code_id(edge["source"]),
+        self.__code_id(edge["destination"]),
+        RELATION_IDS[edge["relation"]],
+      ))
+    return CompletePath(self.codes, edges)
+
+
+  def compact_catalog(self,
+                      course_catalog: dict) -> dict:
+    """
+    Intern the course codes of the catalog documents.
+
+    Args:
+      - course_catalog (dict): The catalog documents keyed by track.
+
+    Returns:
+      - dict: The catalog documents with interned strings.
+    """
+
+    return self.__intern(course_catalog)
+
+
+  def __compact_course_information(self,
+                                   course_information: dict) -> dict:
+    """
+    Intern the fields of a course and encode its complete path.
+    A complete path with an unknown relation is left as it is.
+
+    Args:
+      - course_information (dict): The information of the course, or a part of it.
+
+    Returns:
+      - dict: The compacted fields.
+    """
+
+    course_information = {
+      intern(key): self.__intern(value) if key != "complete path" else value
+      for key, value in course_information.items()
+    }
+    complete_path = course_information.get("complete path")
+    if isinstance(complete_path, list) and all(edge.get("relation") in RELATION_IDS for edge in complete_path):
+      course_information["complete path"] = self.__complete_path(complete_path)
+    elif complete_path is not None:
+      course_information["complete path"] = self.__intern(complete_path)
+    return course_information
+
+
+  def compact_track_information(self,
+                                all_tracks_information: dict,
+                                course_table: dict = None) -> dict:
+    """
+    Convert the track documents to course records, joining them with the course table of the catalog.
+    Each table entry is compacted once, its values are shared by the records of every track.
+
+    Args:
+      - all_tracks_information (dict): The track documents keyed by track, each a {course: course information or placement} dictionary.
+      - course_table (dict): The {course: table fields} course table, see split_course_table. None for data stored before the split.
+
+    Returns:
+      - dict: The {track: {course: CourseRecord}} dictionary.
+    """
+
+    course_table = course_table or {}
+    compacted_table = {}
+    compacted = {}
+    for track, track_information in all_tracks_information.items():
+      compacted[track] = {}
+      for course, course_information in track_information.items():
+        if not isinstance(course_information, dict):
+          compacted[track][intern(course)] = self.__intern(course_information)
+          continue
+
+        if course in course_table and course not in compacted_table:
+          compacted_table[course] = self.__compact_course_information(course_table[course])
+        compacted[track][self.codes[self.__code_id(course)]] = CourseRecord({
+          **compacted_table.get(course, {}),
+          **self.__compact_course_information(course_information),
+        })
+    return compacted
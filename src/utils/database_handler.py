@@ -1,44 +1,306 @@
-import pymongo
-from consts import MondoDBConsts
+from threading import Lock
+from contextvars import copy_context
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple, TYPE_CHECKING
+from types import MappingProxyType
+from time import monotonic
+from datetime import datetime, timezone
+from src.utils.cache_handler import CacheHandler, register_at_fork_weakly
+from src.utils.course_records import CourseRecordCompactor, split_course_table, join_course_table
+from consts import MondoDBConsts, CacheConsts
+from src.utils.trace_handler import trace_handler
+from src.utils.metrics_handler import metrics_handler
+
+if TYPE_CHECKING:
+  import pymongo
+
+STAGING_SUFFIX = "__staging"
+
+
+class CatalogSnapshot(NamedTuple):
+  """
+  An immutable view of the catalogs, built off to the side on refresh and published with a single reference swap.
+  """
+
+  courses_catalog_collection: tuple
+  tracks_count_per_course: MappingProxyType
+  catalog_versions: MappingProxyType
+
+
+class CourseBundle(NamedTuple):
+  """
+  The catalog and the prepared track information of a course, fetched together.
+  """
+
+  course_catalog: dict
+  all_tracks_course_information: dict
 
 
 class DatabaseHandler:
-  def __init__(self) -> None:
-    mongo_db_consts = MondoDBConsts().get_constants()
-    pymongo_client = pymongo.MongoClient(
-      host=mongo_db_consts["host"],
+  def __init__(self,
+               pymongo_client: "pymongo.MongoClient" = None) -> None:
+    """
+    Initialize the DatabaseHandler class. Nothing is sent to MongoDB until the handler is first used,
+    so the app boots even if the cluster is briefly unreachable.
+    
+    Args:
+      - pymongo_client (pymongo.MongoClient): An already connected client, e.g. an in-process stand-in. Connects to the configured cluster on first use if None.
+    
+    Returns:
+      - None
+    """
+
+    cache_consts = CacheConsts().get_constants()
+    self.pymongo_client = pymongo_client
+    self.version_poll_interval = cache_consts["version_poll_interval_s"]
+    self.fetch_max_workers = cache_consts["fetch_max_workers"]
+    self.compact_records = cache_consts["compact_records"]
+    self.__fetch_executor = ThreadPoolExecutor(
+      max_workers=self.fetch_max_workers,
+      thread_name_prefix="fetch",
+    )
+    self.cache = CacheHandler(
+      max_entries=cache_consts["max_entries"],
     )
-    self.courses_catalog_db = pymongo_client["courses_catalog"]
-    self.courses_track_db = pymongo_client["courses_track_information"]
-    self.__setup_meta_data()
+    self.__dependent_caches = []
+    metrics_handler.register_collector(self.__collect_metrics)
+    self.__snapshot = None
+    self.__last_version_poll = monotonic()
+    self.__refresh_lock = Lock()
+    self.__connect_lock = Lock()
+    register_at_fork_weakly(self.__after_fork)
+
+
+  def __collect_metrics(self) -> list:
+    """
+    Collect the course data cache statistics on a metrics scrape.
+
+    Args:
+      - None
+
+    Returns:
+      - list: The (name, labels, value) samples.
+    """
+
+    return [
+      ("cache_hits_total", {}, self.cache.hits),
+      ("cache_misses_total", {}, self.cache.misses),
+      ("cache_entries", {}, len(self.cache)),
+    ]
+
+
+  def __after_fork(self) -> None:
+    """
+    Replace the fetch pool and the locks in a forked process, e.g. a preloaded gunicorn worker.
+    The threads of the pool are not copied by the fork, so tasks submitted to the inherited pool would never run.
+
+    Args:
+      - None
+
+    Returns:
+      - None
+    """
+
+    self.__fetch_executor = ThreadPoolExecutor(
+      max_workers=self.fetch_max_workers,
+      thread_name_prefix="fetch",
+    )
+    self.__refresh_lock = Lock()
+    self.__connect_lock = Lock()
   
 
-  def __setup_meta_data(self) -> None:
+  def __connect(self) -> None:
+    """
+    Open the MongoDB client and load the first snapshot of the catalogs, unless already done.
+    A failed attempt is retried on the next use.
+    
+    Args:
+      - None
+    
+    Returns:
+      - None
+    """
+
+    with self.__connect_lock:
+      if self.__snapshot is not None:
+        return
+
+      if self.pymongo_client is None:
+        import pymongo
+        from src.utils.mongo_command_listener import MongoCommandListener
+
+        mongo_db_consts = MondoDBConsts().get_constants()
+        self.pymongo_client = pymongo.MongoClient(
+          host=mongo_db_consts["host"],
+          event_listeners=[MongoCommandListener(metrics_handler)],
+        )
+      self.courses_catalog_db = self.pymongo_client["courses_catalog"]
+      self.courses_track_db = self.pymongo_client["courses_track_information"]
+      self.courses_table_db = self.pymongo_client["courses_table"]
+      self.catalog_versions_collection = self.pymongo_client["courses_metadata"]["catalog_versions"]
+      self.__snapshot = self.__setup_meta_data()
+      self.__last_version_poll = monotonic()
+
+
+  def __get_snapshot(self) -> CatalogSnapshot:
     """
-    Set up the meta data for the database.
+    Get the current snapshot of the catalogs, connecting on first use.
     
     Args:
       - None
     
     Returns:
+      - CatalogSnapshot: The current snapshot.
+    """
+
+    snapshot = self.__snapshot
+    if snapshot is None:
+      self.__connect()
+      snapshot = self.__snapshot
+    return snapshot
+
+
+  def __setup_meta_data(self) -> CatalogSnapshot:
+    """
+    Set up the meta data for the database. Only the catalogs present in both databases are listed,
+    a catalog being published shows up once both of its collections exist. The staging collections of publish_course are skipped.
+    
+    Args:
       - None
+    
+    Returns:
+      - CatalogSnapshot: The catalogs, their tracks count and their versions.
     """
     
-    courses_catalog_collection = self.courses_catalog_db.list_collection_names()
-    courses_track_information_collection = self.courses_track_db.list_collection_names()
-    courses_catalog_collection.sort()
-    courses_track_information_collection.sort()
+    catalog_versions = self.__fetch_catalog_versions()
+    courses_catalog_collection = set(self.courses_catalog_db.list_collection_names())
+    courses_track_information_collection = set(self.courses_track_db.list_collection_names())
+    courses_catalog_collection = sorted(
+      course_name
+      for course_name in courses_catalog_collection & courses_track_information_collection
+      if not course_name.endswith(STAGING_SUFFIX)
+    )
 
-    if courses_catalog_collection == courses_track_information_collection:
-      self.dict_track_count_per_course = {}
+    dict_track_count_per_course = {}
+    for course_name in courses_catalog_collection:
+      dict_track_count_per_course[course_name] = self.courses_track_db[course_name].count_documents({})
 
-      self.courses_catalog_cnt = len(courses_catalog_collection)
-      self.courses_catalog_collection = courses_catalog_collection
+    return CatalogSnapshot(
+      courses_catalog_collection=tuple(courses_catalog_collection),
+      tracks_count_per_course=MappingProxyType(dict_track_count_per_course),
+      catalog_versions=MappingProxyType(catalog_versions),
+    )
 
-      for course_name in courses_catalog_collection:
-        self.dict_track_count_per_course[course_name] = self.courses_track_db[course_name].count_documents({})
 
+  def __fetch_catalog_versions(self) -> dict:
+    """
+    Fetch the version of every catalog from the metadata collection.
 
+    Args:
+      - None
+    
+    Returns:
+      - dict: The {course_name: version} mapping, catalogs never published through bump_catalog_version are missing.
+    """
+
+    return {
+      document["_id"]: document["version"]
+      for document in self.catalog_versions_collection.find({}, projection={"version": True})
+    }
+
+
+  def __fetch_tracks(self,
+                     collection: "pymongo.collection.Collection") -> dict:
+    """
+    Fetch every track document of a collection keyed by its track id.
+
+    Args:
+      - collection (pymongo.collection.Collection): The collection of the course
+    
+    Returns:
+      - dict: The track documents keyed as track_1, track_2, ...
+    """
+
+    all_tracks = {}
+    with trace_handler.span("mongo.find", collection=collection.full_name):
+      for idx, track in enumerate(collection.find(projection={"_id": False}), start=1):
+        all_tracks[f"track_{idx}"] = track
+    
+    return all_tracks
+
+
+  def __fetch_course_table(self,
+                           collection: "pymongo.collection.Collection") -> dict:
+    """
+    Fetch the course table of a catalog, one document per course.
+
+    Args:
+      - collection (pymongo.collection.Collection): The course table collection of the course
+
+    Returns:
+      - dict: The {course: table fields} course table, empty for catalogs published before the course table.
+    """
+
+    with trace_handler.span("mongo.find", collection=collection.full_name):
+      return {
+        document.pop("_id"): document
+        for document in collection.find()
+      }
+
+
+  def __fetch_track_information(self,
+                                course_name: str) -> dict:
+    """
+    Fetch the track placements and the course table of a catalog and join them into the prepared track information,
+    compacted unless disabled.
+
+    Args:
+      - course_name (str): The name of the course
+
+    Returns:
+      - dict: The course track information for the course
+    """
+
+    all_tracks_placements = self.__fetch_tracks(self.courses_track_db[course_name])
+    course_table = self.__fetch_course_table(self.courses_table_db[course_name])
+    if self.compact_records:
+      return CourseRecordCompactor().compact_track_information(all_tracks_placements, course_table=course_table)
+    return join_course_table(course_table, all_tracks_placements)
+
+
+  def __fetch_course_catalog(self,
+                             course_name: str) -> dict:
+    """
+    Fetch the catalog documents of a course, their strings interned unless the compaction is disabled.
+
+    Args:
+      - course_name (str): The name of the course
+
+    Returns:
+      - dict: The course catalog information for the course
+    """
+
+    course_catalog = self.__fetch_tracks(self.courses_catalog_db[course_name])
+    if self.compact_records:
+      return CourseRecordCompactor().compact_catalog(course_catalog)
+    return course_catalog
+
+
+  def get_catalog_snapshot(self) -> CatalogSnapshot:
+    """
+    Get the current snapshot of the catalogs, for readers needing the catalog list, track counts and versions to agree.
+    
+    Args:
+      - None
+    
+    Returns:
+      - CatalogSnapshot: The snapshot, never mutated, a refresh publishes a new one.
+    """
+
+    return self.__get_snapshot()
+
+
+  @metrics_handler.instrument_database
   def get_tracks_count_per_course(self) -> dict:
     """
     Get the tracks count per course.
@@ -47,13 +309,14 @@ class DatabaseHandler:
       - None
     
     Returns:
-      - dict: The dictionary of tracks count per course.
+      - dict: The read-only dictionary of tracks count per course.
     """
     
-    return self.dict_track_count_per_course
+    return self.__get_snapshot().tracks_count_per_course
   
 
-  def get_courses_catalog(self) -> list:
+  @metrics_handler.instrument_database
+  def get_courses_catalog(self) -> tuple:
     """
     Get the courses catalog.
     
@@ -61,16 +324,17 @@ class DatabaseHandler:
       - None
     
     Returns:
-      - list: The list of courses catalog.
+      - tuple: The sorted names of the courses catalog.
     """
     
-    return self.courses_catalog_collection
+    return self.__get_snapshot().courses_catalog_collection
   
 
-  def get_course_catalog_information(self,
-                                     course_name: str) -> dict:
+  def __get_course_catalog_information(self,
+                                       course_name: str) -> dict:
     """
-    Get the course catalog information.
+    Get the course catalog information from the cache, fetching it on a miss. Not instrumented,
+    so the public methods built on it record their latency once.
     
     Args:
       - course_name (str): The name of the course
@@ -79,17 +343,54 @@ class DatabaseHandler:
       - dict: The course catalog information for the course
     """
 
-    if course_name not in self.courses_catalog_collection:
+    if course_name not in self.__get_snapshot().courses_catalog_collection:
       return {}
     
-    course_catalog = {}
-    for idx, course in enumerate(self.courses_catalog_db[course_name].find(), start=1):
-      del course["_id"]
-      course_catalog[f"track_{idx}"] = course
+    return self.cache.get_or_set(
+      key=("course_catalog", course_name),
+      factory=lambda: self.__fetch_course_catalog(course_name),
+    )
 
-    return course_catalog
+
+  def __get_course_track_information(self,
+                                     course_name: str) -> dict:
+    """
+    Get the course track information from the cache, fetching it on a miss. Not instrumented,
+    so the public methods built on it record their latency once.
+
+    Args:
+      - course_name (str): The name of the course
+    
+    Returns:
+      - dict: The course track information for the course
+    """
+
+    if course_name not in self.__get_snapshot().courses_catalog_collection:
+      return {}
+    
+    return self.cache.get_or_set(
+      key=("course_track", course_name),
+      factory=lambda: self.__fetch_track_information(course_name),
+    )
+
+
+  @metrics_handler.instrument_database
+  def get_course_catalog_information(self,
+                                     course_name: str) -> dict:
+    """
+    Get the course catalog information.
+    
+    Args:
+      - course_name (str): The name of the course
+    
+    Returns:
+      - dict: The course catalog information for the course
+    """
+
+    return self.__get_course_catalog_information(course_name)
   
 
+  @metrics_handler.instrument_database
   def get_course_track_information(self,
                                    course_name: str) -> dict:
     """
@@ -102,12 +403,233 @@ class DatabaseHandler:
       - dict: The course track information for the course
     """
 
-    if course_name not in self.courses_catalog_collection:
+    return self.__get_course_track_information(course_name)
+
+
+  @metrics_handler.instrument_database
+  def get_course_bundle(self,
+                        course_name: str) -> CourseBundle:
+    """
+    Get the course catalog and track information of a course, the two databases being read concurrently on a cache miss,
+    so the latency is one round trip instead of two.
+
+    Args:
+      - course_name (str): The name of the course
+    
+    Returns:
+      - CourseBundle: The course catalog and track information for the course, empty if the course is unknown
+    """
+
+    if course_name not in self.__get_snapshot().courses_catalog_collection:
+      return CourseBundle(course_catalog={}, all_tracks_course_information={})
+
+    course_catalog = self.__fetch_executor.submit(
+      copy_context().run, self.__get_course_catalog_information, course_name
+    )
+    all_tracks_course_information = self.__get_course_track_information(course_name)
+    return CourseBundle(
+      course_catalog=course_catalog.result(),
+      all_tracks_course_information=all_tracks_course_information,
+    )
+
+
+  @metrics_handler.instrument_database
+  def get_course_descriptions(self,
+                              course_name: str) -> dict:
+    """
+    Get the description of every course of a catalog, the lookup table of the lazy hover descriptions.
+
+    Args:
+      - course_name (str): The name of the course
+    
+    Returns:
+      - dict: The {course: description} mapping over all tracks of the course
+    """
+
+    if course_name not in self.__get_snapshot().courses_catalog_collection:
       return {}
+
+    def build() -> dict:
+      course_descriptions = {}
+      for track_information in self.__get_course_track_information(course_name).values():
+        for course, course_information in track_information.items():
+          course_descriptions.setdefault(course, course_information.get("course_description", ""))
+      return course_descriptions
+
+    return self.cache.get_or_set(
+      key=("course_descriptions", course_name),
+      factory=build,
+    )
+
+
+  def get_catalog_version(self,
+                          course_name: str) -> int:
+    """
+    Get the last seen version of a catalog.
+
+    Args:
+      - course_name (str): The name of the course
     
-    all_tracks_in_course_information = {}
-    for idx, track in enumerate(self.courses_track_db[course_name].find(), start=1):
-      del track["_id"]
-      all_tracks_in_course_information[f"track_{idx}"] = track
+    Returns:
+      - int: The version, 0 if the catalog was never published through bump_catalog_version
+    """
+
+    return self.__get_snapshot().catalog_versions.get(course_name, 0)
+
+
+  def get_catalog_versions(self) -> dict:
+    """
+    Get the last seen version of every catalog.
+
+    Args:
+      - None
+    
+    Returns:
+      - dict: The {course_name: version} mapping
+    """
+
+    return dict(self.__get_snapshot().catalog_versions)
+
+
+  def register_cache(self,
+                     cache: CacheHandler) -> None:
+    """
+    Register a cache holding data derived from the catalogs outside of the course data cache, e.g. the API responses,
+    so its entries are dropped along with the course data when a catalog changes.
+
+    Args:
+      - cache (CacheHandler): The cache, keyed as (namespace, course_name, ...).
+
+    Returns:
+      - None
+    """
+
+    self.__dependent_caches.append(cache)
+
+
+  def refresh_catalog_versions(self,
+                               force: bool = False) -> list:
+    """
+    Poll the catalog versions, at most once per version_poll_interval_s unless forced.
+    On a change a new snapshot of the catalog list, track counts and versions is built and swapped in,
+    then the cached data of every changed, added or removed catalog is dropped. Readers are never blocked,
+    and a poll is skipped while another thread is refreshing.
+
+    Args:
+      - force (bool): Poll even if the last poll is recent.
+    
+    Returns:
+      - list: The names of the changed catalogs, empty if nothing changed or the poll was skipped
+    """
+
+    if not force and monotonic() - self.__last_version_poll < self.version_poll_interval:
+      return []
+    if not self.__refresh_lock.acquire(blocking=False):
+      return []
+
+    try:
+      self.__last_version_poll = monotonic()
+      current_snapshot = self.__get_snapshot()
+      catalog_versions = self.__fetch_catalog_versions()
+      changed_catalogs = sorted(
+        course_name
+        for course_name in set(catalog_versions) | set(current_snapshot.catalog_versions)
+        if catalog_versions.get(course_name) != current_snapshot.catalog_versions.get(course_name)
+      )
+      if not changed_catalogs:
+        return []
+
+      self.__snapshot = self.__setup_meta_data()
+      for cache in [self.cache] + self.__dependent_caches:
+        for course_name in changed_catalogs:
+          cache.invalidate_course(course_name)
+        cache.invalidate_course(None)
+      return changed_catalogs
+    finally:
+      self.__refresh_lock.release()
+
+
+  def bump_catalog_version(self,
+                           course_name: str) -> int:
+    """
+    Mark a catalog as updated, so every running app drops its cached data on the next poll.
+
+    Args:
+      - course_name (str): The name of the course
+    
+    Returns:
+      - int: The new version of the catalog
+    """
+
+    from pymongo import ReturnDocument
+
+    self.__get_snapshot()
+    document = self.catalog_versions_collection.find_one_and_update(
+      {"_id": course_name},
+      {"$inc": {"version": 1}, "$set": {"updated_at": datetime.now(timezone.utc)}},
+      upsert=True,
+      return_document=ReturnDocument.AFTER,
+    )
+    return document["version"]
+
+
+  def __replace_collection(self,
+                           database: "pymongo.database.Database",
+                           course_name: str,
+                           documents: list) -> None:
+    """
+    Replace the documents of a collection: they are written to a staging collection, then renamed over the collection,
+    so readers see either the old or the new documents, never a partially written collection.
+
+    Args:
+      - database (pymongo.database.Database): The database of the collection
+      - course_name (str): The name of the course, the name of the collection
+      - documents (list): The new documents, the collection is dropped if empty
+
+    Returns:
+      - None
+    """
+
+    if not documents:
+      database.drop_collection(course_name)
+      return
+
+    staging_collection = database[f"{course_name}{STAGING_SUFFIX}"]
+    staging_collection.drop()
+    staging_collection.insert_many(documents)
+    staging_collection.rename(course_name, dropTarget=True)
+
+
+  def publish_course(self,
+                     course_name: str,
+                     course_catalog: dict,
+                     all_tracks_information: dict) -> int:
+    """
+    Replace the catalog, course table and track documents of a course with freshly prepared data and bump its version.
+    The track documents only hold the placement of each course in the track, the fields shared by every track are stored once in the course table.
+    Each collection is replaced atomically and the version is bumped once every collection is replaced: a reader fetching between two replacements
+    may mix old and new documents, the version bump then drops the mixed data from every cache. If a write fails the version is not bumped.
+
+    Args:
+      - course_name (str): The name of the course
+      - course_catalog (dict): The course catalog keyed by track, as read by PrepareCoursesData
+      - all_tracks_information (dict): The prepared track information keyed by track, as returned by PrepareCoursesData.run
     
-    return all_tracks_in_course_information
\ No newline at end of file
+    Returns:
+      - int: The new version of the catalog
+    """
+
+    self.__get_snapshot()
+
+    def track_order(track: str) -> int:
+      return int(track.split("_")[-1])
+
+    course_table, all_tracks_placements = split_course_table(all_tracks_information)
+    self.__replace_collection(self.courses_table_db, course_name, [
+      {"_id": course, **table_fields}
+      for course, table_fields in course_table.items()
+    ])
+    for database, documents in [(self.courses_track_db, all_tracks_placements), (self.courses_catalog_db, course_catalog)]:
+      self.__replace_collection(database, course_name, [dict(documents[track]) for track in sorted(documents, key=track_order)])
+
+    return self.bump_catalog_version(course_name)
@@ -0,0 +1,104 @@
+import base64
+from consts import SerializerConsts
+from plotly.offline import get_plotlyjs_version
+
+
+class FigureSerializer:
+  """
+  The FigureSerializer class converts figures to compact JSON-ready dictionaries:
+  coordinates are rounded to a fixed precision, and long coordinate arrays are sent as base64 typed arrays
+  when the bundled plotly.js can decode them.
+  """
+
+  COORDINATE_KEYS = ("x", "y", "z")
+  TYPED_ARRAYS_PLOTLYJS_VERSION = (2, 28, 0)
+
+
+  def __init__(self) -> None:
+    """
+    Initialize the FigureSerializer class.
+
+    Args:
+      - None
+
+    Returns:
+      - None
+    """
+
+    serializer_consts = SerializerConsts().get_constants()
+    self.precision = serializer_consts["precision"]
+    self.typed_array_min_length = serializer_consts["typed_array_min_length"]
+    self.typed_arrays = serializer_consts["typed_arrays"] and self.__supports_typed_arrays()
+    self.dtype = "f4" if self.precision <= 4 else "f8"
+
+
+  def __supports_typed_arrays(self) -> bool:
+    """
+    Check whether the plotly.js served by Dash decodes {"dtype", "bdata"} typed arrays.
+
+    Args:
+      - None
+
+    Returns:
+      - bool: Whether typed arrays are supported.
+    """
+
+    version = tuple(int(part) for part in get_plotlyjs_version().split(".")[:3])
+    return version >= self.TYPED_ARRAYS_PLOTLYJS_VERSION
+
+
+  def __encode(self,
+               values):
+    """
+    Encode a coordinate array.
+
+    Args:
+      - values (list | tuple | np.ndarray): The coordinates.
+
+    Returns:
+      - The rounded coordinates as a list, a typed array dictionary, or the values unchanged if they are not numeric.
+        Coordinates separated by None, e.g. merged line segments, stay a list, typed arrays have no gaps.
+    """
+
+    import numpy as np
+
+    array = np.asarray(values)
+    if array.dtype.kind == "O" and array.ndim == 1 and all(value is None or isinstance(value, (int, float, np.number)) for value in array):
+      return [None if value is None else round(float(value), self.precision) for value in array]
+    if array.dtype.kind not in "fiu" or array.ndim != 1:
+      return values
+
+    array = np.round(array.astype(np.float64), self.precision)
+    if self.typed_arrays and len(array) >= self.typed_array_min_length:
+      array = array.astype(self.dtype)
+      return {
+        "dtype": self.dtype,
+        "bdata": base64.b64encode(array.tobytes()).decode("ascii"),
+      }
+    return array.tolist()
+
+
+  def serialize(self,
+                figure) -> dict:
+    """
+    Serialize a figure.
+
+    Args:
+      - figure (go.Figure | dict): The figure.
+
+    Returns:
+      - dict: The figure dictionary with compact coordinates, ready to be given to dcc.Graph.
+    """
+
+    import numpy as np
+    import plotly.graph_objects as go
+
+    figure = figure.to_plotly_json() if isinstance(figure, go.Figure) else figure
+    for trace in figure.get("data", []):
+      for key in self.COORDINATE_KEYS:
+        if isinstance(trace.get(key), (list, tuple, np.ndarray)):
+          trace[key] = self.__encode(trace[key])
+    return figure
+
+
+figure_serializer = FigureSerializer()
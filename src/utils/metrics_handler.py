@@ -0,0 +1,361 @@
+from bisect import bisect_left
+from functools import wraps
+from inspect import iscoroutinefunction, ismethod
+from threading import Lock
+from weakref import WeakMethod
+from time import perf_counter
+from consts import MetricsConsts
+from src.utils.trace_handler import trace_handler
+from src.utils.profile_handler import profile_handler
+from flask import Flask, Response, g, has_request_context, request
+
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BYTES_BUCKETS = (1024, 10 * 1024, 100 * 1024, 512 * 1024, 1024 ** 2, 5 * 1024 ** 2, 20 * 1024 ** 2)
+COUNT_BUCKETS = (0, 1, 2, 4, 8, 16, 32)
+
+
+class MetricsHandler:
+  """
+  The MetricsHandler class collects callback, database and cache metrics and exposes them in the Prometheus text format.
+  """
+
+
+  def __init__(self,
+               prefix: str = "course_trajectory") -> None:
+    """
+    Initialize the MetricsHandler class.
+
+    Args:
+      - prefix (str): The prefix of every metric name.
+
+    Returns:
+      - None
+    """
+
+    metrics_consts = MetricsConsts().get_constants()
+    self.prefix = prefix
+    self.enabled = metrics_consts["enabled"]
+    self.route = metrics_consts["route"]
+    self.__histograms = {}
+    self.__counters = {}
+    self.__descriptions = {}
+    self.__collectors = []
+    self.__lock = Lock()
+
+
+  def describe(self,
+               name: str,
+               metric_type: str,
+               description: str) -> None:
+    """
+    Register the type and help text of a metric.
+
+    Args:
+      - name (str): The metric name without the prefix.
+      - metric_type (str): Either "counter", "gauge" or "histogram".
+      - description (str): The help text.
+
+    Returns:
+      - None
+    """
+
+    self.__descriptions[name] = (metric_type, description)
+
+
+  def observe(self,
+              name: str,
+              value: float,
+              buckets: tuple = LATENCY_BUCKETS,
+              **labels) -> None:
+    """
+    Record a value in a histogram.
+
+    Args:
+      - name (str): The metric name without the prefix.
+      - value (float): The observed value.
+      - buckets (tuple): The upper bounds of the histogram buckets.
+      - labels: The metric labels.
+
+    Returns:
+      - None
+    """
+
+    key = (name, tuple(sorted(labels.items())))
+    with self.__lock:
+      if key not in self.__histograms:
+        self.__histograms[key] = {"buckets": buckets, "counts": [0] * (len(buckets) + 1), "sum": 0.0, "count": 0}
+      histogram = self.__histograms[key]
+      histogram["counts"][bisect_left(buckets, value)] += 1
+      histogram["sum"] += value
+      histogram["count"] += 1
+
+
+  def increment(self,
+                name: str,
+                value: float = 1,
+                **labels) -> None:
+    """
+    Increment a counter.
+
+    Args:
+      - name (str): The metric name without the prefix.
+      - value (float): The increment.
+      - labels: The metric labels.
+
+    Returns:
+      - None
+    """
+
+    key = (name, tuple(sorted(labels.items())))
+    with self.__lock:
+      self.__counters[key] = self.__counters.get(key, 0) + value
+
+
+  def register_collector(self,
+                         collector) -> None:
+    """
+    Register a callable polled on every scrape for metrics owned by other objects, e.g. cache statistics.
+    A bound method is held weakly: the collector of a short-lived object, e.g. the DatabaseHandler of a script,
+    is dropped once the object is garbage collected instead of keeping it alive.
+
+    Args:
+      - collector (callable): A callable without arguments returning a list of (name, labels, value) samples, summed over collectors.
+
+    Returns:
+      - None
+    """
+
+    reference = WeakMethod(collector) if ismethod(collector) else lambda: collector
+    with self.__lock:
+      self.__collectors.append(reference)
+
+
+  def add_server_timing(self,
+                        name: str,
+                        duration: float) -> None:
+    """
+    Add an entry to the Server-Timing header of the current request.
+
+    Args:
+      - name (str): The entry name.
+      - duration (float): The duration in seconds.
+
+    Returns:
+      - None
+    """
+
+    if has_request_context():
+      g.setdefault("server_timing", []).append((name, duration))
+
+
+  def instrument_callback(self,
+                          function):
+    """
+    Decorate a Dash callback to record its latency and errors, and to label the request metrics with its name.
+    The callback is also traced, and profiled when armed in the profile handler.
+
+    Args:
+      - function (callable): The callback.
+
+    Returns:
+      - callable: The instrumented callback.
+    """
+
+    callback_name = function.__name__
+
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+      if has_request_context():
+        g.callback_name = callback_name
+      start = perf_counter()
+      try:
+        with trace_handler.span(f"callback.{callback_name}"):
+          return profile_handler.call(callback_name, function, *args, **kwargs)
+      except Exception as e:
+        if type(e).__name__ != "PreventUpdate":
+          self.increment("callback_errors_total", callback=callback_name)
+        raise
+      finally:
+        trace_handler.mark()
+        duration = perf_counter() - start
+        self.observe("callback_duration_seconds", duration, callback=callback_name)
+        self.add_server_timing(f"cb_{callback_name}", duration)
+
+    return wrapper
+
+
+  def instrument_database(self,
+                          function):
+    """
+    Decorate a DatabaseHandler or AsyncDatabaseHandler method to record its latency.
+    Coroutines get no trace span, the spans of a thread would interleave across the awaits.
+
+    Args:
+      - function (callable): The method.
+
+    Returns:
+      - callable: The instrumented method.
+    """
+
+    method_name = function.__name__
+
+    if iscoroutinefunction(function):
+      @wraps(function)
+      async def async_wrapper(*args, **kwargs):
+        start = perf_counter()
+        try:
+          return await function(*args, **kwargs)
+        finally:
+          duration = perf_counter() - start
+          self.observe("database_duration_seconds", duration, method=method_name)
+          self.add_server_timing(f"db_{method_name}", duration)
+
+      return async_wrapper
+
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+      start = perf_counter()
+      try:
+        with trace_handler.span(f"database.{method_name}", **kwargs):
+          return function(*args, **kwargs)
+      finally:
+        duration = perf_counter() - start
+        self.observe("database_duration_seconds", duration, method=method_name)
+        self.add_server_timing(f"db_{method_name}", duration)
+
+    return wrapper
+
+
+  def __format_labels(self,
+                      labels: tuple,
+                      extra: tuple = ()) -> str:
+    """
+    Format labels in the Prometheus text format.
+
+    Args:
+      - labels (tuple): The sorted (name, value) label pairs.
+      - extra (tuple): Additional (name, value) label pairs, e.g. the histogram bucket.
+
+    Returns:
+      - str: The formatted labels, empty if there are none.
+    """
+
+    pairs = []
+    for name, value in labels + extra:
+      value = str(value).replace("\\", "\\\\").replace('"', '\\"')
+      pairs.append(f'{name}="{value}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+  def render(self) -> str:
+    """
+    Render every metric in the Prometheus text format.
+
+    Args:
+      - None
+
+    Returns:
+      - str: The metrics page.
+    """
+
+    with self.__lock:
+      collectors = [reference() for reference in self.__collectors]
+      self.__collectors = [reference for reference, collector in zip(self.__collectors, collectors) if collector is not None]
+
+    gauges = {}
+    for collector in collectors:
+      if collector is None:
+        continue
+      for name, labels, value in collector():
+        key = (name, tuple(sorted(labels.items())))
+        gauges[key] = gauges.get(key, 0) + value
+
+    with self.__lock:
+      histograms = {key: dict(histogram, counts=list(histogram["counts"])) for key, histogram in self.__histograms.items()}
+      counters = dict(self.__counters)
+
+    lines, described = [], set()
+    for samples, default_type in [(counters, "counter"), (gauges, "gauge"), (histograms, "histogram")]:
+      for (name, labels), sample in sorted(samples.items()):
+        metric_name = f"{self.prefix}_{name}"
+        if name not in described:
+          described.add(name)
+          metric_type, description = self.__descriptions.get(name, (default_type, name.replace("_", " ")))
+          lines.append(f"# HELP {metric_name} {description}")
+          lines.append(f"# TYPE {metric_name} {metric_type}")
+
+        if default_type != "histogram":
+          lines.append(f"{metric_name}{self.__format_labels(labels)} {sample}")
+          continue
+
+        cumulative = 0
+        for upper_bound, count in zip(sample["buckets"] + ("+Inf",), sample["counts"]):
+          cumulative += count
+          lines.append(f"{metric_name}_bucket{self.__format_labels(labels, (('le', upper_bound),))} {cumulative}")
+        lines.append(f"{metric_name}_sum{self.__format_labels(labels)} {sample['sum']}")
+        lines.append(f"{metric_name}_count{self.__format_labels(labels)} {sample['count']}")
+
+    return "\n".join(lines) + "\n"
+
+
+  def register(self,
+               server: Flask) -> None:
+    """
+    Mount the metrics route and the per-request hooks on the Flask server.
+
+    Args:
+      - server (Flask): The Flask server of the Dash app.
+
+    Returns:
+      - None
+    """
+
+    if not self.enabled:
+      return
+
+    @server.before_request
+    def start_request_timer():
+      g.request_start = perf_counter()
+      g.mongo_queries = 0
+
+    @server.after_request
+    def record_callback_request(response: Response) -> Response:
+      if not request.path.endswith("_dash-update-component"):
+        return response
+
+      callback_name = g.get("callback_name", "unknown")
+      response_bytes = response.calculate_content_length() or 0
+      self.observe("callback_request_bytes", request.content_length or 0, buckets=BYTES_BUCKETS, callback=callback_name)
+      self.observe("callback_response_bytes", response_bytes, buckets=BYTES_BUCKETS, callback=callback_name)
+      self.observe("callback_mongo_queries", g.get("mongo_queries", 0), buckets=COUNT_BUCKETS, callback=callback_name)
+
+      server_timing = [f"{name};dur={duration * 1000:.2f}" for name, duration in g.get("server_timing", [])]
+      server_timing.append(f'mongo;desc="{g.get("mongo_queries", 0)} queries"')
+      server_timing.append(f"total;dur={(perf_counter() - g.get('request_start', perf_counter())) * 1000:.2f}")
+      response.headers["Server-Timing"] = ", ".join(server_timing)
+      return response
+
+    server.add_url_rule(
+      self.route,
+      endpoint="metrics",
+      view_func=lambda: Response(self.render(), mimetype="text/plain; version=0.0.4"),
+    )
+
+
+metrics_handler = MetricsHandler()
+metrics_handler.describe("callback_duration_seconds", "histogram", "Latency of the Dash callbacks.")
+metrics_handler.describe("callback_errors_total", "counter", "Exceptions raised by the Dash callbacks.")
+metrics_handler.describe("callback_request_bytes", "histogram", "Size of the Dash callback request bodies.")
+metrics_handler.describe("callback_response_bytes", "histogram", "Size of the Dash callback response bodies.")
+metrics_handler.describe("callback_mongo_queries", "histogram", "Number of MongoDB commands sent while serving a Dash callback.")
+metrics_handler.describe("database_duration_seconds", "histogram", "Latency of the DatabaseHandler methods, cache hits included.")
+metrics_handler.describe("mongo_commands_total", "counter", "MongoDB commands sent, by command and outcome.")
+metrics_handler.describe("mongo_command_duration_seconds", "histogram", "Latency of the MongoDB commands.")
+metrics_handler.describe("cache_hits_total", "counter", "Course data cache hits.")
+metrics_handler.describe("cache_misses_total", "counter", "Course data cache misses.")
+metrics_handler.describe("cache_entries", "gauge", "Entries held by the course data cache.")
+metrics_handler.describe("figure_cache_hits_total", "counter", "Figure cache hits.")
+metrics_handler.describe("figure_cache_misses_total", "counter", "Figure cache misses.")
+metrics_handler.describe("figure_cache_entries", "gauge", "Entries held by the figure cache.")
+metrics_handler.describe("render_duration_seconds", "histogram", "Time to build the figure of a track, on request, prefetched or warmed up.")
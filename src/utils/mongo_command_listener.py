@@ -0,0 +1,39 @@
+from pymongo import monitoring
+from flask import g, has_request_context
+from src.utils.metrics_handler import MetricsHandler
+
+
+class MongoCommandListener(monitoring.CommandListener):
+  """
+  A pymongo command listener counting the queries sent to MongoDB, per command and per callback request.
+  """
+
+
+  def __init__(self,
+               metrics_handler: MetricsHandler) -> None:
+    """
+    Initialize the MongoCommandListener class.
+
+    Args:
+      - metrics_handler (MetricsHandler): The metrics handler the queries are recorded in.
+
+    Returns:
+      - None
+    """
+
+    self.metrics_handler = metrics_handler
+
+
+  def started(self, event: monitoring.CommandStartedEvent) -> None:
+    if has_request_context():
+      g.mongo_queries = g.get("mongo_queries", 0) + 1
+
+
+  def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+    self.metrics_handler.increment("mongo_commands_total", command=event.command_name, status="succeeded")
+    self.metrics_handler.observe("mongo_command_duration_seconds", event.duration_micros / 1e6, command=event.command_name)
+
+
+  def failed(self, event: monitoring.CommandFailedEvent) -> None:
+    self.metrics_handler.increment("mongo_commands_total", command=event.command_name, status="failed")
+    self.metrics_handler.observe("mongo_command_duration_seconds", event.duration_micros / 1e6, command=event.command_name)
@@ -0,0 +1,286 @@
+import os
+import hmac
+import pstats
+import cProfile
+import tracemalloc
+from html import escape
+from threading import Lock
+from datetime import datetime
+from consts import ProfileConsts
+from flask import Flask, Response, abort, request
+
+
+class ProfileHandler:
+  """
+  The ProfileHandler class profiles the next invocations of a named callback with cProfile and tracemalloc.
+  """
+
+  ALLOCATION_FILES = ("*generate_3d_graph.py", "*develop_path.py")
+
+
+  def __init__(self) -> None:
+    """
+    Initialize the ProfileHandler class.
+
+    Args:
+      - None
+
+    Returns:
+      - None
+    """
+
+    profile_consts = ProfileConsts().get_constants()
+    self.directory = profile_consts["directory"]
+    self.admin_token = profile_consts["admin_token"]
+    self.top_n = profile_consts["top_n"]
+    self.__armed = {}
+    self.__armed_lock = Lock()
+    self.__profiling_lock = Lock()
+    if profile_consts["arm_on_start"]:
+      callback_name, _, count = profile_consts["arm_on_start"].partition(":")
+      self.arm(callback_name, int(count or 1))
+
+
+  def arm(self,
+          callback_name: str,
+          count: int) -> None:
+    """
+    Profile the next invocations of a callback.
+
+    Args:
+      - callback_name (str): The name of the callback, e.g. update_figure.
+      - count (int): The number of invocations to be profiled.
+
+    Returns:
+      - None
+    """
+
+    if count <= 0:
+      raise ValueError(f"The number of invocations to profile must be positive, got {count}")
+    with self.__armed_lock:
+      self.__armed[callback_name] = count
+
+
+  def get_armed(self) -> dict:
+    """
+    Get the callbacks waiting to be profiled.
+
+    Args:
+      - None
+
+    Returns:
+      - dict: The {callback_name: remaining invocations} mapping.
+    """
+
+    with self.__armed_lock:
+      return dict(self.__armed)
+
+
+  def __take(self,
+             callback_name: str) -> bool:
+    """
+    Consume one armed invocation of a callback.
+
+    Args:
+      - callback_name (str): The name of the callback.
+
+    Returns:
+      - bool: Whether this invocation is to be profiled.
+    """
+
+    if not self.__armed:
+      return False
+
+    with self.__armed_lock:
+      remaining = self.__armed.get(callback_name, 0)
+      if remaining <= 0:
+        return False
+      if remaining == 1:
+        del self.__armed[callback_name]
+      else:
+        self.__armed[callback_name] = remaining - 1
+      return True
+
+
+  def __give_back(self,
+                  callback_name: str) -> None:
+    """
+    Re-arm an invocation taken while another invocation was being profiled.
+
+    Args:
+      - callback_name (str): The name of the callback.
+
+    Returns:
+      - None
+    """
+
+    with self.__armed_lock:
+      self.__armed[callback_name] = self.__armed.get(callback_name, 0) + 1
+
+
+  def call(self,
+           callback_name: str,
+           function,
+           *args,
+           **kwargs):
+    """
+    Call a callback, profiling it if it is armed. Only one invocation is profiled at a time,
+    an armed invocation concurrent with a profiled one runs normally and its callback stays armed.
+
+    Args:
+      - callback_name (str): The name of the callback.
+      - function (callable): The callback.
+      - args: The positional arguments of the callback.
+      - kwargs: The keyword arguments of the callback.
+
+    Returns:
+      - The result of the callback.
+    """
+
+    if not self.__take(callback_name):
+      return function(*args, **kwargs)
+    if not self.__profiling_lock.acquire(blocking=False):
+      self.__give_back(callback_name)
+      return function(*args, **kwargs)
+
+    try:
+      tracing_allocations = tracemalloc.is_tracing()
+      if not tracing_allocations:
+        tracemalloc.start(25)
+      profile = cProfile.Profile()
+      try:
+        return profile.runcall(function, *args, **kwargs)
+      finally:
+        snapshot = tracemalloc.take_snapshot()
+        if not tracing_allocations:
+          tracemalloc.stop()
+        os.makedirs(self.directory, exist_ok=True)
+        file_path = os.path.join(self.directory, f"{datetime.now().strftime('%Y%m%dT%H%M%S%f')}_{callback_name}")
+        profile.dump_stats(f"{file_path}.prof")
+        snapshot.dump(f"{file_path}.tracemalloc")
+    finally:
+      self.__profiling_lock.release()
+
+
+  def __top_functions(self,
+                      file_path: str) -> list:
+    """
+    Get the functions with the highest cumulative time of a profile.
+
+    Args:
+      - file_path (str): The path of the .prof file.
+
+    Returns:
+      - list: (function, calls, total time, cumulative time) rows.
+    """
+
+    stats = pstats.Stats(file_path).stats
+    rows = [
+      (f"{os.path.basename(file_name)}:{line}({function})", calls, total_time, cumulative_time)
+      for (file_name, line, function), (_, calls, total_time, cumulative_time, _) in stats.items()
+    ]
+    return sorted(rows, key=lambda row: row[3], reverse=True)[:self.top_n]
+
+
+  def __top_allocations(self,
+                        file_path: str) -> list:
+    """
+    Get the allocation sites in the renderers holding the most memory at the end of a profiled call.
+
+    Args:
+      - file_path (str): The path of the .tracemalloc file.
+
+    Returns:
+      - list: (site, size in KiB, blocks) rows.
+    """
+
+    snapshot = tracemalloc.Snapshot.load(file_path).filter_traces(
+      [tracemalloc.Filter(True, file_pattern) for file_pattern in self.ALLOCATION_FILES]
+    )
+    return [
+      (f"{os.path.basename(stat.traceback[0].filename)}:{stat.traceback[0].lineno}", stat.size / 1024, stat.count)
+      for stat in snapshot.statistics("lineno")[:self.top_n]
+    ]
+
+
+  def summary(self) -> str:
+    """
+    Render the summary page of the saved profiles, newest first.
+
+    Args:
+      - None
+
+    Returns:
+      - str: The HTML page.
+    """
+
+    sections = [
+      "<h1>Callback profiles</h1>",
+      f"<p>Armed: {escape(str(self.get_armed()))}</p>",
+    ]
+    file_names = sorted(os.listdir(self.directory), reverse=True) if os.path.isdir(self.directory) else []
+    for file_name in [file_name for file_name in file_names if file_name.endswith(".prof")]:
+      file_path = os.path.join(self.directory, file_name[:-len(".prof")])
+      sections.append(f"<h2>{escape(file_name[:-len('.prof')])}</h2>")
+      sections.append("<table><tr><th>function</th><th>calls</th><th>tottime (s)</th><th>cumtime (s)</th></tr>")
+      for function, calls, total_time, cumulative_time in self.__top_functions(f"{file_path}.prof"):
+        sections.append(f"<tr><td>{escape(function)}</td><td>{calls}</td><td>{total_time:.4f}</td><td>{cumulative_time:.4f}</td></tr>")
+      sections.append("</table>")
+
+      if os.path.exists(f"{file_path}.tracemalloc"):
+        sections.append("<table><tr><th>allocation site</th><th>size (KiB)</th><th>blocks</th></tr>")
+        for site, size, count in self.__top_allocations(f"{file_path}.tracemalloc"):
+          sections.append(f"<tr><td>{escape(site)}</td><td>{size:.1f}</td><td>{count}</td></tr>")
+        sections.append("</table>")
+
+    return "<html><body style='font-family: monospace'>" + "\n".join(sections) + "</body></html>"
+
+
+  def __authorize(self) -> None:
+    """
+    Abort the request unless it carries the admin token. The routes are hidden when no token is configured.
+
+    Args:
+      - None
+
+    Returns:
+      - None
+    """
+
+    if not self.admin_token:
+      abort(404)
+    token = request.headers.get("X-Admin-Token", request.args.get("token", ""))
+    if not hmac.compare_digest(token.encode("utf-8"), self.admin_token.encode("utf-8")):
+      abort(403)
+
+
+  def register(self,
+               server: Flask) -> None:
+    """
+    Mount the protected profiling routes on the Flask server.
+
+    Args:
+      - server (Flask): The Flask server of the Dash app.
+
+    Returns:
+      - None
+    """
+
+    def summary_view() -> Response:
+      self.__authorize()
+      return Response(self.summary(), mimetype="text/html")
+
+    def arm_view() -> Response:
+      self.__authorize()
+      callback_name = request.values.get("callback", "")
+      count = request.values.get("count", 1, type=int)
+      if not callback_name or count <= 0:
+        abort(400)
+      self.arm(callback_name, count)
+      return Response(f"Armed {callback_name}: {self.get_armed().get(callback_name, 0)} invocation(s) remaining\n", mimetype="text/plain")
+
+    server.add_url_rule("/admin/profiling", endpoint="profiling_summary", view_func=summary_view)
+    server.add_url_rule("/admin/profiling/arm", endpoint="profiling_arm", view_func=arm_view, methods=["POST"])
+
+
+profile_handler = ProfileHandler()
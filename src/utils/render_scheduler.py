@@ -0,0 +1,257 @@
+from threading import Lock
+from time import perf_counter
+from consts import RenderConsts
+from concurrent.futures import Future, ThreadPoolExecutor
+from src.utils.cache_handler import CacheHandler, register_at_fork_weakly
+from src.utils.database_handler import DatabaseHandler
+from src.utils.metrics_handler import metrics_handler
+from src.utils.thread_job_manager import raise_if_cancelled
+
+
+class RenderScheduler:
+  """
+  The RenderScheduler class builds the figure of the requested track immediately,
+  then prefetches the other tracks of the same catalog into the figure cache on a background thread pool.
+  The figures have their own small cache, a figure being far larger than the course data of its catalog.
+  """
+
+
+  def __init__(self,
+               database_handler: DatabaseHandler) -> None:
+    """
+    Initialize the RenderScheduler class.
+
+    Args:
+      - database_handler (DatabaseHandler): The handler the course data is read from, the figure cache is invalidated along with its cache.
+
+    Returns:
+      - None
+    """
+
+    render_consts = RenderConsts().get_constants()
+    self.database_handler = database_handler
+    self.cache = CacheHandler(
+      max_entries=render_consts["cache_max_entries"],
+    )
+    database_handler.register_cache(self.cache)
+    metrics_handler.register_collector(self.__collect_metrics)
+    self.prefetch_enabled = render_consts["prefetch"]
+    self.max_workers = render_consts["max_workers"]
+    self.__executor = ThreadPoolExecutor(
+      max_workers=self.max_workers,
+      thread_name_prefix="render",
+    )
+    self.__futures = {}
+    self.__lock = Lock()
+    register_at_fork_weakly(self.__after_fork)
+
+
+  def __collect_metrics(self) -> list:
+    """
+    Collect the figure cache statistics on a metrics scrape.
+
+    Args:
+      - None
+
+    Returns:
+      - list: The (name, labels, value) samples.
+    """
+
+    return [
+      ("figure_cache_hits_total", {}, self.cache.hits),
+      ("figure_cache_misses_total", {}, self.cache.misses),
+      ("figure_cache_entries", {}, len(self.cache)),
+    ]
+
+
+  def __after_fork(self) -> None:
+    """
+    Replace the prefetch pool in a forked process.
+    The prefetches running during the fork do not exist in the child, waiting on their futures would never return.
+
+    Args:
+      - None
+
+    Returns:
+      - None
+    """
+
+    self.__executor = ThreadPoolExecutor(
+      max_workers=self.max_workers,
+      thread_name_prefix="render",
+    )
+    self.__futures = {}
+    self.__lock = Lock()
+
+
+  def __build(self,
+              course_name: str,
+              track: str,
+              mode: str):
+    """
+    Build the layout and the fullscreen figure of a track and cache them,
+    unless the catalog was updated while they were built. A background job terminated while the course data is fetched stops before rendering.
+
+    Args:
+      - course_name (str): The name of the course.
+      - track (str): The track, e.g. track_1.
+      - mode (str): Either "request", "prefetch" or "warm_up", the label of the render metrics.
+
+    Returns:
+      - tuple: (layout, fullscreen figure) of the track.
+    """
+
+    start = perf_counter()
+    catalog_version = self.database_handler.get_catalog_version(course_name)
+    try:
+      from src.generate_3d_graph import Generate3DGraph
+
+      course_bundle = self.database_handler.get_course_bundle(
+        course_name=course_name
+      )
+      raise_if_cancelled()
+      interactive_3d_graph_obj = Generate3DGraph(
+        course_name=course_name,
+        course_catalog=course_bundle.course_catalog,
+        all_tracks_course_information=course_bundle.all_tracks_course_information,
+      )
+      rendered = (
+        interactive_3d_graph_obj.run(
+          track=track,
+        ),
+        interactive_3d_graph_obj.fullscreen_figure,
+      )
+    finally:
+      metrics_handler.observe("render_duration_seconds", perf_counter() - start, mode=mode)
+
+    if self.database_handler.get_catalog_version(course_name) == catalog_version:
+      self.cache.set(("figure", course_name, track), rendered)
+    return rendered
+
+
+  def __submit(self,
+               course_name: str,
+               track: str) -> Future:
+    """
+    Schedule the prefetch of a track, unless it is already scheduled.
+
+    Args:
+      - course_name (str): The name of the course.
+      - track (str): The track, e.g. track_1.
+
+    Returns:
+      - Future: The future of the (layout, fullscreen figure) of the track.
+    """
+
+    key = (course_name, track)
+    with self.__lock:
+      if key not in self.__futures:
+        future = self.__executor.submit(self.__build, course_name, track, "prefetch")
+        self.__futures[key] = future
+        future.add_done_callback(lambda _: self.__forget(key))
+      return self.__futures[key]
+
+
+  def __forget(self,
+               key: tuple) -> None:
+    with self.__lock:
+      self.__futures.pop(key, None)
+
+
+  def prefetch(self,
+               course_name: str,
+               exclude: str = None) -> None:
+    """
+    Prefetch every track of a catalog missing from the figure cache.
+
+    Args:
+      - course_name (str): The name of the course.
+      - exclude (str): A track not to be prefetched, e.g. the one being rendered.
+
+    Returns:
+      - None
+    """
+
+    tracks_count = self.database_handler.get_tracks_count_per_course().get(course_name, 0)
+    for track in [f"track_{i}" for i in range(1, tracks_count + 1)]:
+      if track != exclude and self.cache.get(("figure", course_name, track)) is None:
+        self.__submit(course_name, track)
+
+
+  def warm(self,
+           course_name: str,
+           track: str) -> None:
+    """
+    Build the layout of a track into the figure cache on the calling thread, unless it is cached.
+
+    Args:
+      - course_name (str): The name of the course.
+      - track (str): The track, e.g. track_1.
+
+    Returns:
+      - None
+    """
+
+    if self.cache.get(("figure", course_name, track)) is None:
+      self.__build(course_name, track, "warm_up")
+
+
+  def __get(self,
+            course_name: str,
+            track: str) -> tuple:
+    """
+    Get the rendered track from the figure cache, waiting for its prefetch if it is running,
+    or build it on the calling thread.
+
+    Args:
+      - course_name (str): The name of the course.
+      - track (str): The track, e.g. track_1.
+
+    Returns:
+      - tuple: (layout, fullscreen figure) of the track.
+    """
+
+    rendered = self.cache.get(("figure", course_name, track))
+    if rendered is None:
+      with self.__lock:
+        future = self.__futures.get((course_name, track))
+      rendered = future.result() if future is not None else self.__build(course_name, track, "request")
+    return rendered
+
+
+  def render(self,
+             course_name: str,
+             track: str):
+    """
+    Get the layout of a track, then prefetch the other tracks of the catalog.
+
+    Args:
+      - course_name (str): The name of the course.
+      - track (str): The track, e.g. track_1.
+
+    Returns:
+      - html.Div: The layout of the track.
+    """
+
+    layout, _ = self.__get(course_name, track)
+    if self.prefetch_enabled:
+      self.prefetch(course_name, exclude=track)
+    return layout
+
+
+  def fullscreen_figure(self,
+                        course_name: str,
+                        track: str):
+    """
+    Get the figure of the fullscreen graph of a track, sent when its modal is opened.
+
+    Args:
+      - course_name (str): The name of the course.
+      - track (str): The track, e.g. track_1.
+
+    Returns:
+      - go.Figure: The fullscreen figure of the track.
+    """
+
+    _, figure = self.__get(course_name, track)
+    return figure
@@ -0,0 +1,136 @@
+import os
+import json
+from threading import Lock
+from flask import Flask, Response, request
+from consts import StaticFiguresConsts
+
+
+class StaticFigureHandler:
+  """
+  The StaticFigureHandler class serves the figure bundles prebuilt by BuildFigureBundles:
+  it looks up the content-hashed files of a track in the bundle manifest, and marks them as immutable for the browser cache.
+  """
+
+  MANIFEST_FILE_NAME = "manifest.json"
+
+
+  def __init__(self) -> None:
+    """
+    Initialize the StaticFigureHandler class.
+
+    Args:
+      - None
+
+    Returns:
+      - None
+    """
+
+    static_figures_consts = StaticFiguresConsts().get_constants()
+    self.enabled = static_figures_consts["enabled"]
+    self.directory = static_figures_consts["directory"]
+    self.url_path = static_figures_consts["url_path"]
+    self.max_age = static_figures_consts["max_age_s"]
+    self.manifest_path = os.path.join(self.directory, self.MANIFEST_FILE_NAME)
+    self.__manifest = {}
+    self.__manifest_mtime = None
+    self.__lock = Lock()
+
+
+  def __get_manifest(self) -> dict:
+    """
+    Get the bundle manifest, read again whenever a build replaces it.
+
+    Args:
+      - None
+
+    Returns:
+      - dict: The manifest, empty if no bundle was built.
+    """
+
+    try:
+      manifest_mtime = os.stat(self.manifest_path).st_mtime_ns
+    except OSError:
+      return {}
+
+    with self.__lock:
+      if manifest_mtime != self.__manifest_mtime:
+        with open(self.manifest_path) as f:
+          self.__manifest = json.load(f)
+        self.__manifest_mtime = manifest_mtime
+      return self.__manifest
+
+
+  def get_build_id(self) -> str:
+    """
+    Get the identifier of the current bundle build, part of the memoization key of the rendered tabs.
+
+    Args:
+      - None
+
+    Returns:
+      - str: The build identifier, None if the bundles are disabled or not built.
+    """
+
+    if not self.enabled:
+      return None
+    return self.__get_manifest().get("build_id")
+
+
+  def get_bundle(self,
+                 course_name: str,
+                 track: str,
+                 catalog_version: int) -> dict:
+    """
+    Get the URLs of the prebuilt figures of a track.
+
+    Args:
+      - course_name (str): The name of the course.
+      - track (str): The track, e.g. track_1.
+      - catalog_version (int): The current version of the catalog, bundles built from another version are stale.
+
+    Returns:
+      - dict: The {"figure", "fullscreen", "index"} URLs, None if the bundles are disabled, or the track has no up-to-date bundle.
+    """
+
+    if not self.enabled:
+      return None
+
+    catalog = self.__get_manifest().get("catalogs", {}).get(course_name)
+    if catalog is None or catalog["version"] != catalog_version or track not in catalog["tracks"]:
+      return None
+
+    return {
+      kind: self.url_path + file_path
+      for kind, file_path in catalog["tracks"][track].items()
+    }
+
+
+  def register(self,
+               server: Flask) -> None:
+    """
+    Mount the hook adding the long-lived cache headers to the bundle files on the Flask server.
+    The manifest is not content-hashed and keeps the default headers.
+
+    Args:
+      - server (Flask): The Flask server of the Dash app.
+
+    Returns:
+      - None
+    """
+
+    if not self.enabled:
+      return
+
+    @server.after_request
+    def add_figure_cache_headers(response: Response) -> Response:
+      if response.status_code != 200 or not request.path.startswith(self.url_path) or request.path.endswith(self.MANIFEST_FILE_NAME):
+        return response
+
+      response.cache_control.public = True
+      response.cache_control.max_age = self.max_age
+      response.cache_control.immutable = True
+      response.cache_control.no_cache = None
+      return response
+
+
+static_figure_handler = StaticFigureHandler()
@@ -0,0 +1,391 @@
+import os
+import traceback
+from itertools import count
+from threading import Event, Lock
+from time import monotonic
+from collections import OrderedDict
+from contextvars import ContextVar, copy_context
+from concurrent.futures import ThreadPoolExecutor
+from dash.exceptions import PreventUpdate
+from dash._callback_context import context_value
+from dash.long_callback.managers import BaseLongCallbackManager
+from src.utils.trace_handler import trace_handler
+
+
+job_cancel_event = ContextVar("job_cancel_event", default=None)
+
+
+class JobCancelled(Exception):
+  """
+  Raised in a background job terminated while it runs, at its next cancellation check.
+  """
+
+
+def raise_if_cancelled() -> None:
+  """
+  Stop the background job running on this thread if it was terminated, e.g. because the user switched to another tab.
+  A thread cannot be interrupted, long steps call this between their stages. Does nothing outside of a job.
+
+  Args:
+    - None
+
+  Returns:
+    - None
+  """
+
+  cancel_event = job_cancel_event.get()
+  if cancel_event is not None and cancel_event.is_set():
+    raise JobCancelled()
+
+
+class JobContext(dict):
+  """
+  The callback context of a job, a dictionary whose keys are also attributes, the way Dash reads its callback context.
+  """
+
+  def __getattr__(self, key: str):
+    try:
+      return self[key]
+    except KeyError:
+      raise AttributeError(key) from None
+
+
+  def __setattr__(self, key: str, value) -> None:
+    self[key] = value
+
+
+class UpdatedProps(dict):
+  """
+  The {component id: props} updates of set_props calls in a job, each update also being passed to a function.
+  """
+
+  def __init__(self, on_change) -> None:
+    super().__init__()
+    self.on_change = on_change
+
+
+  def __setitem__(self, key: str, value: dict) -> None:
+    super().__setitem__(key, value)
+    self.on_change(key, value)
+
+
+class ThreadJobManager(BaseLongCallbackManager):
+  """
+  The ThreadJobManager class runs the Dash background callbacks on a thread pool of the server process and keeps their results in memory.
+  Unlike DiskcacheManager it does not fork a process per job: the metrics, traces and profiles of a job,
+  and the figures it builds or prefetches, stay in the process serving the requests.
+  Its only private Dash dependency is the context variable holding the callback context, set the way Dash's own managers set it.
+  """
+
+
+  def __init__(self,
+               max_workers: int = 4,
+               max_entries: int = 32,
+               cache_by: list = None,
+               expire: float = None) -> None:
+    """
+    Initialize the ThreadJobManager class.
+
+    Args:
+      - max_workers (int): The number of jobs run at the same time, the next ones wait for a free thread.
+      - max_entries (int): The maximum number of results kept before the least recently used one is evicted, also the bound of the progress and set_props updates kept.
+      - cache_by (list): Zero-argument functions whose return values are part of the result keys, memoizing the results. Results are dropped once read if None.
+      - expire (float): The number of seconds a memoized result is kept after it was last read, forever if None.
+
+    Returns:
+      - None
+    """
+
+    self.max_workers = max_workers
+    self.max_entries = max_entries
+    self.expire = expire
+    self.__executor = ThreadPoolExecutor(
+      max_workers=max_workers,
+      thread_name_prefix="background_callback",
+    )
+    self.__results = OrderedDict()
+    self.__progress = OrderedDict()
+    self.__updated_props = OrderedDict()
+    self.__jobs = {}
+    self.__job_ids = count(1)
+    self.__lock = Lock()
+    os.register_at_fork(after_in_child=self.__after_fork)
+    super().__init__(cache_by)
+
+
+  def __after_fork(self) -> None:
+    """
+    Replace the thread pool and the lock in a forked process, the jobs running during the fork do not exist in the child.
+
+    Args:
+      - None
+
+    Returns:
+      - None
+    """
+
+    self.__executor = ThreadPoolExecutor(
+      max_workers=self.max_workers,
+      thread_name_prefix="background_callback",
+    )
+    self.__jobs = {}
+    self.__lock = Lock()
+
+
+  def __set_result(self,
+                   key: str,
+                   value) -> None:
+    """
+    Store the result of a job, evicting the least recently used results beyond max_entries.
+
+    Args:
+      - key (str): The result key.
+      - value: The output of the callback, or the error it raised.
+
+    Returns:
+      - None
+    """
+
+    with self.__lock:
+      self.__results[key] = (value, monotonic())
+      self.__results.move_to_end(key)
+      while len(self.__results) > self.max_entries:
+        evicted_key, _ = self.__results.popitem(last=False)
+        self.__updated_props.pop(evicted_key, None)
+
+
+  def __set_bounded(self,
+                    entries: OrderedDict,
+                    key: str,
+                    value) -> None:
+    """
+    Set a progress or updated props entry, dropping the oldest entries beyond max_entries, e.g. the ones of jobs whose result is never collected.
+    Must be called with the lock held.
+
+    Args:
+      - entries (OrderedDict): The progress or updated props entries.
+      - key (str): The progress or result key.
+      - value: The entry.
+
+    Returns:
+      - None
+    """
+
+    entries[key] = value
+    entries.move_to_end(key)
+    while len(entries) > self.max_entries:
+      entries.popitem(last=False)
+
+
+  def __get_entry(self,
+                  key: str):
+    """
+    Get a stored result, dropping it if it expired.
+
+    Args:
+      - key (str): The result key.
+
+    Returns:
+      - tuple: (value, time of the last read), None if there is no result.
+    """
+
+    entry = self.__results.get(key)
+    if entry is not None and self.expire and monotonic() - entry[1] > self.expire:
+      del self.__results[key]
+      return None
+    return entry
+
+
+  def terminate_job(self,
+                    job) -> None:
+    """
+    Cancel a job. A job waiting for a thread is not run. A running job stops at its next progress update or raise_if_cancelled call,
+    its result is not stored, and its progress and set_props updates are dropped.
+
+    Args:
+      - job (int | str): The job id.
+
+    Returns:
+      - None
+    """
+
+    if job is None:
+      return
+
+    with self.__lock:
+      entry = self.__jobs.pop(int(job), None)
+      if entry is None:
+        return
+
+      future, result_key, cancel_event = entry
+      if not future.done():
+        cancel_event.set()
+        self.__progress.pop(self._make_progress_key(result_key), None)
+        self.__updated_props.pop(result_key, None)
+    future.cancel()
+
+
+  def terminate_unhealthy_job(self,
+                              job) -> bool:
+    return False
+
+
+  def job_running(self,
+                  job) -> bool:
+    if not job:
+      return False
+
+    with self.__lock:
+      entry = self.__jobs.get(int(job))
+    return entry is not None and not entry[0].done()
+
+
+  def make_job_fn(self,
+                  fn,
+                  progress,
+                  key=None):
+    """
+    Wrap a background callback into a job run on the thread pool. Each job is traced on its own thread.
+
+    Args:
+      - fn (callable): The callback.
+      - progress (list): The progress outputs of the callback, if any.
+      - key (str): The registry key of the callback.
+
+    Returns:
+      - callable: The job, called with (result key, progress key, callback arguments, callback context, cancel event).
+    """
+
+    def job_fn(result_key, progress_key, user_callback_args, context, cancel_event):
+      def set_progress(progress_value):
+        if not isinstance(progress_value, (list, tuple)):
+          progress_value = [progress_value]
+        with self.__lock:
+          cancelled = cancel_event.is_set()
+          if not cancelled:
+            self.__set_bounded(self.__progress, progress_key, progress_value)
+        if cancelled:
+          raise JobCancelled()
+
+      def set_props(_id, props):
+        with self.__lock:
+          if not cancel_event.is_set():
+            self.__set_bounded(self.__updated_props, result_key, {**self.__updated_props.get(result_key, {}), _id: props})
+
+      maybe_progress = [set_progress] if progress else []
+
+      def run():
+        callback_context = JobContext(context)
+        callback_context.ignore_register_page = False
+        callback_context.updated_props = UpdatedProps(set_props)
+        context_value.set(callback_context)
+        job_cancel_event.set(cancel_event)
+        trace_handler.start_trace(f"background.{fn.__name__}")
+        try:
+          if isinstance(user_callback_args, dict):
+            output = fn(*maybe_progress, **user_callback_args)
+          elif isinstance(user_callback_args, (list, tuple)):
+            output = fn(*maybe_progress, *user_callback_args)
+          else:
+            output = fn(*maybe_progress, user_callback_args)
+        except JobCancelled:
+          pass
+        except PreventUpdate:
+          self.__set_result(result_key, {"_dash_no_update": "_dash_no_update"})
+        except Exception as error:
+          self.__set_result(result_key, {"long_callback_error": {"msg": str(error), "tb": traceback.format_exc()}})
+        else:
+          if not cancel_event.is_set():
+            self.__set_result(result_key, output)
+        finally:
+          trace_handler.end_trace()
+
+      copy_context().run(run)
+
+    return job_fn
+
+
+  def call_job_fn(self,
+                  key: str,
+                  job_fn,
+                  args,
+                  context) -> int:
+    """
+    Submit a job to the thread pool, unless the result is memoized: the browser then polls a job that already finished.
+
+    Args:
+      - key (str): The result key.
+      - job_fn (callable): The job, see make_job_fn.
+      - args: The callback arguments.
+      - context (dict): The callback context of the request.
+
+    Returns:
+      - int: The job id, sent back by the browser when it polls for the result.
+    """
+
+    job = next(self.__job_ids)
+    if self.cache_by is not None and self.result_ready(key):
+      return job
+
+    cancel_event = Event()
+    with self.__lock:
+      future = self.__executor.submit(job_fn, key, self._make_progress_key(key), args, context, cancel_event)
+      self.__jobs[job] = (future, key, cancel_event)
+    future.add_done_callback(lambda _: self.__forget(job))
+    return job
+
+
+  def __forget(self,
+               job: int) -> None:
+    with self.__lock:
+      self.__jobs.pop(job, None)
+
+
+  def get_progress(self,
+                   key: str):
+    with self.__lock:
+      return self.__progress.pop(self._make_progress_key(key), None)
+
+
+  def result_ready(self,
+                   key: str) -> bool:
+    with self.__lock:
+      return self.__get_entry(key) is not None
+
+
+  def get_result(self,
+                 key: str,
+                 job):
+    """
+    Get the result of a job, memoized when cache_by is set, dropped once read otherwise.
+    Errors are never memoized, the next call runs the callback again.
+
+    Args:
+      - key (str): The result key.
+      - job (int | str): The job id, None for a memoized result served without a job.
+
+    Returns:
+      - The output of the callback, UNDEFINED if the job has not finished.
+    """
+
+    with self.__lock:
+      entry = self.__get_entry(key)
+      if entry is None:
+        return self.UNDEFINED
+
+      if self.cache_by is None or (isinstance(entry[0], dict) and "long_callback_error" in entry[0]):
+        del self.__results[key]
+      else:
+        self.__results[key] = (entry[0], monotonic())
+        self.__results.move_to_end(key)
+      self.__progress.pop(self._make_progress_key(key), None)
+
+      if job:
+        self.__jobs.pop(int(job), None)
+    return entry[0]
+
+
+  def get_updated_props(self,
+                        key: str) -> dict:
+    with self.__lock:
+      return self.__updated_props.pop(key, {})
@@ -0,0 +1,264 @@
+import os
+import json
+import random
+import threading
+from time import perf_counter
+from datetime import datetime
+from contextlib import contextmanager
+from consts import TraceConsts
+from flask import Flask, Response, g, request
+
+
+class TraceHandler:
+  """
+  The TraceHandler class records nested spans of a request and writes them as Chrome trace / Perfetto compatible JSON files.
+  """
+
+
+  def __init__(self) -> None:
+    """
+    Initialize the TraceHandler class.
+
+    Args:
+      - None
+
+    Returns:
+      - None
+    """
+
+    trace_consts = TraceConsts().get_constants()
+    self.enabled = trace_consts["enabled"]
+    self.sample_rate = trace_consts["sample_rate"]
+    self.slow_threshold = trace_consts["slow_threshold_ms"] / 1000
+    self.directory = trace_consts["directory"]
+    self.max_files = trace_consts["max_files"]
+    self.__local = threading.local()
+    self.__pid = os.getpid()
+
+
+  def __now(self) -> float:
+    return perf_counter() * 1e6
+
+
+  def start_trace(self,
+                  name: str,
+                  **args) -> None:
+    """
+    Start recording a trace on the current thread.
+
+    Args:
+      - name (str): The name of the root span, e.g. the callback or route.
+      - args: Extra information shown on the root span.
+
+    Returns:
+      - None
+    """
+
+    if not self.enabled:
+      return
+
+    self.__local.trace = {
+      "name": name,
+      "args": args,
+      "start": self.__now(),
+      "sampled": random.random() < self.sample_rate,
+      "events": [],
+      "open_spans": [],
+    }
+
+
+  def end_trace(self) -> str:
+    """
+    Stop recording the trace of the current thread, writing it if it was sampled or slow. Spans left open end with the trace.
+
+    Args:
+      - None
+
+    Returns:
+      - str: The path of the trace file, None if it was not written.
+    """
+
+    trace = getattr(self.__local, "trace", None)
+    self.__local.trace = None
+    if trace is None:
+      return None
+
+    end = self.__now()
+    while trace["open_spans"]:
+      name, start, args = trace["open_spans"].pop()
+      trace["events"].append(self.__event(name, start, end, args))
+    duration = end - trace["start"]
+    if not trace["sampled"] and duration < self.slow_threshold * 1e6:
+      return None
+
+    trace["events"].insert(0, self.__event(trace["name"], trace["start"], end, trace["args"]))
+    os.makedirs(self.directory, exist_ok=True)
+    safe_name = "".join(character if character.isalnum() else "_" for character in trace["name"])[:60]
+    file_path = os.path.join(self.directory, f"{datetime.now().strftime('%Y%m%dT%H%M%S%f')}_{safe_name}_{duration / 1000:.0f}ms.json")
+    with open(file_path, "w") as f:
+      json.dump({"traceEvents": trace["events"], "displayTimeUnit": "ms"}, f)
+
+    self.__rotate()
+    return file_path
+
+
+  def __rotate(self) -> None:
+    """
+    Delete the oldest trace files beyond the configured maximum. Another thread or worker may be deleting the same files.
+
+    Args:
+      - None
+
+    Returns:
+      - None
+    """
+
+    file_paths = sorted(
+      os.path.join(self.directory, file_name)
+      for file_name in os.listdir(self.directory)
+      if file_name.endswith(".json")
+    )
+    for file_path in file_paths[:max(0, len(file_paths) - self.max_files)]:
+      try:
+        os.remove(file_path)
+      except FileNotFoundError:
+        pass
+
+
+  def __event(self,
+              name: str,
+              start: float,
+              end: float,
+              args: dict) -> dict:
+    """
+    Create a Chrome trace complete event.
+
+    Args:
+      - name (str): The span name.
+      - start (float): The start timestamp in microseconds.
+      - end (float): The end timestamp in microseconds.
+      - args (dict): Extra information shown on the span.
+
+    Returns:
+      - dict: The event.
+    """
+
+    return {
+      "name": name,
+      "ph": "X",
+      "ts": round(start, 1),
+      "dur": round(end - start, 1),
+      "pid": self.__pid,
+      "tid": threading.get_ident(),
+      "args": {key: str(value) for key, value in args.items()},
+    }
+
+
+  def begin_span(self,
+                 name: str,
+                 **args) -> None:
+    """
+    Open a span nested in the innermost open span. Does nothing when no trace is recorded on this thread.
+
+    Args:
+      - name (str): The span name.
+      - args: Extra information shown on the span.
+
+    Returns:
+      - None
+    """
+
+    trace = getattr(self.__local, "trace", None)
+    if trace is not None:
+      trace["open_spans"].append((name, self.__now(), args))
+
+
+  def end_span(self) -> None:
+    """
+    Close the innermost open span.
+
+    Args:
+      - None
+
+    Returns:
+      - None
+    """
+
+    trace = getattr(self.__local, "trace", None)
+    if trace is not None and trace["open_spans"]:
+      name, start, args = trace["open_spans"].pop()
+      trace["events"].append(self.__event(name, start, self.__now(), args))
+
+
+  @contextmanager
+  def span(self,
+           name: str,
+           **args):
+    """
+    Record the enclosed block as a span.
+
+    Args:
+      - name (str): The span name.
+      - args: Extra information shown on the span.
+
+    Returns:
+      - None
+    """
+
+    self.begin_span(name, **args)
+    try:
+      yield
+    finally:
+      self.end_span()
+
+
+  def mark(self) -> None:
+    """
+    Remember the current time, e.g. when a callback returned, to attribute the rest of the request to serialization.
+
+    Args:
+      - None
+
+    Returns:
+      - None
+    """
+
+    trace = getattr(self.__local, "trace", None)
+    if trace is not None:
+      trace["mark"] = self.__now()
+
+
+  def register(self,
+               server: Flask) -> None:
+    """
+    Trace every Dash callback request of the Flask server.
+
+    Args:
+      - server (Flask): The Flask server of the Dash app.
+
+    Returns:
+      - None
+    """
+
+    if not self.enabled:
+      return
+
+    @server.before_request
+    def start_request_trace():
+      if request.path.endswith("_dash-update-component"):
+        self.start_trace(request.path)
+
+    @server.after_request
+    def record_serialization(response: Response) -> Response:
+      trace = getattr(self.__local, "trace", None)
+      if trace is not None and "mark" in trace:
+        trace["events"].append(self.__event("json_serialization", trace["mark"], self.__now(), {"bytes": response.calculate_content_length()}))
+        trace["name"] = g.get("callback_name", trace["name"])
+      return response
+
+    @server.teardown_request
+    def end_request_trace(exception=None):
+      self.end_trace()
+
+
+trace_handler = TraceHandler()
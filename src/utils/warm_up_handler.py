@@ -0,0 +1,178 @@
+import json
+from threading import Event, Lock, Thread
+from time import perf_counter
+from consts import WarmUpConsts
+from flask import Flask, Response
+from concurrent.futures import ThreadPoolExecutor, wait
+from src.utils.render_scheduler import RenderScheduler
+
+
+class WarmUpHandler:
+  """
+  The WarmUpHandler class pre-renders the tracks of the catalogs after startup and reports readiness once it is done.
+  It is started explicitly, e.g. by the gunicorn worker hook, never on import.
+  """
+
+
+  def __init__(self,
+               render_scheduler: RenderScheduler) -> None:
+    """
+    Initialize the WarmUpHandler class.
+
+    Args:
+      - render_scheduler (RenderScheduler): The scheduler the figures are built into the cache with.
+
+    Returns:
+      - None
+    """
+
+    warm_up_consts = WarmUpConsts().get_constants()
+    self.render_scheduler = render_scheduler
+    self.database_handler = render_scheduler.database_handler
+    self.enabled = warm_up_consts["enabled"]
+    self.time_budget = warm_up_consts["time_budget_s"]
+    self.max_workers = warm_up_consts["max_workers"]
+    self.top_n = warm_up_consts["top_n"]
+    self.route = warm_up_consts["route"]
+    self.ready = Event()
+    self.status = {"warmed": 0, "failed": 0, "skipped": 0, "uncached": 0, "seconds": 0.0}
+    self.__thread = None
+    self.__lock = Lock()
+    if not self.enabled:
+      self.ready.set()
+
+
+  def failed(self) -> bool:
+    """
+    Check whether the last warm-up failed: MongoDB could not be reached, or no track could be built.
+
+    Args:
+      - None
+
+    Returns:
+      - bool: Whether the warm-up finished and failed.
+    """
+
+    return self.ready.is_set() and ("error" in self.status or (self.status["failed"] > 0 and self.status["warmed"] == 0))
+
+
+  def __select_tracks(self,
+                      catalog_snapshot) -> tuple:
+    """
+    Select the tracks to warm up: the first track of every catalog, the one shown when a catalog is opened,
+    then the second track of every catalog and so on, every track or the first top_n ones.
+    The warm-up stops at the size of the figure cache so it never evicts its own figures,
+    the tracks left out are counted as uncached.
+
+    Args:
+      - catalog_snapshot (CatalogSnapshot): The catalog list and track counts.
+
+    Returns:
+      - tuple: The (course name, track) pairs to warm up, and the number of selected tracks the figure cache cannot hold.
+    """
+
+    max_tracks_count = max(catalog_snapshot.tracks_count_per_course.values(), default=0)
+    tracks = [
+      (course_name, f"track_{i}")
+      for i in range(1, max_tracks_count + 1)
+      for course_name in catalog_snapshot.courses_catalog_collection
+      if i <= catalog_snapshot.tracks_count_per_course.get(course_name, 0)
+    ]
+    if self.top_n > 0:
+      tracks = tracks[:self.top_n]
+    max_entries = self.render_scheduler.cache.max_entries
+    return tracks[:max_entries], max(len(tracks) - max_entries, 0)
+
+
+  def run(self) -> dict:
+    """
+    Fetch the prepared data and build the figures of the selected tracks in parallel,
+    giving up on the tracks not finished once the time budget is spent. If MongoDB cannot be reached
+    the warm-up fails, the readiness route answers 503 and retries it.
+
+    Args:
+      - None
+
+    Returns:
+      - dict: The number of warmed, failed, skipped (not finished in time) and uncached (beyond the figure cache size) tracks,
+        the elapsed seconds, and the connection error if any.
+    """
+
+    start = perf_counter()
+    try:
+      catalog_snapshot = self.database_handler.get_catalog_snapshot()
+    except Exception as error:
+      self.status = {"warmed": 0, "failed": 0, "skipped": 0, "uncached": 0, "seconds": round(perf_counter() - start, 3), "error": repr(error)}
+      self.ready.set()
+      return self.status
+
+    tracks, uncached = self.__select_tracks(catalog_snapshot)
+    executor = ThreadPoolExecutor(
+      max_workers=self.max_workers,
+      thread_name_prefix="warm_up",
+    )
+    futures = [
+      executor.submit(self.render_scheduler.warm, course_name, track)
+      for course_name, track in tracks
+    ]
+    done, not_done = wait(futures, timeout=self.time_budget)
+    executor.shutdown(wait=False, cancel_futures=True)
+
+    self.status = {
+      "warmed": sum(1 for future in done if future.exception() is None),
+      "failed": sum(1 for future in done if future.exception() is not None),
+      "skipped": len(not_done),
+      "uncached": uncached,
+      "seconds": round(perf_counter() - start, 3),
+    }
+    self.ready.set()
+    return self.status
+
+
+  def start(self) -> None:
+    """
+    Run the warm-up on a background thread, the readiness route answers 503 until it succeeds.
+    Called once per server process after it is started, or again to retry a failed warm-up.
+
+    Args:
+      - None
+
+    Returns:
+      - None
+    """
+
+    if not self.enabled:
+      return
+
+    with self.__lock:
+      if (self.__thread is not None and self.__thread.is_alive()) or (self.ready.is_set() and not self.failed()):
+        return
+      self.ready.clear()
+      self.__thread = Thread(target=self.run, name="warm_up", daemon=True)
+      self.__thread.start()
+
+
+  def register(self,
+               server: Flask) -> None:
+    """
+    Mount the readiness route on the Flask server. It answers 200 once the warm-up succeeded,
+    503 while it runs, before it is started, or after it failed, in which case it is started again.
+
+    Args:
+      - server (Flask): The Flask server of the Dash app.
+
+    Returns:
+      - None
+    """
+
+    def readiness_view() -> Response:
+      ready = self.ready.is_set() and not self.failed()
+      if self.failed():
+        self.start()
+      return Response(
+        json.dumps({"ready": ready, **self.status}, separators=(",", ":")),
+        status=200 if ready else 503,
+        mimetype="application/json",
+      )
+
+    server.add_url_rule(self.route, endpoint="readiness", view_func=readiness_view)
@@ -0,0 +1,112 @@
+import copy
+import pytest
+import mongomock
+from consts import config
+from benchmarks.synthetic_catalog import SyntheticCatalog
+from src.prepare_courses_data import PrepareCoursesData
+from src.utils.database_handler import DatabaseHandler
+
+
+TEST_CONFIG = {
+  "3D_COURSE_TRAJECTORY_CONSTS": {
+    "z_level": "0",
+    "z_increment": "10",
+    "marker_size": "6",
+    "radius_circle": "10",
+    "special_marker_size": "12",
+    "color_for_corequisites": "orange",
+    "color_for_prerequisites": "green",
+    "complete_path_to_top": "true",
+    "complete_path_from_start": "true",
+    "critical_courses_threshold": "2",
+    "critical_courses_threshold_circle": "2",
+    "left_shift_multiplier": "3",
+  },
+  "PROFILE_CONSTS": {},
+  "RENDER_CONSTS": {},
+  "TRACE_CONSTS": {},
+  "WARM_UP_CONSTS": {},
+}
+config.read_dict(TEST_CONFIG)
+
+
+@pytest.fixture
+def config_directory(tmp_path, monkeypatch):
+  """
+  Run the test from a directory holding the test config.ini, for the processes the test spawns.
+  """
+
+  with open(tmp_path / "config.ini", "w") as f:
+    config.write(f)
+  monkeypatch.chdir(tmp_path)
+  return tmp_path
+
+
+@pytest.fixture
+def course_catalog() -> dict:
+  return {
+    "track_1": {"CS101": {"year": 1}, "CS201": {"year": 2}, "CS301": {"year": 3}},
+    "track_2": {"CS101": {"year": 1}, "CS201": {"year": 1}},
+  }
+
+
+@pytest.fixture
+def all_tracks_information() -> dict:
+  def course(course_name, prerequisites, year, semester, complete_path, **fields):
+    return {
+      "course_name": course_name,
+      "course_description": f"{course_name} description",
+      "course_link": f"https://example.edu/{course_name.lower().replace(' ', '-')}",
+      "prerequisites": prerequisites,
+      "corequisites": [],
+      "year": year,
+      "semester": semester,
+      "complete path": complete_path,
+      "dependency_count": len(complete_path),
+      **fields,
+    }
+
+  cs101_cs201 = {"source": "CS101", "destination": "CS201", "relation": "prerequisite"}
+  cs201_cs301 = {"source": "CS201", "destination": "CS301", "relation": "prerequisite"}
+  return {
+    "track_1": {
+      "CS101": course("Programming", [], 1, 1, []),
+      "CS201": course("Data Structures", ["CS101"], 2, 1, [cs101_cs201]),
+      "CS301": course("Algorithms", ["CS201"], 3, 2, [cs101_cs201, cs201_cs301], elective=True),
+    },
+    "track_2": {
+      "CS101": course("Programming", [], 1, 1, []),
+      "CS201": course("Data Structures", ["CS101"], 1, 2, [cs101_cs201], course_description="A shorter description"),
+    },
+  }
+
+
+@pytest.fixture
+def pymongo_client(course_catalog, all_tracks_information) -> mongomock.MongoClient:
+  pymongo_client = mongomock.MongoClient()
+  DatabaseHandler(pymongo_client=pymongo_client).publish_course(
+    course_name="computer_science",
+    course_catalog=course_catalog,
+    all_tracks_information=all_tracks_information,
+  )
+  return pymongo_client
+
+
+@pytest.fixture
+def database_handler(pymongo_client) -> DatabaseHandler:
+  return DatabaseHandler(pymongo_client=pymongo_client)
+
+
+@pytest.fixture
+def synthetic_catalog(tmp_path, monkeypatch) -> tuple:
+  """
+  A synthetic catalog prepared in a temporary directory, as (course_catalog, all_tracks_information).
+  """
+
+  course_catalog = SyntheticCatalog(n_courses=60, n_tracks=2, seed=0).run()
+  monkeypatch.chdir(tmp_path)
+  all_tracks_information = PrepareCoursesData(
+    course_name="synthetic_catalog",
+    course_catalog=copy.deepcopy(course_catalog),
+  ).run()
+  return course_catalog, all_tracks_information
@@ -0,0 +1,88 @@
+import asyncio
+import mongomock
+from src.utils.database_handler import DatabaseHandler
+from src.utils.async_database_handler import AsyncDatabaseHandler
+from src.utils.metrics_handler import metrics_handler
+
+
+def test_course_bundle(pymongo_client, course_catalog, all_tracks_information):
+  async_database_handler = AsyncDatabaseHandler(pymongo_client=pymongo_client)
+  course_bundle = asyncio.run(async_database_handler.get_course_bundle(course_name="computer_science"))
+
+  assert course_bundle.course_catalog == course_catalog
+  assert course_bundle.all_tracks_course_information == all_tracks_information
+  assert asyncio.run(async_database_handler.get_courses_catalog()) == ("computer_science",)
+  assert asyncio.run(async_database_handler.get_tracks_count_per_course()) == {"computer_science": 2}
+
+
+def test_unknown_course(pymongo_client):
+  async_database_handler = AsyncDatabaseHandler(pymongo_client=pymongo_client)
+  course_bundle = asyncio.run(async_database_handler.get_course_bundle(course_name="physics"))
+
+  assert course_bundle == ({}, {})
+  assert asyncio.run(async_database_handler.get_course_descriptions(course_name="physics")) == {}
+
+
+def test_course_descriptions(pymongo_client):
+  async_database_handler = AsyncDatabaseHandler(pymongo_client=pymongo_client)
+
+  assert asyncio.run(async_database_handler.get_course_descriptions(course_name="computer_science")) == {
+    "CS101": "Programming description",
+    "CS201": "Data Structures description",
+    "CS301": "Algorithms description",
+  }
+
+
+def test_concurrent_misses_query_once(pymongo_client, monkeypatch):
+  finds = []
+  find = mongomock.collection.Collection.find
+
+  def counting_find(collection, *args, **kwargs):
+    finds.append(collection.full_name)
+    return find(collection, *args, **kwargs)
+
+  async_database_handler = AsyncDatabaseHandler(pymongo_client=pymongo_client)
+
+  async def fetch_concurrently() -> list:
+    await async_database_handler.get_catalog_snapshot()
+    monkeypatch.setattr(mongomock.collection.Collection, "find", counting_find)
+    return await asyncio.gather(*[
+      async_database_handler.get_course_track_information(course_name="computer_science")
+      for _ in range(8)
+    ])
+
+  results = asyncio.run(fetch_concurrently())
+
+  assert all(result is results[0] for result in results)
+  assert sorted(finds) == ["courses_table.computer_science", "courses_track_information.computer_science"]
+
+
+def test_refresh_invalidates_changed_catalogs(pymongo_client, course_catalog, all_tracks_information):
+  async_database_handler = AsyncDatabaseHandler(pymongo_client=pymongo_client)
+  asyncio.run(async_database_handler.get_course_bundle(course_name="computer_science"))
+  assert asyncio.run(async_database_handler.refresh_catalog_versions(force=True)) == []
+
+  all_tracks_information["track_1"]["CS301"]["year"] = 4
+  DatabaseHandler(pymongo_client=pymongo_client).publish_course(
+    course_name="computer_science",
+    course_catalog=course_catalog,
+    all_tracks_information=all_tracks_information,
+  )
+  assert asyncio.run(async_database_handler.refresh_catalog_versions()) == []
+  assert asyncio.run(async_database_handler.get_catalog_version("computer_science")) == 1
+
+  assert asyncio.run(async_database_handler.refresh_catalog_versions(force=True)) == ["computer_science"]
+  assert asyncio.run(async_database_handler.get_catalog_version("computer_science")) == 2
+  track_information = asyncio.run(async_database_handler.get_track_information(course_name="computer_science", track="track_1"))
+  assert track_information["CS301"]["year"] == 4
+
+
+def test_course_bundle_latency_is_recorded_once(pymongo_client, monkeypatch):
+  observed_methods = []
+  monkeypatch.setattr(metrics_handler, "observe", lambda name, value, **labels: observed_methods.append(labels.get("method")))
+  async_database_handler = AsyncDatabaseHandler(pymongo_client=pymongo_client)
+
+  asyncio.run(async_database_handler.get_course_bundle(course_name="computer_science"))
+  asyncio.run(async_database_handler.get_course_descriptions(course_name="computer_science"))
+
+  assert observed_methods == ["get_course_bundle", "get_course_descriptions"]
@@ -0,0 +1,86 @@
+import pytest
+from time import sleep
+from threading import Barrier, Thread
+from src.utils.cache_handler import CacheHandler
+
+
+def test_evicts_least_recently_used():
+  cache = CacheHandler(max_entries=2)
+  cache.set(("course", "a"), 1)
+  cache.set(("course", "b"), 2)
+  cache.get(("course", "a"))
+  cache.set(("course", "c"), 3)
+
+  assert cache.get(("course", "a")) == 1
+  assert cache.get(("course", "b")) is None
+  assert cache.get(("course", "c")) == 3
+  assert len(cache) == 2
+
+
+def test_counts_hits_and_misses():
+  cache = CacheHandler()
+  cache.set(("course", "a"), 1)
+  cache.get(("course", "a"))
+  cache.get(("course", "b"))
+
+  assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_get_or_set_runs_factory_once_for_concurrent_misses():
+  cache = CacheHandler()
+  calls = []
+  results = []
+  barrier = Barrier(8)
+
+  def factory():
+    calls.append(None)
+    sleep(0.05)
+    return "value"
+
+  def worker():
+    barrier.wait()
+    results.append(cache.get_or_set(("course", "a"), factory))
+
+  threads = [Thread(target=worker) for _ in range(8)]
+  for thread in threads:
+    thread.start()
+  for thread in threads:
+    thread.join()
+
+  assert len(calls) == 1
+  assert results == ["value"] * 8
+
+
+def test_get_or_set_does_not_cache_failures():
+  cache = CacheHandler()
+
+  def factory():
+    raise ValueError("unreachable")
+
+  with pytest.raises(ValueError):
+    cache.get_or_set(("course", "a"), factory)
+
+  assert cache.get_or_set(("course", "a"), lambda: "value") == "value"
+
+
+def test_invalidate_course():
+  cache = CacheHandler()
+  cache.set(("course", "a"), 1)
+  cache.set(("figure", "a", "track_1"), 2)
+  cache.set(("course", "b"), 3)
+  cache.set(("api", None, "catalogs"), 4)
+  cache.invalidate_course("a")
+
+  assert cache.get(("course", "a")) is None
+  assert cache.get(("figure", "a", "track_1")) is None
+  assert cache.get(("course", "b")) == 3
+  cache.invalidate_course(None)
+  assert cache.get(("api", None, "catalogs")) is None
+
+
+def test_clear():
+  cache = CacheHandler()
+  cache.set(("course", "a"), 1)
+  cache.clear()
+
+  assert len(cache) == 0
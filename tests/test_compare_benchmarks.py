@@ -0,0 +1,29 @@
+from benchmarks.run_benchmarks import RunBenchmarks
+from benchmarks.compare_benchmarks import CompareBenchmarks
+
+
+def benchmark_run(wall_times: list) -> dict:
+  return {
+    "results": [
+      {"stage": "Generate3DGraph.run", "n_courses": 1000, "repeat": repeat, "wall_time_s": wall_time}
+      for repeat, wall_time in enumerate(wall_times)
+    ],
+  }
+
+
+def test_default_repeats_are_enough_for_the_significance_test():
+  repeats = RunBenchmarks(sizes=[100]).repeats
+  baseline = benchmark_run([1.0, 1.02, 0.98, 1.01, 0.99][:repeats])
+  current = benchmark_run([1.5, 1.52, 1.48, 1.51, 1.49][:repeats])
+  finding, = CompareBenchmarks(baseline=baseline, current=current).run()
+
+  assert finding["status"] == "regression"
+  assert not finding["ratio_only"]
+  assert finding["p_value"] < 0.05
+
+
+def test_single_samples_are_judged_on_the_ratio_alone():
+  finding, = CompareBenchmarks(baseline=benchmark_run([1.0]), current=benchmark_run([1.05])).run()
+
+  assert finding["status"] == "insufficient_samples"
+  assert finding["p_value"] is None
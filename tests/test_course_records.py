@@ -0,0 +1,90 @@
+import pickle
+import pytest
+from array import array
+from src.utils.course_records import (
+  CompletePath,
+  CourseRecord,
+  CourseRecordCompactor,
+  split_course_table,
+  join_course_table,
+)
+
+
+def test_split_join_course_table_round_trip(all_tracks_information):
+  course_table, all_tracks_placements = split_course_table(all_tracks_information)
+
+  assert join_course_table(course_table, all_tracks_placements) == all_tracks_information
+
+
+def test_split_course_table_stores_shared_fields_once(all_tracks_information):
+  course_table, all_tracks_placements = split_course_table(all_tracks_information)
+
+  assert course_table["CS201"]["course_description"] == "Data Structures description"
+  assert "course_description" not in all_tracks_placements["track_1"]["CS201"]
+  assert all_tracks_placements["track_2"]["CS201"]["course_description"] == "A shorter description"
+  assert all_tracks_placements["track_1"]["CS201"]["year"] == 2
+  assert "course_name" not in all_tracks_placements["track_2"]["CS201"]
+
+
+def test_join_course_table_without_table():
+  all_tracks_placements = {"track_1": {"CS101": {"course_name": "Programming", "year": 1}}}
+
+  assert join_course_table({}, all_tracks_placements) == all_tracks_placements
+
+
+def test_course_record_mapping():
+  course_information = {"course_name": "Algorithms", "year": 3, "complete path": [], "elective": True}
+  record = CourseRecord(course_information)
+
+  assert record["course_name"] == "Algorithms"
+  assert record["complete path"] == []
+  assert record["elective"] is True
+  assert dict(record) == course_information
+  assert len(record) == len(course_information)
+  assert record.get("semester") is None
+  assert "semester" not in record
+  with pytest.raises(KeyError):
+    record["semester"]
+  with pytest.raises(KeyError):
+    record["unknown"]
+
+
+def test_course_record_pickle():
+  record = CourseRecord({"course_name": "Algorithms", "year": 3, "elective": True})
+  restored = pickle.loads(pickle.dumps(record))
+
+  assert restored == record
+  assert len(restored) == 3
+
+
+def test_complete_path_sequence():
+  path = CompletePath(["CS101", "CS201", "CS301"], array("I", [0, 1, 0, 1, 2, 1]))
+
+  assert len(path) == 2
+  assert path[0] == {"source": "CS101", "destination": "CS201", "relation": "prerequisite"}
+  assert path[-1] == {"source": "CS201", "destination": "CS301", "relation": "corequisite"}
+  assert path[1:] == [path[1]]
+  assert path == [dict(edge) for edge in path]
+  assert path != "CS101"
+  with pytest.raises(IndexError):
+    path[2]
+
+
+def test_compactor_joins_table_and_encodes_paths(all_tracks_information):
+  course_table, all_tracks_placements = split_course_table(all_tracks_information)
+  compacted = CourseRecordCompactor().compact_track_information(all_tracks_placements, course_table=course_table)
+
+  assert compacted == all_tracks_information
+  cs301 = compacted["track_1"]["CS301"]
+  assert isinstance(cs301, CourseRecord)
+  assert isinstance(cs301["complete path"], CompletePath)
+  assert cs301["complete path"].codes is compacted["track_2"]["CS201"]["complete path"].codes
+  assert compacted["track_1"]["CS101"]["prerequisites"] is compacted["track_2"]["CS101"]["prerequisites"]
+
+
+def test_compactor_keeps_paths_with_unknown_relations():
+  complete_path = [{"source": "CS101", "destination": "CS201", "relation": "recommended"}]
+  compacted = CourseRecordCompactor().compact_track_information({"track_1": {"CS201": {"complete path": complete_path}}})
+
+  assert compacted["track_1"]["CS201"]["complete path"] == complete_path
+  assert not isinstance(compacted["track_1"]["CS201"]["complete path"], CompletePath)
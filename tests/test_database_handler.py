@@ -0,0 +1,37 @@
+import gc
+import re
+from src.utils.database_handler import DatabaseHandler
+from src.utils.metrics_handler import metrics_handler
+
+
+def sample(name: str, labels: str = "") -> float:
+  match = re.search(rf"^course_trajectory_{name}{re.escape(labels)} (\S+)$", metrics_handler.render(), re.MULTILINE)
+  return float(match.group(1)) if match else 0.0
+
+
+def test_course_bundle_latency_is_recorded_once(database_handler):
+  bundle_calls = sample("database_duration_seconds_count", '{method="get_course_bundle"}')
+  catalog_calls = sample("database_duration_seconds_count", '{method="get_course_catalog_information"}')
+  track_calls = sample("database_duration_seconds_count", '{method="get_course_track_information"}')
+
+  course_bundle = database_handler.get_course_bundle(course_name="computer_science")
+  database_handler.get_course_descriptions(course_name="computer_science")
+
+  assert set(course_bundle.all_tracks_course_information) == {"track_1", "track_2"}
+  assert sample("database_duration_seconds_count", '{method="get_course_bundle"}') == bundle_calls + 1
+  assert sample("database_duration_seconds_count", '{method="get_course_catalog_information"}') == catalog_calls
+  assert sample("database_duration_seconds_count", '{method="get_course_track_information"}') == track_calls
+
+
+def test_garbage_collected_handler_leaves_the_metrics(pymongo_client):
+  gc.collect()
+  cache_hits = sample("cache_hits_total")
+
+  database_handler = DatabaseHandler(pymongo_client=pymongo_client)
+  database_handler.get_course_bundle(course_name="computer_science")
+  database_handler.get_course_bundle(course_name="computer_science")
+  assert sample("cache_hits_total") == cache_hits + 2
+
+  del database_handler
+  gc.collect()
+  assert sample("cache_hits_total") == cache_hits
@@ -0,0 +1,58 @@
+import json
+import pytest
+import mongomock
+from consts import config
+from src.generate_3d_graph import Generate3DGraph
+from src.export_graphs import ExportGraphs
+from src.utils.database_handler import DatabaseHandler
+
+
+def test_standalone_render_draws_every_course_with_its_description(synthetic_catalog, monkeypatch):
+  course_catalog, all_tracks_information = synthetic_catalog
+  monkeypatch.setitem(config["3D_COURSE_TRAJECTORY_CONSTS"], "lod_node_threshold", "10")
+  monkeypatch.setitem(config["3D_COURSE_TRAJECTORY_CONSTS"], "lazy_hover_descriptions", "true")
+
+  course_information = next(iter(all_tracks_information["track_1"].values()))
+  first_description_line = course_information["hover_text"].split("<br>")[0]
+
+  interactive_3d_graph_obj = Generate3DGraph("synthetic_catalog", course_catalog, all_tracks_information)
+  interactive_3d_graph_obj.run(track="track_1")
+  assert any(str(trace.get("meta")).startswith("aggregate_") for trace in interactive_3d_graph_obj.inline_figure["data"])
+  assert first_description_line not in str(interactive_3d_graph_obj.inline_figure)
+
+  html = ExportGraphs(output_directory="exports").render_track(
+    "synthetic_catalog",
+    course_catalog,
+    all_tracks_information,
+    "track_1",
+  ).decode("utf-8")
+  assert "aggregate_" not in html
+  assert first_description_line in html
+
+
+def test_export_keeps_finished_tracks_when_a_track_fails(synthetic_catalog, config_directory):
+  course_catalog, all_tracks_information = synthetic_catalog
+  all_tracks_information["track_3"] = all_tracks_information["track_1"]
+  pymongo_client = mongomock.MongoClient()
+  DatabaseHandler(pymongo_client=pymongo_client).publish_course(
+    course_name="synthetic_catalog",
+    course_catalog=course_catalog,
+    all_tracks_information=all_tracks_information,
+  )
+
+  def export() -> dict:
+    return ExportGraphs(
+      output_directory="exports",
+      max_workers=2,
+      database_handler=DatabaseHandler(pymongo_client=pymongo_client),
+    ).run()
+
+  report = export()
+  assert report["rendered"] == report["written"] == 2
+  assert [failure["path"] for failure in report["failed"]] == ["synthetic_catalog/track_3.html"]
+  assert "KeyError" in report["failed"][0]["error"]
+  with open(config_directory / "exports" / "manifest.json") as f:
+    assert sorted(json.load(f)) == ["synthetic_catalog/track_1.html", "synthetic_catalog/track_2.html"]
+
+  report = export()
+  assert (report["rendered"], report["skipped"], len(report["failed"])) == (0, 2, 1)
@@ -0,0 +1,50 @@
+import csv
+import json
+import os
+from src.export_paths import ExportPaths
+
+
+def write_track(data_directory, course_name: str, track: str, track_information: dict) -> None:
+  os.makedirs(data_directory / course_name / track, exist_ok=True)
+  with open(data_directory / course_name / track / f"{track}_specific_information.json", "w") as f:
+    json.dump(track_information, f)
+
+
+def read_rows(output_path) -> list:
+  with open(output_path, newline="") as f:
+    return list(csv.DictReader(f))
+
+
+def test_export_writes_every_edge_of_every_complete_path(synthetic_catalog, tmp_path):
+  _, all_tracks_information = synthetic_catalog
+  n_rows = ExportPaths(output_path=str(tmp_path / "exports" / "course_paths.csv")).run()
+  rows = read_rows(tmp_path / "exports" / "course_paths.csv")
+
+  assert n_rows == len(rows) == sum(
+    len(course_information["complete path"])
+    for track_information in all_tracks_information.values()
+    for course_information in track_information.values()
+  )
+  assert {row["catalog"] for row in rows} == {"synthetic_catalog"}
+  assert [row["track"] for row in rows] == sorted((row["track"] for row in rows), key=lambda track: int(track.split("_")[-1]))
+
+  target_course, course_information = next(
+    (course, course_information)
+    for course, course_information in all_tracks_information["track_1"].items()
+    if course_information["complete path"]
+  )
+  path_rows = [row for row in rows if row["track"] == "track_1" and row["target_course"] == target_course]
+  assert [(row["source"], row["destination"], row["relation"]) for row in path_rows] == [
+    (edge["source"], edge["destination"], edge["relation"]) for edge in course_information["complete path"]
+  ]
+  assert [int(row["step"]) for row in path_rows] == list(range(1, len(path_rows) + 1))
+
+
+def test_export_orders_tracks_by_number(tmp_path):
+  edge = {"source": "CS101", "destination": "CS201", "relation": "prerequisite"}
+  for track in ("track_10", "track_2", "track_1"):
+    write_track(tmp_path / "data", "computer_science", track, {"CS201": {"complete path": [edge]}, "CS101": {"complete path": []}})
+
+  ExportPaths(output_path=str(tmp_path / "course_paths.csv"), data_directory=str(tmp_path / "data")).run()
+
+  assert [row["track"] for row in read_rows(tmp_path / "course_paths.csv")] == ["track_1", "track_2", "track_10"]
@@ -0,0 +1,50 @@
+import base64
+import pytest
+import numpy as np
+import plotly.graph_objects as go
+from src.utils.figure_serializer import FigureSerializer
+
+
+@pytest.fixture
+def figure_serializer() -> FigureSerializer:
+  figure_serializer = FigureSerializer()
+  figure_serializer.precision = 3
+  return figure_serializer
+
+
+def test_rounds_short_coordinates(figure_serializer):
+  figure = figure_serializer.serialize({"data": [{"x": [0.12345, 1, 2.0006], "y": (1.0, 2.0, 3.0)}]})
+
+  assert figure["data"][0]["x"] == [0.123, 1.0, 2.001]
+  assert figure["data"][0]["y"] == [1.0, 2.0, 3.0]
+
+
+def test_keeps_gaps_between_segments(figure_serializer):
+  figure = figure_serializer.serialize({"data": [{"x": [0.12345, 1.98765, None, 3.3333, 4, None]}]})
+
+  assert figure["data"][0]["x"] == [0.123, 1.988, None, 3.333, 4.0, None]
+
+
+def test_leaves_non_numeric_values(figure_serializer):
+  figure = figure_serializer.serialize({"data": [{"x": ["a", "b"], "customdata": [0.12345]}]})
+
+  assert figure["data"][0]["x"] == ["a", "b"]
+  assert figure["data"][0]["customdata"] == [0.12345]
+
+
+def test_encodes_long_coordinates_as_typed_arrays(figure_serializer):
+  if not figure_serializer.typed_arrays:
+    pytest.skip("the bundled plotly.js does not decode typed arrays")
+
+  values = np.arange(figure_serializer.typed_array_min_length) / 3
+  encoded = figure_serializer.serialize({"data": [{"z": values}]})["data"][0]["z"]
+
+  decoded = np.frombuffer(base64.b64decode(encoded["bdata"]), dtype=encoded["dtype"])
+  np.testing.assert_array_equal(decoded, np.round(values, 3).astype(encoded["dtype"]))
+
+
+def test_serializes_figures(figure_serializer):
+  figure = figure_serializer.serialize(go.Figure(go.Scatter3d(x=[0.12345], y=[0], z=[1])))
+
+  assert figure["data"][0]["x"] == [0.123]
+  assert figure["data"][0]["type"] == "scatter3d"
@@ -0,0 +1,78 @@
+import pytest
+from flask import Flask
+from dash.exceptions import PreventUpdate
+from src.utils.metrics_handler import MetricsHandler, metrics_handler
+from src.utils.render_scheduler import RenderScheduler
+
+
+def test_render_prometheus_text_format():
+  metrics = MetricsHandler(prefix="test")
+  metrics.describe("requests_total", "counter", "Requests served.")
+  metrics.increment("requests_total", route="/")
+  metrics.increment("requests_total", 2, route="/")
+  metrics.observe("duration_seconds", 0.02, buckets=(0.01, 0.1))
+  metrics.observe("duration_seconds", 0.5, buckets=(0.01, 0.1))
+  metrics.register_collector(lambda: [("entries", {}, 3)])
+
+  lines = metrics.render().splitlines()
+  assert "# TYPE test_requests_total counter" in lines
+  assert "# HELP test_requests_total Requests served." in lines
+  assert 'test_requests_total{route="/"} 3' in lines
+  assert "# TYPE test_entries gauge" in lines
+  assert "test_entries 3" in lines
+  assert "# TYPE test_duration_seconds histogram" in lines
+  assert 'test_duration_seconds_bucket{le="0.01"} 0' in lines
+  assert 'test_duration_seconds_bucket{le="0.1"} 1' in lines
+  assert 'test_duration_seconds_bucket{le="+Inf"} 2' in lines
+  assert "test_duration_seconds_count 2" in lines
+
+
+def test_cache_statistics_are_exposed_as_counters(database_handler):
+  render_scheduler = RenderScheduler(database_handler=database_handler)
+  lines = metrics_handler.render().splitlines()
+
+  for name in ("cache_hits_total", "cache_misses_total", "figure_cache_hits_total", "figure_cache_misses_total"):
+    assert f"# TYPE course_trajectory_{name} counter" in lines
+  for name in ("cache_entries", "figure_cache_entries"):
+    assert f"# TYPE course_trajectory_{name} gauge" in lines
+
+
+def test_instrumented_callback_records_latency_and_errors():
+  metrics = MetricsHandler(prefix="test")
+
+  @metrics.instrument_callback
+  def update_figure(value):
+    if value is None:
+      raise PreventUpdate
+    if value < 0:
+      raise ValueError(value)
+    return value
+
+  assert update_figure(1) == 1
+  with pytest.raises(PreventUpdate):
+    update_figure(None)
+  with pytest.raises(ValueError):
+    update_figure(-1)
+
+  lines = metrics.render().splitlines()
+  assert 'test_callback_duration_seconds_count{callback="update_figure"} 3' in lines
+  assert 'test_callback_errors_total{callback="update_figure"} 1' in lines
+
+
+def test_callback_requests_get_server_timing_and_size_metrics():
+  metrics = MetricsHandler(prefix="test")
+  server = Flask(__name__)
+  metrics.register(server)
+
+  @metrics.instrument_callback
+  def update_figure():
+    return "figure"
+
+  server.add_url_rule("/_dash-update-component", view_func=update_figure, methods=["POST"])
+  response = server.test_client().post("/_dash-update-component", data="{}")
+
+  assert response.headers["Server-Timing"].startswith("cb_update_figure;dur=")
+  assert 'mongo;desc="0 queries"' in response.headers["Server-Timing"]
+  lines = server.test_client().get(metrics.route).get_data(as_text=True).splitlines()
+  assert 'test_callback_response_bytes_count{callback="update_figure"} 1' in lines
+  assert 'test_callback_mongo_queries_bucket{callback="update_figure",le="0"} 1' in lines
@@ -0,0 +1,18 @@
+from src.utils.course_formatting import add_intermediate_br_tags
+from src.utils.course_records import split_course_table
+
+
+def test_hover_text_is_wrapped_once_when_preparing(synthetic_catalog):
+  _, all_tracks_information = synthetic_catalog
+
+  for track_information in all_tracks_information.values():
+    for course_information in track_information.values():
+      assert course_information["hover_text"] == add_intermediate_br_tags(course_information["course_description"])
+
+
+def test_hover_text_is_stored_in_the_course_table(synthetic_catalog):
+  _, all_tracks_information = synthetic_catalog
+  course_table, all_tracks_placements = split_course_table(all_tracks_information)
+
+  assert all("hover_text" in course_information for course_information in course_table.values())
+  assert not any("hover_text" in placement for placements in all_tracks_placements.values() for placement in placements.values())
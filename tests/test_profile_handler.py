@@ -0,0 +1,93 @@
+import os
+import pytest
+from flask import Flask
+from threading import Event, Thread
+from consts import config
+from src.utils.profile_handler import ProfileHandler
+
+
+@pytest.fixture
+def profile_handler(tmp_path, monkeypatch) -> ProfileHandler:
+  monkeypatch.setitem(config["PROFILE_CONSTS"], "directory", str(tmp_path / "profiles"))
+  monkeypatch.setitem(config["PROFILE_CONSTS"], "admin_token", "secret")
+  return ProfileHandler()
+
+
+def profiles(profile_handler) -> list:
+  return sorted(os.listdir(profile_handler.directory)) if os.path.isdir(profile_handler.directory) else []
+
+
+def call_in_background(profile_handler, callback_name) -> tuple:
+  started, release = Event(), Event()
+
+  def callback():
+    started.set()
+    release.wait(timeout=30)
+
+  thread = Thread(target=profile_handler.call, args=(callback_name, callback))
+  thread.start()
+  started.wait(timeout=30)
+  return thread, release
+
+
+def test_armed_invocations_are_profiled_then_disarmed(profile_handler):
+  profile_handler.arm("update_figure", 2)
+
+  assert profile_handler.call("update_figure", sum, [1, 2]) == 3
+  assert profile_handler.get_armed() == {"update_figure": 1}
+  profile_handler.call("update_figure", sum, [1, 2])
+  profile_handler.call("update_figure", sum, [1, 2])
+
+  assert profile_handler.get_armed() == {}
+  assert len([file_name for file_name in profiles(profile_handler) if file_name.endswith(".prof")]) == 2
+  assert len([file_name for file_name in profiles(profile_handler) if file_name.endswith(".tracemalloc")]) == 2
+  assert "update_figure" in profile_handler.summary()
+
+
+def test_unarmed_callback_does_not_block_profiling(profile_handler):
+  profile_handler.arm("update_figure", 1)
+  thread, release = call_in_background(profile_handler, "develop_path")
+
+  profile_handler.call("update_figure", sum, [1, 2])
+  release.set()
+  thread.join()
+
+  assert profile_handler.get_armed() == {}
+  assert len(profiles(profile_handler)) == 2
+
+
+def test_concurrent_armed_invocation_stays_armed(profile_handler):
+  profile_handler.arm("update_figure", 2)
+  thread, release = call_in_background(profile_handler, "update_figure")
+
+  profile_handler.call("update_figure", sum, [1, 2])
+  assert profile_handler.get_armed() == {"update_figure": 1}
+  release.set()
+  thread.join()
+
+  assert len(profiles(profile_handler)) == 2
+
+
+def test_arm_rejects_non_positive_counts(profile_handler):
+  with pytest.raises(ValueError):
+    profile_handler.arm("update_figure", 0)
+
+  server = Flask(__name__)
+  profile_handler.register(server)
+  client = server.test_client()
+  headers = {"X-Admin-Token": "secret"}
+
+  assert client.post("/admin/profiling/arm", data={"callback": "update_figure", "count": "-1"}, headers=headers).status_code == 400
+  response = client.post("/admin/profiling/arm", data={"callback": "update_figure", "count": "3"}, headers=headers)
+  assert response.status_code == 200
+  assert profile_handler.get_armed() == {"update_figure": 3}
+
+
+def test_routes_require_the_admin_token(profile_handler):
+  server = Flask(__name__)
+  profile_handler.register(server)
+  client = server.test_client()
+
+  assert client.get("/admin/profiling").status_code == 403
+  assert client.get("/admin/profiling", query_string={"token": "sécret"}).status_code == 403
+  assert client.get("/admin/profiling", headers={"X-Admin-Token": "secret"}).status_code == 200
@@ -0,0 +1,62 @@
+import pytest
+from flask import Flask
+from src.query_api import QueryAPI
+
+
+@pytest.fixture
+def client(database_handler):
+  server = Flask(__name__)
+  query_api = QueryAPI(database_handler=database_handler)
+  query_api.register(server)
+  return server.test_client()
+
+
+def test_catalogs(client):
+  response = client.get("/api/v1/catalogs")
+
+  assert response.status_code == 200
+  assert response.get_json() == {"catalogs": [["computer_science", 2]]}
+
+
+def test_answers_matching_etag_with_not_modified(client):
+  response = client.get("/api/v1/catalogs/computer_science/track_1/courses")
+  etag = response.headers["ETag"]
+
+  cached_response = client.get("/api/v1/catalogs/computer_science/track_1/courses", headers={"If-None-Match": etag})
+  assert cached_response.status_code == 304
+  assert cached_response.data == b""
+
+  stale_response = client.get("/api/v1/catalogs/computer_science/track_1/courses", headers={"If-None-Match": '"stale"'})
+  assert stale_response.status_code == 200
+  assert stale_response.headers["ETag"] == etag
+
+
+def test_etag_changes_when_the_catalog_is_published(client, database_handler, course_catalog, all_tracks_information):
+  etag = client.get("/api/v1/catalogs/computer_science/track_1/courses").headers["ETag"]
+  all_tracks_information["track_1"]["CS301"]["year"] = 4
+  database_handler.publish_course(
+    course_name="computer_science",
+    course_catalog=course_catalog,
+    all_tracks_information=all_tracks_information,
+  )
+  database_handler.refresh_catalog_versions(force=True)
+
+  response = client.get("/api/v1/catalogs/computer_science/track_1/courses", headers={"If-None-Match": etag})
+  assert response.status_code == 200
+  assert response.headers["ETag"] != etag
+  assert ["CS301", "Algorithms", 4, 2, 2, 0] in response.get_json()["rows"]
+
+
+def test_paths(client):
+  response = client.get("/api/v1/catalogs/computer_science/track_1/paths?course=CS301&course=CS999")
+
+  assert response.get_json() == {
+    "paths": {"CS301": [["CS101", "CS201", "prerequisite"], ["CS201", "CS301", "prerequisite"]]},
+    "unknown": ["CS999"],
+  }
+
+
+def test_errors(client):
+  assert client.get("/api/v1/catalogs/physics/descriptions").status_code == 404
+  assert client.get("/api/v1/catalogs/computer_science/track_9/courses").status_code == 404
+  assert client.get("/api/v1/catalogs/computer_science/track_1/paths").status_code == 400
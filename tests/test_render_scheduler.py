@@ -0,0 +1,98 @@
+import pytest
+import mongomock
+from threading import Event
+from src.utils.database_handler import DatabaseHandler
+from src.utils.metrics_handler import metrics_handler
+from src.utils.render_scheduler import RenderScheduler
+from src.utils.thread_job_manager import JobCancelled, job_cancel_event
+
+
+@pytest.fixture
+def synthetic_database_handler(synthetic_catalog) -> DatabaseHandler:
+  course_catalog, all_tracks_information = synthetic_catalog
+  pymongo_client = mongomock.MongoClient()
+  DatabaseHandler(pymongo_client=pymongo_client).publish_course(
+    course_name="synthetic_catalog",
+    course_catalog=course_catalog,
+    all_tracks_information=all_tracks_information,
+  )
+  return DatabaseHandler(pymongo_client=pymongo_client)
+
+
+@pytest.fixture
+def render_modes(monkeypatch) -> list:
+  render_modes = []
+  observe = metrics_handler.observe
+
+  def record(name, value, **labels):
+    if name == "render_duration_seconds":
+      render_modes.append(labels["mode"])
+    observe(name, value, **labels)
+
+  monkeypatch.setattr(metrics_handler, "observe", record)
+  return render_modes
+
+
+def test_render_prefetches_the_other_tracks(synthetic_database_handler, render_modes):
+  render_scheduler = RenderScheduler(database_handler=synthetic_database_handler)
+  render_scheduler.prefetch_enabled = True
+
+  layout = render_scheduler.render("synthetic_catalog", "track_1")
+  figure = render_scheduler.fullscreen_figure("synthetic_catalog", "track_2")
+
+  assert layout is not None and figure is not None
+  assert render_modes == ["request", "prefetch"]
+  assert render_scheduler.cache.get(("figure", "synthetic_catalog", "track_1")) is not None
+  assert render_scheduler.cache.get(("figure", "synthetic_catalog", "track_2")) is not None
+
+
+def test_cached_track_is_not_rebuilt(synthetic_database_handler, render_modes):
+  render_scheduler = RenderScheduler(database_handler=synthetic_database_handler)
+  render_scheduler.prefetch_enabled = False
+
+  render_scheduler.render("synthetic_catalog", "track_1")
+  render_scheduler.render("synthetic_catalog", "track_1")
+  render_scheduler.fullscreen_figure("synthetic_catalog", "track_1")
+  render_scheduler.warm("synthetic_catalog", "track_1")
+
+  assert render_modes == ["request"]
+
+
+def test_figure_built_during_a_catalog_update_is_not_cached(synthetic_database_handler, monkeypatch):
+  render_scheduler = RenderScheduler(database_handler=synthetic_database_handler)
+  render_scheduler.prefetch_enabled = False
+  catalog_versions = iter([1, 2])
+  monkeypatch.setattr(synthetic_database_handler, "get_catalog_version", lambda course_name: next(catalog_versions))
+
+  assert render_scheduler.render("synthetic_catalog", "track_1") is not None
+  assert render_scheduler.cache.get(("figure", "synthetic_catalog", "track_1")) is None
+
+
+def test_republished_catalog_drops_its_figures(synthetic_database_handler, synthetic_catalog):
+  course_catalog, all_tracks_information = synthetic_catalog
+  render_scheduler = RenderScheduler(database_handler=synthetic_database_handler)
+  render_scheduler.prefetch_enabled = False
+  render_scheduler.render("synthetic_catalog", "track_1")
+
+  DatabaseHandler(pymongo_client=synthetic_database_handler.pymongo_client).publish_course(
+    course_name="synthetic_catalog",
+    course_catalog=course_catalog,
+    all_tracks_information=all_tracks_information,
+  )
+  assert synthetic_database_handler.refresh_catalog_versions(force=True) == ["synthetic_catalog"]
+  assert render_scheduler.cache.get(("figure", "synthetic_catalog", "track_1")) is None
+
+
+def test_terminated_job_stops_before_rendering(synthetic_database_handler, render_modes):
+  render_scheduler = RenderScheduler(database_handler=synthetic_database_handler)
+  render_scheduler.prefetch_enabled = False
+  cancel_event = Event()
+  cancel_event.set()
+  token = job_cancel_event.set(cancel_event)
+  try:
+    with pytest.raises(JobCancelled):
+      render_scheduler.render("synthetic_catalog", "track_1")
+  finally:
+    job_cancel_event.reset(token)
+
+  assert render_scheduler.cache.get(("figure", "synthetic_catalog", "track_1")) is None
@@ -0,0 +1,64 @@
+import pytest
+from dash import no_update
+from dash.exceptions import PreventUpdate
+from components import sidebar, track_tabs
+from src.utils.database_handler import DatabaseHandler
+
+
+@pytest.fixture
+def app_database_handler(pymongo_client, course_catalog, all_tracks_information, monkeypatch) -> DatabaseHandler:
+  DatabaseHandler(pymongo_client=pymongo_client).publish_course(
+    course_name="software_engineering",
+    course_catalog=course_catalog,
+    all_tracks_information=all_tracks_information,
+  )
+  database_handler = DatabaseHandler(pymongo_client=pymongo_client)
+  database_handler.version_poll_interval = 0
+  monkeypatch.setattr(sidebar, "database_handler", database_handler)
+  monkeypatch.setattr(track_tabs, "database_handler", database_handler)
+  return database_handler
+
+
+def remove_course(pymongo_client, course_name: str) -> None:
+  pymongo_client["courses_catalog"].drop_collection(course_name)
+  pymongo_client["courses_track_information"].drop_collection(course_name)
+  pymongo_client["courses_metadata"]["catalog_versions"].delete_one({"_id": course_name})
+
+
+def test_first_load_selects_the_first_catalog(app_database_handler):
+  options, value, catalog_versions, _ = sidebar.refresh_course_catalogs(0, None, None)
+
+  assert [option["value"] for option in options] == ["computer_science", "software_engineering"]
+  assert value == "computer_science"
+  assert catalog_versions == {"computer_science": 1, "software_engineering": 1}
+
+
+def test_republished_catalog_refreshes_the_selected_catalog(app_database_handler, pymongo_client, course_catalog, all_tracks_information):
+  _, _, catalog_versions, _ = sidebar.refresh_course_catalogs(0, None, None)
+  with pytest.raises(PreventUpdate):
+    sidebar.refresh_course_catalogs(1, catalog_versions, "computer_science")
+
+  DatabaseHandler(pymongo_client=pymongo_client).publish_course(
+    course_name="software_engineering",
+    course_catalog=course_catalog,
+    all_tracks_information=all_tracks_information,
+  )
+  _, value, new_catalog_versions, course_catalog_store = sidebar.refresh_course_catalogs(2, catalog_versions, "computer_science")
+  assert (value, course_catalog_store) == (no_update, no_update)
+  assert new_catalog_versions["software_engineering"] == 2
+
+  _, value, _, course_catalog_store = sidebar.refresh_course_catalogs(3, catalog_versions, "software_engineering")
+  assert (value, course_catalog_store) == (no_update, "software_engineering")
+
+
+def test_removed_catalog_selects_another_catalog(app_database_handler, pymongo_client):
+  _, _, catalog_versions, _ = sidebar.refresh_course_catalogs(0, None, None)
+
+  remove_course(pymongo_client, "computer_science")
+  options, value, new_catalog_versions, _ = sidebar.refresh_course_catalogs(1, catalog_versions, "computer_science")
+  assert [option["value"] for option in options] == ["software_engineering"]
+  assert value == "software_engineering"
+  assert "computer_science" not in new_catalog_versions
+
+  with pytest.raises(PreventUpdate):
+    track_tabs.update_tab_content(lambda _: None, "track_1", "computer_science")
@@ -0,0 +1,180 @@
+from time import monotonic, sleep
+from threading import Event
+from dash import ctx, set_props
+from dash.exceptions import PreventUpdate
+from src.utils.thread_job_manager import ThreadJobManager, raise_if_cancelled
+
+
+CONTEXT = {
+  "triggered_inputs": [{"prop_id": "card-tabs.active_tab", "value": "track_2"}],
+  "inputs_list": [],
+  "states_list": [],
+  "outputs_list": [],
+}
+
+
+def run_job(manager: ThreadJobManager,
+            fn,
+            args: list,
+            key: str = "result",
+            progress: bool = False,
+            timeout: float = 5):
+  job_fn = manager.make_job_fn(fn, progress)
+  job = manager.call_job_fn(key, job_fn, args, CONTEXT)
+  deadline = monotonic() + timeout
+  while not manager.result_ready(key):
+    assert monotonic() < deadline, "the job did not finish"
+    sleep(0.01)
+  return job, manager.get_result(key, job)
+
+
+def test_memoizes_results():
+  manager = ThreadJobManager(cache_by=[lambda: 1])
+  calls = []
+
+  def fn(value):
+    calls.append(value)
+    return value * 2
+
+  assert run_job(manager, fn, [21])[1] == 42
+  assert run_job(manager, fn, [21])[1] == 42
+  assert calls == [21]
+
+
+def test_drops_results_once_read_without_cache_by():
+  manager = ThreadJobManager()
+  _, result = run_job(manager, lambda value: value, [1])
+
+  assert result == 1
+  assert not manager.result_ready("result")
+
+
+def test_does_not_memoize_errors():
+  manager = ThreadJobManager(cache_by=[lambda: 1])
+
+  def fn(value):
+    raise ValueError(value)
+
+  _, result = run_job(manager, fn, [1])
+  assert result["long_callback_error"]["msg"] == "1"
+  assert not manager.result_ready("result")
+
+
+def test_prevent_update():
+  manager = ThreadJobManager()
+
+  def fn():
+    raise PreventUpdate
+
+  assert run_job(manager, fn, [])[1] == {"_dash_no_update": "_dash_no_update"}
+
+
+def test_evicts_least_recently_used_results():
+  manager = ThreadJobManager(max_entries=2, cache_by=[lambda: 1])
+  for key in ["a", "b", "c"]:
+    run_job(manager, lambda value: value, [key], key=key)
+
+  assert not manager.result_ready("a")
+  assert manager.result_ready("b") and manager.result_ready("c")
+
+
+def test_callback_context_and_set_props():
+  manager = ThreadJobManager()
+
+  def fn():
+    set_props("render-progress", {"children": "done"})
+    return ctx.triggered_id
+
+  _, result = run_job(manager, fn, [])
+  assert result == "card-tabs"
+  assert manager.get_updated_props("result") == {"render-progress": {"children": "done"}}
+  assert manager.get_updated_props("result") == {}
+
+
+def test_progress_is_dropped_once_the_result_is_collected():
+  manager = ThreadJobManager()
+  release = Event()
+
+  def fn(set_progress):
+    set_progress("Rendering...")
+    release.wait(5)
+    return "layout"
+
+  job_fn = manager.make_job_fn(fn, True)
+  job = manager.call_job_fn("result", job_fn, [], CONTEXT)
+  deadline = monotonic() + 5
+  while manager.get_progress("result") is None:
+    assert monotonic() < deadline
+    sleep(0.01)
+
+  release.set()
+  while not manager.result_ready("result"):
+    sleep(0.01)
+  assert manager.get_result("result", job) == "layout"
+  assert manager.get_progress("result") is None
+
+
+def test_terminate_stops_a_running_job():
+  manager = ThreadJobManager(cache_by=[lambda: 1])
+  started, finished, steps = Event(), Event(), []
+
+  def fn(set_progress):
+    started.set()
+    try:
+      for step in range(500):
+        steps.append(step)
+        set_progress(step)
+        raise_if_cancelled()
+        sleep(0.01)
+      return "layout"
+    finally:
+      finished.set()
+
+  job = manager.call_job_fn("result", manager.make_job_fn(fn, True), [], CONTEXT)
+  started.wait(5)
+  assert manager.job_running(job)
+  manager.terminate_job(job)
+
+  assert finished.wait(5)
+  assert len(steps) < 500
+  assert not manager.job_running(job)
+  assert not manager.result_ready("result")
+  assert manager.get_progress("result") is None
+
+
+def test_terminate_cancels_a_queued_job():
+  manager = ThreadJobManager(max_workers=1)
+  release = Event()
+  calls = []
+
+  blocking_job = manager.call_job_fn("a", manager.make_job_fn(lambda: release.wait(5), False), [], CONTEXT)
+  queued_job = manager.call_job_fn("b", manager.make_job_fn(lambda: calls.append(None), False), [], CONTEXT)
+  manager.terminate_job(queued_job)
+  release.set()
+
+  deadline = monotonic() + 5
+  while not manager.result_ready("a"):
+    assert monotonic() < deadline
+    sleep(0.01)
+  manager.get_result("a", blocking_job)
+  sleep(0.05)
+  assert calls == []
+  assert not manager.result_ready("b")
+
+
+def test_bounds_uncollected_progress():
+  manager = ThreadJobManager(max_entries=2)
+
+  def fn(set_progress, value):
+    set_progress(value)
+    return value
+
+  for key in ["a", "b", "c"]:
+    manager.call_job_fn(key, manager.make_job_fn(fn, True), [key], CONTEXT)
+    deadline = monotonic() + 5
+    while not manager.result_ready(key):
+      assert monotonic() < deadline
+      sleep(0.01)
+
+  assert manager.get_progress("a") is None
+  assert manager.get_progress("c") == ["c"]
@@ -0,0 +1,97 @@
+import os
+import json
+import pytest
+from flask import Flask, g
+from consts import config
+from src.utils.trace_handler import TraceHandler
+
+
+@pytest.fixture
+def trace_consts(tmp_path, monkeypatch) -> dict:
+  trace_consts = {
+    "enabled": "true",
+    "sample_rate": "1",
+    "slow_threshold_ms": "1000",
+    "directory": str(tmp_path / "traces"),
+    "max_files": "3",
+  }
+  for key, value in trace_consts.items():
+    monkeypatch.setitem(config["TRACE_CONSTS"], key, value)
+  return trace_consts
+
+
+def load_events(file_path: str) -> dict:
+  with open(file_path) as f:
+    return {event["name"]: event for event in json.load(f)["traceEvents"]}
+
+
+def test_sampled_trace_records_nested_spans(trace_consts):
+  trace_handler = TraceHandler()
+  trace_handler.start_trace("update_tab_content", tab="track_1")
+  with trace_handler.span("database.get_course_bundle", course_name="computer_science"):
+    with trace_handler.span("render"):
+      pass
+  trace_handler.begin_span("left_open")
+  file_path = trace_handler.end_trace()
+
+  events = load_events(file_path)
+  assert set(events) == {"update_tab_content", "database.get_course_bundle", "render", "left_open"}
+  assert events["update_tab_content"]["args"] == {"tab": "track_1"}
+  assert events["database.get_course_bundle"]["args"] == {"course_name": "computer_science"}
+  parent, child = events["database.get_course_bundle"], events["render"]
+  assert parent["ts"] <= child["ts"] and child["ts"] + child["dur"] <= parent["ts"] + parent["dur"] + 0.1
+  assert all(event["ph"] == "X" for event in events.values())
+
+
+def test_unsampled_trace_is_written_only_when_slow(trace_consts, monkeypatch):
+  monkeypatch.setitem(config["TRACE_CONSTS"], "sample_rate", "0")
+  trace_handler = TraceHandler()
+  trace_handler.start_trace("fast")
+  assert trace_handler.end_trace() is None
+
+  monkeypatch.setitem(config["TRACE_CONSTS"], "slow_threshold_ms", "0")
+  trace_handler = TraceHandler()
+  trace_handler.start_trace("slow")
+  assert trace_handler.end_trace() is not None
+
+
+def test_spans_outside_a_trace_are_ignored(trace_consts):
+  trace_handler = TraceHandler()
+  with trace_handler.span("database.get_courses_catalog"):
+    pass
+
+  assert trace_handler.end_trace() is None
+  assert not os.path.exists(trace_consts["directory"])
+
+
+def test_oldest_trace_files_are_rotated(trace_consts):
+  trace_handler = TraceHandler()
+  file_paths = []
+  for i in range(5):
+    trace_handler.start_trace(f"callback_{i}")
+    file_paths.append(trace_handler.end_trace())
+
+  assert sorted(os.listdir(trace_consts["directory"])) == sorted(os.path.basename(file_path) for file_path in file_paths[-3:])
+
+
+def test_callback_requests_are_traced_with_their_serialization(trace_consts):
+  trace_handler = TraceHandler()
+  server = Flask(__name__)
+  trace_handler.register(server)
+
+  @server.route("/_dash-update-component", methods=["POST"])
+  def update_component():
+    g.callback_name = "update_tab_content"
+    with trace_handler.span("callback.update_tab_content"):
+      pass
+    trace_handler.mark()
+    return "{}"
+
+  server.test_client().post("/_dash-update-component")
+  server.test_client().get("/")
+
+  file_names = os.listdir(trace_consts["directory"])
+  assert len(file_names) == 1 and "update_tab_content" in file_names[0]
+  events = load_events(os.path.join(trace_consts["directory"], file_names[0]))
+  assert set(events) == {"update_tab_content", "callback.update_tab_content", "json_serialization"}
+  assert events["json_serialization"]["args"] == {"bytes": "2"}
@@ -0,0 +1,73 @@
+import pytest
+import mongomock
+from flask import Flask
+from consts import config
+from src.utils.database_handler import DatabaseHandler
+from src.utils.render_scheduler import RenderScheduler
+from src.utils.warm_up_handler import WarmUpHandler
+
+
+@pytest.fixture
+def two_catalogs(synthetic_catalog) -> DatabaseHandler:
+  course_catalog, all_tracks_information = synthetic_catalog
+  pymongo_client = mongomock.MongoClient()
+  for course_name in ("computer_science", "software_engineering"):
+    DatabaseHandler(pymongo_client=pymongo_client).publish_course(
+      course_name=course_name,
+      course_catalog=course_catalog,
+      all_tracks_information=all_tracks_information,
+    )
+  return DatabaseHandler(pymongo_client=pymongo_client)
+
+
+def test_warm_up_builds_every_track_of_every_catalog(two_catalogs):
+  render_scheduler = RenderScheduler(database_handler=two_catalogs)
+  status = WarmUpHandler(render_scheduler).run()
+
+  assert status["warmed"] == 4
+  assert (status["failed"], status["skipped"], status["uncached"]) == (0, 0, 0)
+  for course_name in ("computer_science", "software_engineering"):
+    for track in ("track_1", "track_2"):
+      assert render_scheduler.cache.get(("figure", course_name, track)) is not None
+
+
+def test_warm_up_stops_at_top_n_then_at_the_figure_cache_size(two_catalogs, monkeypatch):
+  monkeypatch.setitem(config["WARM_UP_CONSTS"], "top_n", "3")
+  render_scheduler = RenderScheduler(database_handler=two_catalogs)
+  status = WarmUpHandler(render_scheduler).run()
+
+  assert (status["warmed"], status["uncached"]) == (3, 0)
+  assert render_scheduler.cache.get(("figure", "computer_science", "track_1")) is not None
+  assert render_scheduler.cache.get(("figure", "software_engineering", "track_1")) is not None
+
+  monkeypatch.setitem(config["WARM_UP_CONSTS"], "top_n", "0")
+  monkeypatch.setitem(config["RENDER_CONSTS"], "cache_max_entries", "2")
+  render_scheduler = RenderScheduler(database_handler=two_catalogs)
+  status = WarmUpHandler(render_scheduler).run()
+
+  assert (status["warmed"], status["uncached"]) == (2, 2)
+  assert render_scheduler.cache.get(("figure", "computer_science", "track_1")) is not None
+  assert render_scheduler.cache.get(("figure", "software_engineering", "track_1")) is not None
+
+
+def test_readiness_route_retries_a_failed_warm_up(two_catalogs, monkeypatch):
+  def unreachable():
+    raise ConnectionError("MongoDB is unreachable")
+
+  render_scheduler = RenderScheduler(database_handler=two_catalogs)
+  get_catalog_snapshot = two_catalogs.get_catalog_snapshot
+  monkeypatch.setattr(two_catalogs, "get_catalog_snapshot", unreachable)
+  warm_up_handler = WarmUpHandler(render_scheduler)
+  server = Flask(__name__)
+  warm_up_handler.register(server)
+
+  warm_up_handler.run()
+  assert warm_up_handler.failed()
+
+  monkeypatch.setattr(two_catalogs, "get_catalog_snapshot", get_catalog_snapshot)
+  response = server.test_client().get(warm_up_handler.route)
+  assert response.status_code == 503
+  warm_up_handler.ready.wait(timeout=30)
+  response = server.test_client().get(warm_up_handler.route)
+  assert response.status_code == 200
+  assert response.get_json()["warmed"] == 4